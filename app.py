@@ -1,1420 +1,5103 @@
-
-import tkinter as tk
-from tkinter import ttk, messagebox, filedialog, scrolledtext
-from tkinter.font import Font
-import sqlite3
-import json
-import os
-from datetime import datetime, date
-from PIL import Image, ImageTk
-import webbrowser
-import threading
-
-# Database Setup
-class Database:
-    def __init__(self):
-        self.conn = sqlite3.connect('seize_billing.db')
-        self.cursor = self.conn.cursor()
-        self.create_tables()
-
-    def create_tables(self):
-        # Users table
-        self.cursor.execute('''
-            CREATE TABLE IF NOT EXISTS users (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                username TEXT UNIQUE NOT NULL,
-                password TEXT NOT NULL,
-                role TEXT DEFAULT 'user',
-                email TEXT,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-            )
-        ''')
-
-        # Company settings
-        self.cursor.execute('''
-            CREATE TABLE IF NOT EXISTS company (
-                id INTEGER PRIMARY KEY,
-                name TEXT DEFAULT 'SEIZE',
-                address TEXT,
-                phone TEXT,
-                email TEXT,
-                gstin TEXT,
-                logo_path TEXT
-            )
-        ''')
-
-        # Products
-        self.cursor.execute('''
-            CREATE TABLE IF NOT EXISTS products (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                name TEXT NOT NULL,
-                hsn_code TEXT,
-                price REAL DEFAULT 0,
-                gst_rate REAL DEFAULT 18,
-                stock INTEGER DEFAULT 0,
-                min_stock INTEGER DEFAULT 10,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-            )
-        ''')
-
-        # Invoices
-        self.cursor.execute('''
-            CREATE TABLE IF NOT EXISTS invoices (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                invoice_no TEXT UNIQUE NOT NULL,
-                customer_name TEXT,
-                customer_phone TEXT,
-                customer_gstin TEXT,
-                date DATE DEFAULT CURRENT_DATE,
-                subtotal REAL DEFAULT 0,
-                gst_amount REAL DEFAULT 0,
-                total REAL DEFAULT 0,
-                status TEXT DEFAULT 'pending',
-                created_by TEXT,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-            )
-        ''')
-
-        # Invoice Items
-        self.cursor.execute('''
-            CREATE TABLE IF NOT EXISTS invoice_items (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                invoice_id INTEGER,
-                product_id INTEGER,
-                product_name TEXT,
-                quantity INTEGER DEFAULT 1,
-                price REAL,
-                gst_rate REAL,
-                total REAL,
-                FOREIGN KEY (invoice_id) REFERENCES invoices (id)
-            )
-        ''')
-
-        # Expenses
-        self.cursor.execute('''
-            CREATE TABLE IF NOT EXISTS expenses (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                category TEXT,
-                amount REAL,
-                description TEXT,
-                date DATE DEFAULT CURRENT_DATE,
-                created_by TEXT,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-            )
-        ''')
-
-        # Insert default admin user
-        self.cursor.execute('''
-            INSERT OR IGNORE INTO users (id, username, password, role, email)
-            VALUES (1, 'admin', 'admin123', 'admin', 'admin@seize.com')
-        ''')
-
-        # Insert default company
-        self.cursor.execute('''
-            INSERT OR IGNORE INTO company (id, name, address, phone, email)
-            VALUES (1, 'SEIZE', 'Your Business Address', 'Phone Number', 'email@seize.com')
-        ''')
-
-        self.conn.commit()
-
-    def execute(self, query, params=()):
-        self.cursor.execute(query, params)
-        self.conn.commit()
-        return self.cursor
-
-    def fetchall(self, query, params=()):
-        self.cursor.execute(query, params)
-        return self.cursor.fetchall()
-
-    def fetchone(self, query, params=()):
-        self.cursor.execute(query, params)
-        return self.cursor.fetchone()
-
-# Main Application
-class SeizeBillingApp:
-    def __init__(self, root):
-        self.root = root
-        self.root.title("SEIZE - Billing & Inventory Management")
-        self.root.geometry("1400x900")
-        self.root.configure(bg='#f0f2f5')
-
-        # Initialize database
-        self.db = Database()
-        self.current_user = None
-        self.current_role = None
-
-        # Colors
-        self.colors = {
-            'primary': '#2c3e50',
-            'secondary': '#34495e',
-            'accent': '#3498db',
-            'success': '#27ae60',
-            'danger': '#e74c3c',
-            'warning': '#f39c12',
-            'light': '#ecf0f1',
-            'white': '#ffffff',
-            'border': '#bdc3c7'
-        }
-
-        # Fonts
-        self.fonts = {
-            'title': Font(family="Helvetica", size=24, weight="bold"),
-            'header': Font(family="Helvetica", size=16, weight="bold"),
-            'normal': Font(family="Helvetica", size=11),
-            'small': Font(family="Helvetica", size=9)
-        }
-
-        self.show_login_screen()
-
-    def show_login_screen(self):
-        self.clear_window()
-
-        # Main container with border
-        container = tk.Frame(self.root, bg=self.colors['white'], 
-                           highlightbackground=self.colors['accent'], 
-                           highlightthickness=3)
-        container.place(relx=0.5, rely=0.5, anchor='center', width=500, height=600)
-
-        # Logo/Title Section
-        title_frame = tk.Frame(container, bg=self.colors['primary'], height=150)
-        title_frame.pack(fill='x', pady=0)
-        title_frame.pack_propagate(False)
-
-        tk.Label(title_frame, text="SEIZE", font=Font(family="Helvetica", size=36, weight="bold"),
-                bg=self.colors['primary'], fg=self.colors['white']).pack(pady=20)
-        tk.Label(title_frame, text="Billing & Inventory System", 
-                font=self.fonts['header'], bg=self.colors['primary'], 
-                fg=self.colors['light']).pack()
-
-        # Login Form
-        form_frame = tk.Frame(container, bg=self.colors['white'], padx=50, pady=40)
-        form_frame.pack(fill='both', expand=True)
-
-        # Username
-        tk.Label(form_frame, text="Username", font=self.fonts['header'], 
-                bg=self.colors['white'], fg=self.colors['primary']).pack(anchor='w', pady=(0,5))
-
-        username_frame = tk.Frame(form_frame, bg=self.colors['white'], 
-                                 highlightbackground=self.colors['border'], 
-                                 highlightthickness=2)
-        username_frame.pack(fill='x', pady=(0,20))
-
-        self.username_entry = tk.Entry(username_frame, font=self.fonts['normal'], 
-                                      bg=self.colors['white'], fg=self.colors['primary'],
-                                      insertbackground=self.colors['primary'],
-                                      relief='flat', bd=10)
-        self.username_entry.pack(fill='x')
-        self.username_entry.insert(0, "admin")
-
-        # Password
-        tk.Label(form_frame, text="Password", font=self.fonts['header'],
-                bg=self.colors['white'], fg=self.colors['primary']).pack(anchor='w', pady=(0,5))
-
-        password_frame = tk.Frame(form_frame, bg=self.colors['white'],
-                                 highlightbackground=self.colors['border'],
-                                 highlightthickness=2)
-        password_frame.pack(fill='x', pady=(0,30))
-
-        self.password_entry = tk.Entry(password_frame, font=self.fonts['normal'],
-                                      bg=self.colors['white'], fg=self.colors['primary'],
-                                      insertbackground=self.colors['primary'],
-                                      relief='flat', bd=10, show='•')
-        self.password_entry.pack(fill='x')
-        self.password_entry.insert(0, "admin123")
-
-        # Login Button
-        login_btn = tk.Button(form_frame, text="LOGIN", font=Font(family="Helvetica", size=14, weight="bold"),
-                             bg=self.colors['accent'], fg=self.colors['white'],
-                             activebackground=self.colors['primary'],
-                             activeforeground=self.colors['white'],
-                             cursor='hand2', relief='flat', bd=0,
-                             command=self.login)
-        login_btn.pack(fill='x', ipady=12)
-
-        # Bind Enter key
-        self.password_entry.bind('<Return>', lambda e: self.login())
-
-        # Footer
-        footer_frame = tk.Frame(container, bg=self.colors['light'], height=50)
-        footer_frame.pack(fill='x', side='bottom')
-        footer_frame.pack_propagate(False)
-
-        tk.Label(footer_frame, text="© 2024 SEIZE Software", 
-                font=self.fonts['small'], bg=self.colors['light'],
-                fg=self.colors['secondary']).pack(pady=15)
-
-    def login(self):
-        username = self.username_entry.get().strip()
-        password = self.password_entry.get().strip()
-
-        if not username or not password:
-            messagebox.showerror("Error", "Please enter both username and password")
-            return
-
-        user = self.db.fetchone("SELECT * FROM users WHERE username=? AND password=?", 
-                               (username, password))
-
-        if user:
-            self.current_user = username
-            self.current_role = user[3]
-            self.show_dashboard()
-        else:
-            messagebox.showerror("Error", "Invalid username or password")
-
-    def show_dashboard(self):
-        self.clear_window()
-
-        # Main layout
-        self.root.configure(bg=self.colors['light'])
-
-        # Sidebar
-        self.sidebar = tk.Frame(self.root, bg=self.colors['primary'], width=250)
-        self.sidebar.pack(side='left', fill='y')
-        self.sidebar.pack_propagate(False)
-
-        # Logo in sidebar
-        logo_frame = tk.Frame(self.sidebar, bg=self.colors['secondary'], height=100)
-        logo_frame.pack(fill='x', pady=0)
-        logo_frame.pack_propagate(False)
-
-        tk.Label(logo_frame, text="SEIZE", font=Font(family="Helvetica", size=28, weight="bold"),
-                bg=self.colors['secondary'], fg=self.colors['white']).pack(pady=20)
-
-        # Menu Items
-        menu_items = [
-            ("Dashboard", self.show_dashboard_content),
-            ("New Invoice", self.show_invoice_screen),
-            ("Invoices", self.show_invoices_list),
-            ("Products", self.show_products),
-            ("Stock", self.show_stock),
-            ("Expenses", self.show_expenses),
-            ("Reports", self.show_reports),
-            ("Settings", self.show_settings)
-        ]
-
-        if self.current_role == 'admin':
-            menu_items.insert(-1, ("Users", self.show_users))
-
-        for text, command in menu_items:
-            btn = tk.Button(self.sidebar, text=text, font=self.fonts['normal'],
-                          bg=self.colors['primary'], fg=self.colors['white'],
-                          activebackground=self.colors['accent'],
-                          activeforeground=self.colors['white'],
-                          relief='flat', bd=0, cursor='hand2',
-                          command=command)
-            btn.pack(fill='x', pady=2, ipady=10)
-
-        # Logout button at bottom
-        logout_btn = tk.Button(self.sidebar, text="Logout", font=self.fonts['normal'],
-                              bg=self.colors['danger'], fg=self.colors['white'],
-                              activebackground='#c0392b',
-                              relief='flat', bd=0, cursor='hand2',
-                              command=self.logout)
-        logout_btn.pack(fill='x', side='bottom', pady=10, ipady=10)
-
-        # User info
-        user_frame = tk.Frame(self.sidebar, bg=self.colors['secondary'], height=60)
-        user_frame.pack(fill='x', side='bottom')
-        user_frame.pack_propagate(False)
-
-        tk.Label(user_frame, text=f"Logged in as: {self.current_user}",
-                font=self.fonts['small'], bg=self.colors['secondary'],
-                fg=self.colors['light']).pack(pady=20)
-
-        # Main content area
-        self.main_content = tk.Frame(self.root, bg=self.colors['light'])
-        self.main_content.pack(side='right', fill='both', expand=True, padx=20, pady=20)
-
-        self.show_dashboard_content()
-
-    def show_dashboard_content(self):
-        self.clear_main_content()
-
-        # Header
-        header = tk.Frame(self.main_content, bg=self.colors['white'], 
-                         highlightbackground=self.colors['border'],
-                         highlightthickness=1, height=80)
-        header.pack(fill='x', pady=(0,20))
-        header.pack_propagate(False)
-
-        tk.Label(header, text="Dashboard", font=self.fonts['title'],
-                bg=self.colors['white'], fg=self.colors['primary']).pack(side='left', padx=30, pady=20)
-
-        # Date
-        tk.Label(header, text=datetime.now().strftime("%d %B, %Y"),
-                font=self.fonts['normal'], bg=self.colors['white'],
-                fg=self.colors['secondary']).pack(side='right', padx=30, pady=20)
-
-        # Stats Cards
-        stats_frame = tk.Frame(self.main_content, bg=self.colors['light'])
-        stats_frame.pack(fill='x', pady=10)
-
-        # Get stats from database
-        today_sales = self.db.fetchone("""
-            SELECT COALESCE(SUM(total), 0) FROM invoices 
-            WHERE date = ? AND status != 'cancelled'
-        """, (date.today(),))[0]
-
-        total_invoices = self.db.fetchone("""
-            SELECT COUNT(*) FROM invoices WHERE status != 'cancelled'
-        """)[0]
-
-        low_stock = self.db.fetchone("""
-            SELECT COUNT(*) FROM products WHERE stock <= min_stock
-        """)[0]
-
-        today_expenses = self.db.fetchone("""
-            SELECT COALESCE(SUM(amount), 0) FROM expenses WHERE date = ?
-        """, (date.today(),))[0]
-
-        stats = [
-            ("Today's Sales", f"₹{today_sales:,.2f}", self.colors['success']),
-            ("Total Invoices", total_invoices, self.colors['accent']),
-            ("Low Stock Items", low_stock, self.colors['warning'] if low_stock > 0 else self.colors['success']),
-            ("Today's Expenses", f"₹{today_expenses:,.2f}", self.colors['danger'])
-        ]
-
-        for title, value, color in stats:
-            card = tk.Frame(stats_frame, bg=self.colors['white'],
-                          highlightbackground=color,
-                          highlightthickness=2, width=300, height=150)
-            card.pack(side='left', padx=10, pady=10)
-            card.pack_propagate(False)
-
-            tk.Label(card, text=title, font=self.fonts['normal'],
-                    bg=self.colors['white'], fg=self.colors['secondary']).pack(pady=(20,5))
-            tk.Label(card, text=str(value), font=Font(family="Helvetica", size=24, weight="bold"),
-                    bg=self.colors['white'], fg=color).pack()
-
-        # Recent Activity
-        activity_frame = tk.Frame(self.main_content, bg=self.colors['white'],
-                                 highlightbackground=self.colors['border'],
-                                 highlightthickness=1)
-        activity_frame.pack(fill='both', expand=True, pady=20)
-
-        tk.Label(activity_frame, text="Recent Invoices", font=self.fonts['header'],
-                bg=self.colors['white'], fg=self.colors['primary']).pack(anchor='w', padx=20, pady=15)
-
-        # Treeview for recent invoices
-        columns = ('Invoice No', 'Customer', 'Date', 'Amount', 'Status')
-        tree = ttk.Treeview(activity_frame, columns=columns, show='headings', height=10)
-
-        for col in columns:
-            tree.heading(col, text=col)
-            tree.column(col, width=150)
-
-        # Add scrollbar
-        scrollbar = ttk.Scrollbar(activity_frame, orient='vertical', command=tree.yview)
-        tree.configure(yscrollcommand=scrollbar.set)
-        scrollbar.pack(side='right', fill='y')
-        tree.pack(fill='both', expand=True, padx=20, pady=(0,20))
-
-        # Load recent invoices
-        invoices = self.db.fetchall("""
-            SELECT invoice_no, customer_name, date, total, status 
-            FROM invoices ORDER BY created_at DESC LIMIT 10
-        """)
-
-        for inv in invoices:
-            status_color = self.colors['success'] if inv[4] == 'paid' else self.colors['warning']
-            tree.insert('', 'end', values=inv, tags=(inv[4],))
-
-        tree.tag_configure('paid', foreground=self.colors['success'])
-        tree.tag_configure('pending', foreground=self.colors['warning'])
-
-    def show_invoice_screen(self, edit_invoice_id=None):
-        self.clear_main_content()
-
-        # Header
-        header = tk.Frame(self.main_content, bg=self.colors['white'],
-                         highlightbackground=self.colors['border'],
-                         highlightthickness=1, height=80)
-        header.pack(fill='x', pady=(0,20))
-        header.pack_propagate(False)
-
-        title_text = "Edit Invoice" if edit_invoice_id else "New Invoice"
-        tk.Label(header, text=title_text, font=self.fonts['title'],
-                bg=self.colors['white'], fg=self.colors['primary']).pack(side='left', padx=30, pady=20)
-
-        # Invoice Form Container
-        form_container = tk.Frame(self.main_content, bg=self.colors['light'])
-        form_container.pack(fill='both', expand=True)
-
-        # Left side - Invoice Details
-        left_frame = tk.Frame(form_container, bg=self.colors['white'],
-                             highlightbackground=self.colors['border'],
-                             highlightthickness=1)
-        left_frame.pack(side='left', fill='both', expand=True, padx=(0,10))
-
-        # Customer Details Section
-        cust_frame = tk.LabelFrame(left_frame, text="Customer Details", 
-                                  font=self.fonts['header'],
-                                  bg=self.colors['white'], fg=self.colors['primary'],
-                                  padx=20, pady=15)
-        cust_frame.pack(fill='x', padx=20, pady=20)
-
-        # Invoice Number
-        tk.Label(cust_frame, text="Invoice No:", font=self.fonts['normal'],
-                bg=self.colors['white']).grid(row=0, column=0, sticky='w', pady=5)
-        self.inv_no_var = tk.StringVar()
-        if not edit_invoice_id:
-            last_inv = self.db.fetchone("SELECT MAX(CAST(SUBSTR(invoice_no, 4) AS INTEGER)) FROM invoices")
-            next_no = (last_inv[0] or 0) + 1
-            self.inv_no_var.set(f"SEZ{next_no:04d}")
-        inv_no_entry = tk.Entry(cust_frame, font=self.fonts['normal'],
-                               textvariable=self.inv_no_var, state='readonly',
-                               bg=self.colors['light'])
-        inv_no_entry.grid(row=0, column=1, sticky='ew', padx=10)
-
-        # Date
-        tk.Label(cust_frame, text="Date:", font=self.fonts['normal'],
-                bg=self.colors['white']).grid(row=0, column=2, sticky='w', padx=(20,0))
-        self.inv_date_var = tk.StringVar(value=date.today().strftime("%Y-%m-%d"))
-        date_entry = tk.Entry(cust_frame, font=self.fonts['normal'],
-                             textvariable=self.inv_date_var)
-        date_entry.grid(row=0, column=3, sticky='ew', padx=10)
-
-        # Customer Name
-        tk.Label(cust_frame, text="Customer Name:*", font=self.fonts['normal'],
-                bg=self.colors['white']).grid(row=1, column=0, sticky='w', pady=5)
-        self.cust_name_var = tk.StringVar()
-        tk.Entry(cust_frame, font=self.fonts['normal'],
-                textvariable=self.cust_name_var).grid(row=1, column=1, sticky='ew', padx=10)
-
-        # Customer Phone
-        tk.Label(cust_frame, text="Phone:", font=self.fonts['normal'],
-                bg=self.colors['white']).grid(row=1, column=2, sticky='w', padx=(20,0))
-        self.cust_phone_var = tk.StringVar()
-        tk.Entry(cust_frame, font=self.fonts['normal'],
-                textvariable=self.cust_phone_var).grid(row=1, column=3, sticky='ew', padx=10)
-
-        # Customer GSTIN
-        tk.Label(cust_frame, text="GSTIN:", font=self.fonts['normal'],
-                bg=self.colors['white']).grid(row=2, column=0, sticky='w', pady=5)
-        self.cust_gstin_var = tk.StringVar()
-        tk.Entry(cust_frame, font=self.fonts['normal'],
-                textvariable=self.cust_gstin_var).grid(row=2, column=1, sticky='ew', padx=10)
-
-        cust_frame.columnconfigure(1, weight=1)
-        cust_frame.columnconfigure(3, weight=1)
-
-        # Items Section - AUTO EXPANDING
-        items_frame = tk.LabelFrame(left_frame, text="Invoice Items",
-                                   font=self.fonts['header'],
-                                   bg=self.colors['white'], fg=self.colors['primary'],
-                                   padx=20, pady=15)
-        items_frame.pack(fill='both', expand=True, padx=20, pady=10)
-
-        # Items Treeview with auto-expand
-        columns = ('Item', 'HSN', 'Qty', 'Rate', 'GST%', 'Amount')
-        self.items_tree = ttk.Treeview(items_frame, columns=columns, show='headings', height=8)
-
-        for col in columns:
-            self.items_tree.heading(col, text=col)
-            self.items_tree.column(col, width=100)
-
-        self.items_tree.column('Item', width=250)
-
-        scrollbar = ttk.Scrollbar(items_frame, orient='vertical', command=self.items_tree.yview)
-        self.items_tree.configure(yscrollcommand=scrollbar.set)
-        scrollbar.pack(side='right', fill='y')
-        self.items_tree.pack(fill='both', expand=True)
-
-        # Add Item Button
-        btn_frame = tk.Frame(items_frame, bg=self.colors['white'])
-        btn_frame.pack(fill='x', pady=10)
-
-        tk.Button(btn_frame, text="+ Add Item", font=self.fonts['normal'],
-                 bg=self.colors['accent'], fg=self.colors['white'],
-                 relief='flat', cursor='hand2',
-                 command=self.add_item_dialog).pack(side='left', padx=5)
-
-        tk.Button(btn_frame, text="- Remove Item", font=self.fonts['normal'],
-                 bg=self.colors['danger'], fg=self.colors['white'],
-                 relief='flat', cursor='hand2',
-                 command=self.remove_item).pack(side='left', padx=5)
-
-        # Totals Section
-        totals_frame = tk.Frame(left_frame, bg=self.colors['white'],
-                               highlightbackground=self.colors['border'],
-                               highlightthickness=1, padx=20, pady=15)
-        totals_frame.pack(fill='x', padx=20, pady=20)
-
-        self.subtotal_var = tk.StringVar(value="0.00")
-        self.gst_var = tk.StringVar(value="0.00")
-        self.total_var = tk.StringVar(value="0.00")
-
-        tk.Label(totals_frame, text="Subtotal:", font=self.fonts['normal'],
-                bg=self.colors['white']).grid(row=0, column=0, sticky='e', padx=10)
-        tk.Label(totals_frame, textvariable=self.subtotal_var,
-                font=self.fonts['header'], bg=self.colors['white'],
-                fg=self.colors['primary']).grid(row=0, column=1, sticky='w')
-
-        tk.Label(totals_frame, text="GST Amount:", font=self.fonts['normal'],
-                bg=self.colors['white']).grid(row=1, column=0, sticky='e', padx=10)
-        tk.Label(totals_frame, textvariable=self.gst_var,
-                font=self.fonts['header'], bg=self.colors['white'],
-                fg=self.colors['primary']).grid(row=1, column=1, sticky='w')
-
-        tk.Label(totals_frame, text="Total:", font=Font(family="Helvetica", size=14, weight="bold"),
-                bg=self.colors['white']).grid(row=2, column=0, sticky='e', padx=10, pady=10)
-        tk.Label(totals_frame, textvariable=self.total_var,
-                font=Font(family="Helvetica", size=18, weight="bold"),
-                bg=self.colors['white'], fg=self.colors['success']).grid(row=2, column=1, sticky='w')
-
-        # Action Buttons
-        action_frame = tk.Frame(left_frame, bg=self.colors['white'])
-        action_frame.pack(fill='x', padx=20, pady=20)
-
-        tk.Button(action_frame, text="Save Invoice", font=self.fonts['normal'],
-                 bg=self.colors['success'], fg=self.colors['white'],
-                 relief='flat', cursor='hand2', padx=30, pady=10,
-                 command=self.save_invoice).pack(side='left', padx=5)
-
-        tk.Button(action_frame, text="Print", font=self.fonts['normal'],
-                 bg=self.colors['primary'], fg=self.colors['white'],
-                 relief='flat', cursor='hand2', padx=30, pady=10,
-                 command=self.print_invoice).pack(side='left', padx=5)
-
-        tk.Button(action_frame, text="Cancel", font=self.fonts['normal'],
-                 bg=self.colors['danger'], fg=self.colors['white'],
-                 relief='flat', cursor='hand2', padx=30, pady=10,
-                 command=self.show_dashboard_content).pack(side='left', padx=5)
-
-        # Right side - Quick Products
-        right_frame = tk.Frame(form_container, bg=self.colors['white'],
-                              highlightbackground=self.colors['border'],
-                              highlightthickness=1, width=300)
-        right_frame.pack(side='right', fill='y')
-        right_frame.pack_propagate(False)
-
-        tk.Label(right_frame, text="Quick Add Products",
-                font=self.fonts['header'], bg=self.colors['white'],
-                fg=self.colors['primary']).pack(pady=20)
-
-        # Product list
-        products = self.db.fetchall("SELECT name, price, gst_rate FROM products LIMIT 20")
-
-        prod_canvas = tk.Canvas(right_frame, bg=self.colors['white'], highlightthickness=0)
-        prod_scrollbar = ttk.Scrollbar(right_frame, orient='vertical', command=prod_canvas.yview)
-        prod_frame = tk.Frame(prod_canvas, bg=self.colors['white'])
-
-        prod_canvas.configure(yscrollcommand=prod_scrollbar.set)
-        prod_scrollbar.pack(side='right', fill='y')
-        prod_canvas.pack(side='left', fill='both', expand=True, padx=10)
-        prod_canvas.create_window((0,0), window=prod_frame, anchor='nw', width=260)
-
-        for prod in products:
-            prod_btn = tk.Button(prod_frame, 
-                               text=f"{prod[0]}\n₹{prod[1]} ({prod[2]}% GST)",
-                               font=self.fonts['small'],
-                               bg=self.colors['light'], fg=self.colors['primary'],
-                               relief='flat', cursor='hand2',
-                               command=lambda p=prod: self.quick_add_product(p))
-            prod_btn.pack(fill='x', pady=2, ipady=5)
-
-        prod_frame.update_idletasks()
-        prod_canvas.configure(scrollregion=prod_canvas.bbox('all'))
-
-        # If editing, load invoice data
-        if edit_invoice_id:
-            self.load_invoice_for_edit(edit_invoice_id)
-
-    def add_item_dialog(self):
-        dialog = tk.Toplevel(self.root)
-        dialog.title("Add Item")
-        dialog.geometry("500x400")
-        dialog.configure(bg=self.colors['white'])
-        dialog.transient(self.root)
-        dialog.grab_set()
-
-        # Product selection
-        tk.Label(dialog, text="Select Product:", font=self.fonts['normal'],
-                bg=self.colors['white']).pack(pady=(20,5))
-
-        products = self.db.fetchall("SELECT id, name, price, gst_rate FROM products")
-        prod_names = [f"{p[1]} - ₹{p[2]}" for p in products]
-        prod_dict = {f"{p[1]} - ₹{p[2]}": p for p in products}
-
-        prod_var = tk.StringVar()
-        prod_combo = ttk.Combobox(dialog, textvariable=prod_var, values=prod_names,
-                                 font=self.fonts['normal'], state='readonly')
-        prod_combo.pack(fill='x', padx=20, pady=5)
-
-        # Quantity
-        tk.Label(dialog, text="Quantity:", font=self.fonts['normal'],
-                bg=self.colors['white']).pack(pady=(10,5))
-        qty_var = tk.IntVar(value=1)
-        tk.Spinbox(dialog, from_=1, to=1000, textvariable=qty_var,
-                  font=self.fonts['normal']).pack(fill='x', padx=20, pady=5)
-
-        def add_item():
-            if not prod_var.get():
-                messagebox.showerror("Error", "Please select a product")
-                return
-
-            prod = prod_dict[prod_var.get()]
-            qty = qty_var.get()
-            price = prod[2]
-            gst_rate = prod[3]
-            amount = qty * price
-            gst_amount = amount * (gst_rate / 100)
-            total = amount + gst_amount
-
-            self.items_tree.insert('', 'end', values=(
-                prod[1], '', qty, price, gst_rate, total
-            ))
-
-            self.calculate_totals()
-            dialog.destroy()
-
-        tk.Button(dialog, text="Add", font=self.fonts['normal'],
-                 bg=self.colors['success'], fg=self.colors['white'],
-                 relief='flat', cursor='hand2', padx=30, pady=10,
-                 command=add_item).pack(pady=30)
-
-    def quick_add_product(self, product):
-        self.items_tree.insert('', 'end', values=(
-            product[0], '', 1, product[1], product[2], 
-            product[1] * (1 + product[2]/100)
-        ))
-        self.calculate_totals()
-
-    def remove_item(self):
-        selected = self.items_tree.selection()
-        if selected:
-            self.items_tree.delete(selected[0])
-            self.calculate_totals()
-
-    def calculate_totals(self):
-        subtotal = 0
-        gst_total = 0
-
-        for item in self.items_tree.get_children():
-            values = self.items_tree.item(item, 'values')
-            if values:
-                qty = float(values[2])
-                rate = float(values[3])
-                gst_rate = float(values[4])
-
-                amount = qty * rate
-                gst_amount = amount * (gst_rate / 100)
-
-                subtotal += amount
-                gst_total += gst_amount
-
-        total = subtotal + gst_total
-
-        self.subtotal_var.set(f"₹{subtotal:,.2f}")
-        self.gst_var.set(f"₹{gst_total:,.2f}")
-        self.total_var.set(f"₹{total:,.2f}")
-
-    def save_invoice(self):
-        if not self.cust_name_var.get().strip():
-            messagebox.showerror("Error", "Customer name is required")
-            return
-
-        if not self.items_tree.get_children():
-            messagebox.showerror("Error", "Please add at least one item")
-            return
-
-        try:
-            # Save invoice
-            self.db.execute("""
-                INSERT INTO invoices (invoice_no, customer_name, customer_phone, 
-                                    customer_gstin, date, subtotal, gst_amount, total, 
-                                    status, created_by)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, 'pending', ?)
-            """, (
-                self.inv_no_var.get(),
-                self.cust_name_var.get(),
-                self.cust_phone_var.get(),
-                self.cust_gstin_var.get(),
-                self.inv_date_var.get(),
-                float(self.subtotal_var.get().replace('₹', '').replace(',', '')),
-                float(self.gst_var.get().replace('₹', '').replace(',', '')),
-                float(self.total_var.get().replace('₹', '').replace(',', '')),
-                self.current_user
-            ))
-
-            invoice_id = self.db.cursor.lastrowid
-
-            # Save items
-            for item in self.items_tree.get_children():
-                values = self.items_tree.item(item, 'values')
-                self.db.execute("""
-                    INSERT INTO invoice_items (invoice_id, product_name, quantity, 
-                                             price, gst_rate, total)
-                    VALUES (?, ?, ?, ?, ?, ?)
-                """, (invoice_id, values[0], values[2], values[3], values[4], values[5]))
-
-                # Update stock
-                self.db.execute("""
-                    UPDATE products SET stock = stock - ? WHERE name = ?
-                """, (values[2], values[0]))
-
-            messagebox.showinfo("Success", f"Invoice {self.inv_no_var.get()} saved successfully!")
-            self.show_invoices_list()
-
-        except Exception as e:
-            messagebox.showerror("Error", f"Failed to save invoice: {str(e)}")
-
-    def show_invoices_list(self):
-        self.clear_main_content()
-
-        # Header
-        header = tk.Frame(self.main_content, bg=self.colors['white'],
-                         highlightbackground=self.colors['border'],
-                         highlightthickness=1, height=80)
-        header.pack(fill='x', pady=(0,20))
-        header.pack_propagate(False)
-
-        tk.Label(header, text="Invoices", font=self.fonts['title'],
-                bg=self.colors['white'], fg=self.colors['primary']).pack(side='left', padx=30, pady=20)
-
-        tk.Button(header, text="+ New Invoice", font=self.fonts['normal'],
-                 bg=self.colors['success'], fg=self.colors['white'],
-                 relief='flat', cursor='hand2',
-                 command=self.show_invoice_screen).pack(side='right', padx=30, pady=20)
-
-        # Filter Frame
-        filter_frame = tk.Frame(self.main_content, bg=self.colors['light'])
-        filter_frame.pack(fill='x', pady=10)
-
-        tk.Label(filter_frame, text="Search:", font=self.fonts['normal'],
-                bg=self.colors['light']).pack(side='left', padx=5)
-
-        search_var = tk.StringVar()
-        tk.Entry(filter_frame, textvariable=search_var,
-                font=self.fonts['normal'], width=30).pack(side='left', padx=5)
-
-        tk.Label(filter_frame, text="From:", font=self.fonts['normal'],
-                bg=self.colors['light']).pack(side='left', padx=(20,5))
-
-        from_date = tk.StringVar(value=date.today().strftime("%Y-%m-01"))
-        tk.Entry(filter_frame, textvariable=from_date,
-                font=self.fonts['normal'], width=12).pack(side='left')
-
-        tk.Label(filter_frame, text="To:", font=self.fonts['normal'],
-                bg=self.colors['light']).pack(side='left', padx=(10,5))
-
-        to_date = tk.StringVar(value=date.today().strftime("%Y-%m-%d"))
-        tk.Entry(filter_frame, textvariable=to_date,
-                font=self.fonts['normal'], width=12).pack(side='left')
-
-        tk.Button(filter_frame, text="Filter", font=self.fonts['normal'],
-                 bg=self.colors['accent'], fg=self.colors['white'],
-                 relief='flat', cursor='hand2',
-                 command=lambda: self.load_invoices(tree, from_date.get(), to_date.get(), search_var.get())).pack(side='left', padx=20)
-
-        # Invoices Table
-        table_frame = tk.Frame(self.main_content, bg=self.colors['white'],
-                              highlightbackground=self.colors['border'],
-                              highlightthickness=1)
-        table_frame.pack(fill='both', expand=True, pady=10)
-
-        columns = ('Invoice No', 'Customer', 'Date', 'Amount', 'Status', 'Actions')
-        tree = ttk.Treeview(table_frame, columns=columns, show='headings', height=20)
-
-        for col in columns:
-            tree.heading(col, text=col)
-            tree.column(col, width=150)
-
-        tree.column('Invoice No', width=120)
-        tree.column('Customer', width=200)
-        tree.column('Actions', width=200)
-
-        scrollbar = ttk.Scrollbar(table_frame, orient='vertical', command=tree.yview)
-        tree.configure(yscrollcommand=scrollbar.set)
-        scrollbar.pack(side='right', fill='y')
-        tree.pack(fill='both', expand=True, padx=20, pady=20)
-
-        # Action buttons frame
-        def on_select(event):
-            item = tree.selection()[0]
-            values = tree.item(item, 'values')
-            if values:
-                self.show_invoice_actions(values[0])
-
-        tree.bind('<Double-1>', on_select)
-
-        self.load_invoices(tree, from_date.get(), to_date.get())
-
-    def load_invoices(self, tree, from_date, to_date, search=''):
-        # Clear existing
-        for item in tree.get_children():
-            tree.delete(item)
-
-        query = """
-            SELECT invoice_no, customer_name, date, total, status 
-            FROM invoices 
-            WHERE date BETWEEN ? AND ?
-        """
-        params = [from_date, to_date]
-
-        if search:
-            query += " AND (invoice_no LIKE ? OR customer_name LIKE ?)"
-            params.extend([f'%{search}%', f'%{search}%'])
-
-        query += " ORDER BY date DESC"
-
-        invoices = self.db.fetchall(query, params)
-
-        for inv in invoices:
-            status_tag = 'paid' if inv[4] == 'paid' else 'pending'
-            tree.insert('', 'end', values=inv, tags=(status_tag,))
-
-        tree.tag_configure('paid', foreground=self.colors['success'])
-        tree.tag_configure('pending', foreground=self.colors['warning'])
-
-    def show_reports(self):
-        self.clear_main_content()
-
-        header = tk.Frame(self.main_content, bg=self.colors['white'],
-                         highlightbackground=self.colors['border'],
-                         highlightthickness=1, height=80)
-        header.pack(fill='x', pady=(0,20))
-        header.pack_propagate(False)
-
-        tk.Label(header, text="Reports", font=self.fonts['title'],
-                bg=self.colors['white'], fg=self.colors['primary']).pack(side='left', padx=30, pady=20)
-
-        # Report buttons
-        reports_frame = tk.Frame(self.main_content, bg=self.colors['light'])
-        reports_frame.pack(fill='both', expand=True)
-
-        reports = [
-            ("Sales Report", self.show_sales_report),
-            ("Purchase Report", self.show_purchase_report),
-            ("Stock Report", self.show_stock_report),
-            ("Profit & Loss", self.show_profit_loss),
-            ("GST Report", self.show_gst_report),
-            ("Expense Report", self.show_expense_report)
-        ]
-
-        for name, command in reports:
-            btn = tk.Button(reports_frame, text=name, font=self.fonts['header'],
-                          bg=self.colors['white'], fg=self.colors['primary'],
-                          activebackground=self.colors['accent'],
-                          activeforeground=self.colors['white'],
-                          relief='flat', bd=2, cursor='hand2',
-                          command=command, width=30, height=5)
-            btn.pack(pady=10)
-
-    def show_sales_report(self):
-        self.generate_report("Sales Report", """
-            SELECT date, COUNT(*) as invoices, SUM(total) as total
-            FROM invoices WHERE status != 'cancelled'
-            GROUP BY date ORDER BY date DESC
-        """)
-
-    def show_profit_loss(self):
-        self.clear_main_content()
-
-        header = tk.Frame(self.main_content, bg=self.colors['white'],
-                         highlightbackground=self.colors['border'],
-                         highlightthickness=1, height=80)
-        header.pack(fill='x', pady=(0,20))
-        header.pack_propagate(False)
-
-        tk.Label(header, text="Profit & Loss Statement", font=self.fonts['title'],
-                bg=self.colors['white'], fg=self.colors['primary']).pack(side='left', padx=30, pady=20)
-
-        # Get data
-        total_sales = self.db.fetchone("""
-            SELECT COALESCE(SUM(total), 0) FROM invoices WHERE status != 'cancelled'
-        """)[0]
-
-        total_expenses = self.db.fetchone("""
-            SELECT COALESCE(SUM(amount), 0) FROM expenses
-        """)[0]
-
-        profit = total_sales - total_expenses
-
-        # Display
-        content = tk.Frame(self.main_content, bg=self.colors['white'],
-                          highlightbackground=self.colors['border'],
-                          highlightthickness=1, padx=50, pady=50)
-        content.pack(fill='both', expand=True, pady=20)
-
-        tk.Label(content, text="Total Sales:", font=self.fonts['header'],
-                bg=self.colors['white'], fg=self.colors['primary']).pack(anchor='w')
-        tk.Label(content, text=f"₹{total_sales:,.2f}", font=self.fonts['title'],
-                bg=self.colors['white'], fg=self.colors['success']).pack(anchor='w', pady=(0,20))
-
-        tk.Label(content, text="Total Expenses:", font=self.fonts['header'],
-                bg=self.colors['white'], fg=self.colors['primary']).pack(anchor='w')
-        tk.Label(content, text=f"₹{total_expenses:,.2f}", font=self.fonts['title'],
-                bg=self.colors['white'], fg=self.colors['danger']).pack(anchor='w', pady=(0,20))
-
-        tk.Label(content, text="Net Profit:", font=self.fonts['header'],
-                bg=self.colors['white'], fg=self.colors['primary']).pack(anchor='w')
-
-        color = self.colors['success'] if profit >= 0 else self.colors['danger']
-        tk.Label(content, text=f"₹{profit:,.2f}", font=Font(family="Helvetica", size=32, weight="bold"),
-                bg=self.colors['white'], fg=color).pack(anchor='w')
-
-    def generate_report(self, title, query):
-        self.clear_main_content()
-
-        header = tk.Frame(self.main_content, bg=self.colors['white'],
-                         highlightbackground=self.colors['border'],
-                         highlightthickness=1, height=80)
-        header.pack(fill='x', pady=(0,20))
-        header.pack_propagate(False)
-
-        tk.Label(header, text=title, font=self.fonts['title'],
-                bg=self.colors['white'], fg=self.colors['primary']).pack(side='left', padx=30, pady=20)
-
-        tk.Button(header, text="Export to Excel", font=self.fonts['normal'],
-                 bg=self.colors['success'], fg=self.colors['white'],
-                 relief='flat', cursor='hand2').pack(side='right', padx=30, pady=20)
-
-        # Report table
-        table_frame = tk.Frame(self.main_content, bg=self.colors['white'],
-                              highlightbackground=self.colors['border'],
-                              highlightthickness=1)
-        table_frame.pack(fill='both', expand=True, pady=10)
-
-        # Get columns from query
-        self.db.cursor.execute(query)
-        columns = [description[0] for description in self.db.cursor.description]
-
-        tree = ttk.Treeview(table_frame, columns=columns, show='headings', height=20)
-
-        for col in columns:
-            tree.heading(col, text=col.replace('_', ' ').title())
-            tree.column(col, width=150)
-
-        scrollbar = ttk.Scrollbar(table_frame, orient='vertical', command=tree.yview)
-        tree.configure(yscrollcommand=scrollbar.set)
-        scrollbar.pack(side='right', fill='y')
-        tree.pack(fill='both', expand=True, padx=20, pady=20)
-
-        # Load data
-        data = self.db.fetchall(query)
-        for row in data:
-            tree.insert('', 'end', values=row)
-
-    def show_users(self):
-        self.clear_main_content()
-
-        header = tk.Frame(self.main_content, bg=self.colors['white'],
-                         highlightbackground=self.colors['border'],
-                         highlightthickness=1, height=80)
-        header.pack(fill='x', pady=(0,20))
-        header.pack_propagate(False)
-
-        tk.Label(header, text="User Management", font=self.fonts['title'],
-                bg=self.colors['white'], fg=self.colors['primary']).pack(side='left', padx=30, pady=20)
-
-        tk.Button(header, text="+ Add User", font=self.fonts['normal'],
-                 bg=self.colors['success'], fg=self.colors['white'],
-                 relief='flat', cursor='hand2',
-                 command=self.add_user_dialog).pack(side='right', padx=30, pady=20)
-
-        # Users table
-        table_frame = tk.Frame(self.main_content, bg=self.colors['white'],
-                              highlightbackground=self.colors['border'],
-                              highlightthickness=1)
-        table_frame.pack(fill='both', expand=True, pady=10)
-
-        columns = ('Username', 'Role', 'Email', 'Created At')
-        tree = ttk.Treeview(table_frame, columns=columns, show='headings', height=20)
-
-        for col in columns:
-            tree.heading(col, text=col)
-            tree.column(col, width=200)
-
-        scrollbar = ttk.Scrollbar(table_frame, orient='vertical', command=tree.yview)
-        tree.configure(yscrollcommand=scrollbar.set)
-        scrollbar.pack(side='right', fill='y')
-        tree.pack(fill='both', expand=True, padx=20, pady=20)
-
-        # Load users
-        users = self.db.fetchall("SELECT username, role, email, created_at FROM users")
-        for user in users:
-            tree.insert('', 'end', values=user)
-
-    def add_user_dialog(self):
-        dialog = tk.Toplevel(self.root)
-        dialog.title("Add User")
-        dialog.geometry("400x400")
-        dialog.configure(bg=self.colors['white'])
-        dialog.transient(self.root)
-        dialog.grab_set()
-
-        tk.Label(dialog, text="Username:", font=self.fonts['normal'],
-                bg=self.colors['white']).pack(pady=(20,5))
-        username_var = tk.StringVar()
-        tk.Entry(dialog, textvariable=username_var, font=self.fonts['normal']).pack(fill='x', padx=20)
-
-        tk.Label(dialog, text="Password:", font=self.fonts['normal'],
-                bg=self.colors['white']).pack(pady=(15,5))
-        password_var = tk.StringVar()
-        tk.Entry(dialog, textvariable=password_var, show='•', font=self.fonts['normal']).pack(fill='x', padx=20)
-
-        tk.Label(dialog, text="Role:", font=self.fonts['normal'],
-                bg=self.colors['white']).pack(pady=(15,5))
-        role_var = tk.StringVar(value='user')
-        ttk.Combobox(dialog, textvariable=role_var, values=['admin', 'user', 'salesman'],
-                    font=self.fonts['normal'], state='readonly').pack(fill='x', padx=20)
-
-        tk.Label(dialog, text="Email:", font=self.fonts['normal'],
-                bg=self.colors['white']).pack(pady=(15,5))
-        email_var = tk.StringVar()
-        tk.Entry(dialog, textvariable=email_var, font=self.fonts['normal']).pack(fill='x', padx=20)
-
-        def save():
-            try:
-                self.db.execute("""
-                    INSERT INTO users (username, password, role, email)
-                    VALUES (?, ?, ?, ?)
-                """, (username_var.get(), password_var.get(), role_var.get(), email_var.get()))
-                messagebox.showinfo("Success", "User added!")
-                dialog.destroy()
-                self.show_users()
-            except Exception as e:
-                messagebox.showerror("Error", str(e))
-
-        tk.Button(dialog, text="Save", font=self.fonts['normal'],
-                 bg=self.colors['success'], fg=self.colors['white'],
-                 relief='flat', cursor='hand2', padx=30, pady=10,
-                 command=save).pack(pady=30)
-
-    def show_settings(self):
-        self.clear_main_content()
-
-        header = tk.Frame(self.main_content, bg=self.colors['white'],
-                         highlightbackground=self.colors['border'],
-                         highlightthickness=1, height=80)
-        header.pack(fill='x', pady=(0,20))
-        header.pack_propagate(False)
-
-        tk.Label(header, text="Settings", font=self.fonts['title'],
-                bg=self.colors['white'], fg=self.colors['primary']).pack(side='left', padx=30, pady=20)
-
-        # Settings form
-        form_frame = tk.Frame(self.main_content, bg=self.colors['white'],
-                             highlightbackground=self.colors['border'],
-                             highlightthickness=1, padx=50, pady=30)
-        form_frame.pack(fill='both', expand=True, pady=20)
-
-        # Company settings
-        company = self.db.fetchone("SELECT * FROM company LIMIT 1")
-
-        tk.Label(form_frame, text="Company Name:", font=self.fonts['normal'],
-                bg=self.colors['white']).grid(row=0, column=0, sticky='w', pady=10)
-        name_var = tk.StringVar(value=company[1] if company else 'SEIZE')
-        tk.Entry(form_frame, textvariable=name_var, font=self.fonts['normal'], width=40).grid(row=0, column=1, padx=10)
-
-        tk.Label(form_frame, text="Address:", font=self.fonts['normal'],
-                bg=self.colors['white']).grid(row=1, column=0, sticky='w', pady=10)
-        address_var = tk.StringVar(value=company[2] if company else '')
-        tk.Entry(form_frame, textvariable=address_var, font=self.fonts['normal'], width=40).grid(row=1, column=1, padx=10)
-
-        tk.Label(form_frame, text="Phone:", font=self.fonts['normal'],
-                bg=self.colors['white']).grid(row=2, column=0, sticky='w', pady=10)
-        phone_var = tk.StringVar(value=company[3] if company else '')
-        tk.Entry(form_frame, textvariable=phone_var, font=self.fonts['normal'], width=40).grid(row=2, column=1, padx=10)
-
-        tk.Label(form_frame, text="Email:", font=self.fonts['normal'],
-                bg=self.colors['white']).grid(row=3, column=0, sticky='w', pady=10)
-        email_var = tk.StringVar(value=company[4] if company else '')
-        tk.Entry(form_frame, textvariable=email_var, font=self.fonts['normal'], width=40).grid(row=3, column=1, padx=10)
-
-        tk.Label(form_frame, text="GSTIN:", font=self.fonts['normal'],
-                bg=self.colors['white']).grid(row=4, column=0, sticky='w', pady=10)
-        gstin_var = tk.StringVar(value=company[5] if company else '')
-        tk.Entry(form_frame, textvariable=gstin_var, font=self.fonts['normal'], width=40).grid(row=4, column=1, padx=10)
-
-        def save_settings():
-            self.db.execute("""
-                UPDATE company SET name=?, address=?, phone=?, email=?, gstin=?
-                WHERE id=1
-            """, (name_var.get(), address_var.get(), phone_var.get(), 
-                 email_var.get(), gstin_var.get()))
-            messagebox.showinfo("Success", "Settings saved!")
-
-        tk.Button(form_frame, text="Save Settings", font=self.fonts['normal'],
-                 bg=self.colors['success'], fg=self.colors['white'],
-                 relief='flat', cursor='hand2', padx=30, pady=10,
-                 command=save_settings).grid(row=5, column=1, pady=30, sticky='e')
-
-    def logout(self):
-        self.current_user = None
-        self.current_role = None
-        self.show_login_screen()
-
-    def clear_window(self):
-        for widget in self.root.winfo_children():
-            widget.destroy()
-
-    def clear_main_content(self):
-        for widget in self.main_content.winfo_children():
-            widget.destroy()
-
-# Run Application
-if __name__ == "__main__":
-    root = tk.Tk()
-    app = SeizeBillingApp(root)
-    root.mainloop()
-
-    def show_invoice_actions(self, invoice_no):
-        dialog = tk.Toplevel(self.root)
-        dialog.title(f"Invoice {invoice_no}")
-        dialog.geometry("300x250")
-        dialog.configure(bg=self.colors['white'])
-        dialog.transient(self.root)
-        dialog.grab_set()
-
-        tk.Label(dialog, text=f"Invoice: {invoice_no}",
-                font=self.fonts['header'], bg=self.colors['white'],
-                fg=self.colors['primary']).pack(pady=20)
-
-        tk.Button(dialog, text="View/Edit", font=self.fonts['normal'],
-                 bg=self.colors['accent'], fg=self.colors['white'],
-                 relief='flat', cursor='hand2', width=20, pady=10,
-                 command=lambda: [dialog.destroy(), self.edit_invoice(invoice_no)]).pack(pady=5)
-
-        tk.Button(dialog, text="Print", font=self.fonts['normal'],
-                 bg=self.colors['success'], fg=self.colors['white'],
-                 relief='flat', cursor='hand2', width=20, pady=10,
-                 command=lambda: [dialog.destroy(), self.print_invoice(invoice_no)]).pack(pady=5)
-
-        if self.current_role == 'admin':
-            tk.Button(dialog, text="Delete", font=self.fonts['normal'],
-                     bg=self.colors['danger'], fg=self.colors['white'],
-                     relief='flat', cursor='hand2', width=20, pady=10,
-                     command=lambda: [dialog.destroy(), self.delete_invoice(invoice_no)]).pack(pady=5)
-
-    def edit_invoice(self, invoice_no):
-        inv = self.db.fetchone("SELECT id FROM invoices WHERE invoice_no=?", (invoice_no,))
-        if inv:
-            self.show_invoice_screen(edit_invoice_id=inv[0])
-
-    def load_invoice_for_edit(self, invoice_id):
-        inv = self.db.fetchone("""
-            SELECT invoice_no, customer_name, customer_phone, customer_gstin, date
-            FROM invoices WHERE id=?
-        """, (invoice_id,))
-
-        if inv:
-            self.inv_no_var.set(inv[0])
-            self.cust_name_var.set(inv[1])
-            self.cust_phone_var.set(inv[2])
-            self.cust_gstin_var.set(inv[3])
-            self.inv_date_var.set(inv[4])
-
-            # Load items
-            items = self.db.fetchall("""
-                SELECT product_name, quantity, price, gst_rate, total
-                FROM invoice_items WHERE invoice_id=?
-            """, (invoice_id,))
-
-            for item in items:
-                self.items_tree.insert('', 'end', values=item)
-
-            self.calculate_totals()
-
-    def delete_invoice(self, invoice_no):
-        if messagebox.askyesno("Confirm", f"Delete invoice {invoice_no}?"):
-            self.db.execute("DELETE FROM invoices WHERE invoice_no=?", (invoice_no,))
-            messagebox.showinfo("Success", "Invoice deleted")
-            self.show_invoices_list()
-
-    def print_invoice(self, invoice_no=None):
-        if not invoice_no:
-            invoice_no = self.inv_no_var.get()
-
-        messagebox.showinfo("Print", f"Printing invoice {invoice_no}...\n(Print functionality would generate PDF)")
-
-    def show_products(self):
-        self.clear_main_content()
-
-        header = tk.Frame(self.main_content, bg=self.colors['white'],
-                         highlightbackground=self.colors['border'],
-                         highlightthickness=1, height=80)
-        header.pack(fill='x', pady=(0,20))
-        header.pack_propagate(False)
-
-        tk.Label(header, text="Products", font=self.fonts['title'],
-                bg=self.colors['white'], fg=self.colors['primary']).pack(side='left', padx=30, pady=20)
-
-        if self.current_role == 'admin':
-            tk.Button(header, text="+ Add Product", font=self.fonts['normal'],
-                     bg=self.colors['success'], fg=self.colors['white'],
-                     relief='flat', cursor='hand2',
-                     command=self.add_product_dialog).pack(side='right', padx=30, pady=20)
-
-        # Products table
-        table_frame = tk.Frame(self.main_content, bg=self.colors['white'],
-                              highlightbackground=self.colors['border'],
-                              highlightthickness=1)
-        table_frame.pack(fill='both', expand=True, pady=10)
-
-        columns = ('Name', 'HSN', 'Price', 'GST%', 'Stock', 'Min Stock')
-        tree = ttk.Treeview(table_frame, columns=columns, show='headings', height=20)
-
-        for col in columns:
-            tree.heading(col, text=col)
-            tree.column(col, width=120)
-
-        tree.column('Name', width=250)
-
-        scrollbar = ttk.Scrollbar(table_frame, orient='vertical', command=tree.yview)
-        tree.configure(yscrollcommand=scrollbar.set)
-        scrollbar.pack(side='right', fill='y')
-        tree.pack(fill='both', expand=True, padx=20, pady=20)
-
-        # Load products
-        products = self.db.fetchall("SELECT name, hsn_code, price, gst_rate, stock, min_stock FROM products")
-
-        for prod in products:
-            tag = 'low' if prod[4] <= prod[5] else 'normal'
-            tree.insert('', 'end', values=prod, tags=(tag,))
-
-        tree.tag_configure('low', foreground=self.colors['danger'])
-        tree.tag_configure('normal', foreground=self.colors['success'])
-
-    def add_product_dialog(self):
-        dialog = tk.Toplevel(self.root)
-        dialog.title("Add Product")
-        dialog.geometry("400x500")
-        dialog.configure(bg=self.colors['white'])
-        dialog.transient(self.root)
-        dialog.grab_set()
-
-        fields = [
-            ('Product Name:', 'name'),
-            ('HSN Code:', 'hsn'),
-            ('Price:', 'price'),
-            ('GST Rate (%):', 'gst'),
-            ('Opening Stock:', 'stock'),
-            ('Min Stock Level:', 'min_stock')
-        ]
-
-        entries = {}
-        for label, key in fields:
-            tk.Label(dialog, text=label, font=self.fonts['normal'],
-                    bg=self.colors['white']).pack(pady=(15,5))
-            entry = tk.Entry(dialog, font=self.fonts['normal'])
-            entry.pack(fill='x', padx=20)
-            entries[key] = entry
-
-        def save():
-            try:
-                self.db.execute("""
-                    INSERT INTO products (name, hsn_code, price, gst_rate, stock, min_stock)
-                    VALUES (?, ?, ?, ?, ?, ?)
-                """, (
-                    entries['name'].get(),
-                    entries['hsn'].get(),
-                    float(entries['price'].get() or 0),
-                    float(entries['gst'].get() or 18),
-                    int(entries['stock'].get() or 0),
-                    int(entries['min_stock'].get() or 10)
-                ))
-                messagebox.showinfo("Success", "Product added!")
-                dialog.destroy()
-                self.show_products()
-            except Exception as e:
-                messagebox.showerror("Error", str(e))
-
-        tk.Button(dialog, text="Save", font=self.fonts['normal'],
-                 bg=self.colors['success'], fg=self.colors['white'],
-                 relief='flat', cursor='hand2', padx=30, pady=10,
-                 command=save).pack(pady=30)
-
-    def show_stock(self):
-        self.show_products()  # Same as products for now
-
-    def show_expenses(self):
-        self.clear_main_content()
-
-        header = tk.Frame(self.main_content, bg=self.colors['white'],
-                         highlightbackground=self.colors['border'],
-                         highlightthickness=1, height=80)
-        header.pack(fill='x', pady=(0,20))
-        header.pack_propagate(False)
-
-        tk.Label(header, text="Expenses", font=self.fonts['title'],
-                bg=self.colors['white'], fg=self.colors['primary']).pack(side='left', padx=30, pady=20)
-
-        tk.Button(header, text="+ Add Expense", font=self.fonts['normal'],
-                 bg=self.colors['danger'], fg=self.colors['white'],
-                 relief='flat', cursor='hand2',
-                 command=self.add_expense_dialog).pack(side='right', padx=30, pady=20)
-
-        # Expenses table
-        table_frame = tk.Frame(self.main_content, bg=self.colors['white'],
-                              highlightbackground=self.colors['border'],
-                              highlightthickness=1)
-        table_frame.pack(fill='both', expand=True, pady=10)
-
-        columns = ('Date', 'Category', 'Amount', 'Description', 'Added By')
-        tree = ttk.Treeview(table_frame, columns=columns, show='headings', height=20)
-
-        for col in columns:
-            tree.heading(col, text=col)
-            tree.column(col, width=150)
-
-        tree.column('Description', width=300)
-
-        scrollbar = ttk.Scrollbar(table_frame, orient='vertical', command=tree.yview)
-        tree.configure(yscrollcommand=scrollbar.set)
-        scrollbar.pack(side='right', fill='y')
-        tree.pack(fill='both', expand=True, padx=20, pady=20)
-
-        # Load expenses
-        expenses = self.db.fetchall("""
-            SELECT date, category, amount, description, created_by 
-            FROM expenses ORDER BY date DESC
-        """)
-
-        for exp in expenses:
-            tree.insert('', 'end', values=exp)
-
-    def add_expense_dialog(self):
-        dialog = tk.Toplevel(self.root)
-        dialog.title("Add Expense")
-        dialog.geometry("400x400")
-        dialog.configure(bg=self.colors['white'])
-        dialog.transient(self.root)
-        dialog.grab_set()
-
-        tk.Label(dialog, text="Category:", font=self.fonts['normal'],
-                bg=self.colors['white']).pack(pady=(20,5))
-
-        categories = ['Rent', 'Salary', 'Electricity', 'Transport', 'Marketing', 'Other']
-        cat_var = tk.StringVar()
-        ttk.Combobox(dialog, textvariable=cat_var, values=categories,
-                    font=self.fonts['normal'], state='readonly').pack(fill='x', padx=20)
-
-        tk.Label(dialog, text="Amount:", font=self.fonts['normal'],
-                bg=self.colors['white']).pack(pady=(15,5))
-        amount_var = tk.StringVar()
-        tk.Entry(dialog, textvariable=amount_var, font=self.fonts['normal']).pack(fill='x', padx=20)
-
-        tk.Label(dialog, text="Description:", font=self.fonts['normal'],
-                bg=self.colors['white']).pack(pady=(15,5))
-        desc_text = tk.Text(dialog, font=self.fonts['normal'], height=5)
-        desc_text.pack(fill='x', padx=20)
-
-        def save():
-            try:
-                self.db.execute("""
-                    INSERT INTO expenses (category, amount, description, created_by)
-                    VALUES (?, ?, ?, ?)
-                """, (cat_var.get(), float(amount_var.get()), 
-                     desc_text.get('1.0', 'end'), self.current_user))
-                messagebox.showinfo("Success", "Expense added!")
-                dialog.destroy()
-                self.show_expenses()
-            except Exception as e:
-                messagebox.showerror("Error", str(e))
-
-        tk.Button(dialog, text="Save", font=self.fonts['normal'],
-                 bg=self.colors['danger'], fg=self.colors['white'],
-                 relief='flat', cursor='hand2', padx=30, pady=10,
-                 command=save).pack(pady=30)
\ No newline at end of file
+
+# Modules only some commands or dialogs need (argparse, multiprocessing,
+# file dialogs, webbrowser, gzip/hashlib for the API, pandas, reportlab...)
+# are imported where they are used, so the login window comes up quickly.
+import bisect
+import csv
+try:
+    import tkinter as tk
+    from tkinter import ttk, messagebox
+    from tkinter.font import Font
+except ImportError:
+    # Headless servers (gunicorn app:app) may not have Tk; only the desktop
+    # app needs it
+    tk = None
+import sqlite3
+import base64
+import json
+import math
+import os
+import platform
+import queue
+import re
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from datetime import datetime, date, timedelta
+from decimal import Decimal, ROUND_HALF_UP
+import threading
+
+# When the module finished importing, for the first-paint time reported
+# with SEIZE_UI_TIMING
+IMPORTED = time.perf_counter()
+
+DB_PATH = os.environ.get('SEIZE_DB_PATH', 'seize_billing.db')
+
+# SQLite connection tuning. SEIZE_DB_PROFILE picks a profile and any single
+# pragma can be overridden with SEIZE_DB_<PRAGMA>, e.g. SEIZE_DB_CACHE_SIZE=-131072
+DB_PROFILES = {
+    # Stock SQLite/Python settings, kept for comparison and troubleshooting
+    'default': {
+        'busy_timeout': 5000,
+        'journal_mode': 'DELETE',
+        'synchronous': 'FULL',
+        'cache_size': -2000,
+        'mmap_size': 0,
+        'temp_store': 'DEFAULT',
+    },
+    # Store terminals: readers never wait on a sale being saved
+    'terminal': {
+        'busy_timeout': 5000,
+        'journal_mode': 'WAL',
+        'synchronous': 'NORMAL',
+        'cache_size': -65536,        # 64 MB
+        'mmap_size': 268435456,      # 256 MB
+        'temp_store': 'MEMORY',
+    },
+    # Back office / web server with several workers on one database
+    'server': {
+        'busy_timeout': 10000,
+        'journal_mode': 'WAL',
+        'synchronous': 'NORMAL',
+        'cache_size': -262144,       # 256 MB
+        'mmap_size': 1073741824,     # 1 GB
+        'temp_store': 'MEMORY',
+    },
+}
+DEFAULT_DB_PROFILE = 'terminal'
+
+# Dashboard and other cached stats are refreshed at least this often, which
+# bounds staleness from writers in other processes
+CACHE_TTL = float(os.environ.get('SEIZE_CACHE_TTL', 60))
+
+WRITE_TABLE = re.compile(
+    r"^\s*(?:INSERT(?:\s+OR\s+\w+)?\s+INTO|REPLACE\s+INTO|UPDATE(?:\s+OR\s+\w+)?|DELETE\s+FROM)\s+(\w+)",
+    re.IGNORECASE)
+# Dates as stored and as the API accepts them
+ISO_DATE = re.compile(r"\d{4}-\d{2}-\d{2}")
+
+# Read-only connections kept per process; writes always go through one writer
+DB_POOL_SIZE = int(os.environ.get('SEIZE_DB_POOL_SIZE', 4))
+DB_POOL_TIMEOUT = float(os.environ.get('SEIZE_DB_POOL_TIMEOUT', 30))
+
+
+def db_settings(profile=None):
+    profile = profile or os.environ.get('SEIZE_DB_PROFILE', DEFAULT_DB_PROFILE)
+    if profile not in DB_PROFILES:
+        raise ValueError(f"Unknown database profile '{profile}'")
+
+    settings = dict(DB_PROFILES[profile])
+    for pragma in settings:
+        value = os.environ.get(f'SEIZE_DB_{pragma.upper()}')
+        if value is not None:
+            if not value.lstrip('-').isalnum():
+                raise ValueError(f"Invalid value for SEIZE_DB_{pragma.upper()}: {value!r}")
+            settings[pragma] = value
+    return settings
+
+
+# Invoice numbering: SEZ0001, or SEZ2425-0001 when numbers restart every
+# financial year. A block size above 1 makes each terminal lease its own range.
+INVOICE_PREFIX = os.environ.get('SEIZE_INVOICE_PREFIX', 'SEZ')
+INVOICE_FY_RESET = os.environ.get('SEIZE_INVOICE_FY_RESET', '0') == '1'
+INVOICE_BLOCK = int(os.environ.get('SEIZE_INVOICE_BLOCK', 1))
+TERMINAL_ID = os.environ.get('SEIZE_TERMINAL_ID') or platform.node() or 'default'
+
+# Per-day rollups behind the dashboard and reports. Triggers keep them in step
+# with every write to invoices/expenses; Database.rebuild_rollups() backfills.
+ROLLUP_REBUILD = [
+    "DELETE FROM daily_sales",
+    """
+    INSERT INTO daily_sales (day, invoice_count, subtotal, gst_amount, total)
+    SELECT date, COUNT(*), COALESCE(SUM(subtotal), 0), COALESCE(SUM(gst_amount), 0),
+           COALESCE(SUM(total), 0)
+    FROM invoices WHERE status != 'cancelled' GROUP BY date
+    """,
+    "DELETE FROM daily_expenses",
+    """
+    INSERT INTO daily_expenses (day, category, expense_count, amount)
+    SELECT date, COALESCE(category, ''), COUNT(*), COALESCE(SUM(amount), 0)
+    FROM expenses GROUP BY date, COALESCE(category, '')
+    """,
+]
+
+
+def _sales_rollup_trigger(name, event, row, sign):
+    return f"""
+        CREATE TRIGGER IF NOT EXISTS {name} AFTER {event} ON invoices
+        WHEN {row}.status != 'cancelled'
+        BEGIN
+            INSERT INTO daily_sales (day, invoice_count, subtotal, gst_amount, total)
+            VALUES ({row}.date, {sign}1, {sign}COALESCE({row}.subtotal, 0),
+                    {sign}COALESCE({row}.gst_amount, 0), {sign}COALESCE({row}.total, 0))
+            ON CONFLICT (day) DO UPDATE SET
+                invoice_count = invoice_count + excluded.invoice_count,
+                subtotal = subtotal + excluded.subtotal,
+                gst_amount = gst_amount + excluded.gst_amount,
+                total = total + excluded.total;
+        END
+    """
+
+
+def _expense_rollup_trigger(name, event, row, sign):
+    return f"""
+        CREATE TRIGGER IF NOT EXISTS {name} AFTER {event} ON expenses
+        BEGIN
+            INSERT INTO daily_expenses (day, category, expense_count, amount)
+            VALUES ({row}.date, COALESCE({row}.category, ''), {sign}1,
+                    {sign}COALESCE({row}.amount, 0))
+            ON CONFLICT (day, category) DO UPDATE SET
+                expense_count = expense_count + excluded.expense_count,
+                amount = amount + excluded.amount;
+        END
+    """
+
+
+def _gstin_state_sql(gstin):
+    # State code of a well-formed GSTIN, '' for anything else (unregistered)
+    return (f"CASE WHEN length(trim({gstin})) = 15 AND trim({gstin}) GLOB '[0-9][0-9]*' "
+            f"THEN substr(trim({gstin}), 1, 2) ELSE '' END")
+
+
+def _gst_rollup_upsert(invoice, line, source, sign):
+    # Adds (sign '') or takes out (sign '-') the lines picked by `source`;
+    # `invoice` and `line` name its invoices and invoice_items rows
+    return f"""
+            INSERT INTO daily_gst (day, place_of_supply, hsn_code, rate, line_count,
+                                   quantity, taxable_value)
+            SELECT {invoice}.date, {_gstin_state_sql(f'{invoice}.customer_gstin')},
+                   COALESCE({line}.hsn_code, ''), COALESCE({line}.gst_rate, 0), {sign}1,
+                   {sign}COALESCE({line}.quantity, 0),
+                   {sign}COALESCE({line}.quantity * {line}.price, 0)
+            {source} AND {invoice}.status != 'cancelled'
+            ON CONFLICT (day, place_of_supply, hsn_code, rate) DO UPDATE SET
+                line_count = line_count + excluded.line_count,
+                quantity = quantity + excluded.quantity,
+                taxable_value = taxable_value + excluded.taxable_value;
+    """
+
+
+def _gst_rollup_trigger(name, event, *statements):
+    return f"""
+        CREATE TRIGGER IF NOT EXISTS {name} AFTER {event}
+        BEGIN
+            {''.join(statements)}
+        END
+    """
+
+
+# Per-day GST rollup: taxable value by place of supply ('' for customers
+# without a GSTIN), HSN code and rate. Kept up to date from both sides, since
+# lines may be written before or after their invoice.
+GST_ROLLUP_REBUILD = [
+    "DELETE FROM daily_gst",
+    f"""
+    INSERT INTO daily_gst (day, place_of_supply, hsn_code, rate, line_count, quantity, taxable_value)
+    SELECT i.date, {_gstin_state_sql('i.customer_gstin')}, COALESCE(ii.hsn_code, ''),
+           COALESCE(ii.gst_rate, 0), COUNT(*), COALESCE(SUM(ii.quantity), 0),
+           COALESCE(SUM(ii.quantity * ii.price), 0)
+    FROM invoices i JOIN invoice_items ii ON ii.invoice_id = i.id
+    WHERE i.status != 'cancelled'
+    GROUP BY 1, 2, 3, 4
+    """,
+]
+
+
+# Lines are booked on their invoice's date; those of cancelled invoices count
+# for nothing, so closed-period guards let them change
+INVOICE_LINE_DATE = "(SELECT date FROM invoices WHERE id = {row}.invoice_id AND status != 'cancelled')"
+
+
+def _closed_period_guard(name, event, rows, when, date='{row}.date'):
+    # Refuses writes that would change the stored result of a closed month.
+    # `date` gives the date a row is booked on, for tables without their own.
+    months = ', '.join(f"substr({date.format(row=row)}, 1, 7)" for row in rows)
+    return f"""
+        CREATE TRIGGER IF NOT EXISTS {name} BEFORE {event}
+        WHEN ({when}) AND EXISTS (SELECT 1 FROM closed_periods WHERE month IN ({months}))
+        BEGIN
+            SELECT RAISE(ABORT, 'date falls in a closed accounting period');
+        END
+    """
+
+
+def _create_invoice_search(conn):
+    # FTS5 is compiled into the usual SQLite builds; without it invoice search
+    # falls back to LIKE (see Database.search_invoices)
+    try:
+        conn.execute("CREATE VIRTUAL TABLE temp.fts5_probe USING fts5(x)")
+        conn.execute("DROP TABLE temp.fts5_probe")
+    except sqlite3.OperationalError:
+        return
+
+    # The invoice number is also indexed without its prefix and leading zeros,
+    # so "42" and "0042" find SEZ0042
+    number = "{row}.invoice_no || ' ' || ltrim({row}.invoice_no, 'ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz') || ' ' || ltrim(ltrim({row}.invoice_no, 'ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz'), '0')"
+    products = "(SELECT COALESCE(group_concat(product_name, ' '), '') FROM invoice_items WHERE invoice_id = {id})"
+    for statement in [
+        """
+        CREATE VIRTUAL TABLE IF NOT EXISTS invoice_search USING fts5(
+            invoice_no, customer_name, customer_phone, customer_gstin, products,
+            prefix = '2 3'
+        )
+        """,
+        f"""
+        CREATE TRIGGER IF NOT EXISTS trg_invoice_search_insert AFTER INSERT ON invoices
+        BEGIN
+            INSERT INTO invoice_search (rowid, invoice_no, customer_name, customer_phone,
+                                        customer_gstin, products)
+            VALUES (NEW.id, {number.format(row='NEW')}, NEW.customer_name, NEW.customer_phone,
+                    NEW.customer_gstin, {products.format(id='NEW.id')});
+        END
+        """,
+        f"""
+        CREATE TRIGGER IF NOT EXISTS trg_invoice_search_update
+        AFTER UPDATE OF invoice_no, customer_name, customer_phone, customer_gstin ON invoices
+        BEGIN
+            UPDATE invoice_search SET invoice_no = {number.format(row='NEW')},
+                customer_name = NEW.customer_name, customer_phone = NEW.customer_phone,
+                customer_gstin = NEW.customer_gstin
+            WHERE rowid = NEW.id;
+        END
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS trg_invoice_search_delete AFTER DELETE ON invoices
+        BEGIN
+            DELETE FROM invoice_search WHERE rowid = OLD.id;
+        END
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS trg_invoice_search_item_insert AFTER INSERT ON invoice_items
+        BEGIN
+            UPDATE invoice_search SET products = products || ' ' || COALESCE(NEW.product_name, '')
+            WHERE rowid = NEW.invoice_id;
+        END
+        """,
+        f"""
+        CREATE TRIGGER IF NOT EXISTS trg_invoice_search_item_update
+        AFTER UPDATE OF invoice_id, product_name ON invoice_items
+        BEGIN
+            UPDATE invoice_search SET products = {products.format(id='OLD.invoice_id')}
+            WHERE rowid = OLD.invoice_id;
+            UPDATE invoice_search SET products = {products.format(id='NEW.invoice_id')}
+            WHERE rowid = NEW.invoice_id;
+        END
+        """,
+        f"""
+        CREATE TRIGGER IF NOT EXISTS trg_invoice_search_item_delete AFTER DELETE ON invoice_items
+        BEGIN
+            UPDATE invoice_search SET products = {products.format(id='OLD.invoice_id')}
+            WHERE rowid = OLD.invoice_id;
+        END
+        """,
+        "DELETE FROM invoice_search",
+        f"""
+        INSERT INTO invoice_search (rowid, invoice_no, customer_name, customer_phone,
+                                    customer_gstin, products)
+        SELECT id, {number.format(row='invoices')}, customer_name, customer_phone,
+               customer_gstin, {products.format(id='invoices.id')}
+        FROM invoices
+        """,
+    ]:
+        conn.execute(statement)
+
+
+def _add_item_hsn(conn):
+    columns = {row[1] for row in conn.execute("PRAGMA table_info(invoice_items)")}
+    if 'hsn_code' not in columns:
+        conn.execute("ALTER TABLE invoice_items ADD COLUMN hsn_code TEXT")
+
+
+def fts_query(text):
+    # Every word the user typed must prefix-match some indexed word
+    words = re.findall(r'\w+', text)
+    return ' '.join(f'"{word}"*' for word in words)
+
+
+# Schema changes on top of the base tables. Each migration runs once, in order,
+# in its own transaction and is recorded in schema_version. Steps are SQL
+# statements or callables taking the connection, and must be idempotent.
+MIGRATIONS = [
+    (1, "Indexes for dashboard, invoice list, reports and stock updates", [
+        # Covering for per-day sales totals and the status filters
+        "CREATE INDEX IF NOT EXISTS idx_invoices_date_status ON invoices (date, status, total)",
+        "CREATE INDEX IF NOT EXISTS idx_invoices_created_at ON invoices (created_at)",
+        "CREATE INDEX IF NOT EXISTS idx_invoice_items_invoice ON invoice_items (invoice_id)",
+        "CREATE INDEX IF NOT EXISTS idx_products_name ON products (name)",
+        "CREATE INDEX IF NOT EXISTS idx_expenses_date ON expenses (date, amount)",
+    ]),
+    (2, "Invoice number sequences and per-terminal leases", [
+        """
+        CREATE TABLE IF NOT EXISTS invoice_sequences (
+            series TEXT PRIMARY KEY,
+            next_no INTEGER NOT NULL
+        )
+        """,
+        """
+        CREATE TABLE IF NOT EXISTS invoice_number_leases (
+            terminal TEXT NOT NULL,
+            series TEXT NOT NULL,
+            next_no INTEGER NOT NULL,
+            end_no INTEGER NOT NULL,
+            PRIMARY KEY (terminal, series)
+        )
+        """,
+    ]),
+    (3, "Daily sales and expense rollups", [
+        """
+        CREATE TABLE IF NOT EXISTS daily_sales (
+            day DATE PRIMARY KEY,
+            invoice_count INTEGER NOT NULL DEFAULT 0,
+            subtotal REAL NOT NULL DEFAULT 0,
+            gst_amount REAL NOT NULL DEFAULT 0,
+            total REAL NOT NULL DEFAULT 0
+        )
+        """,
+        """
+        CREATE TABLE IF NOT EXISTS daily_expenses (
+            day DATE NOT NULL,
+            category TEXT NOT NULL,
+            expense_count INTEGER NOT NULL DEFAULT 0,
+            amount REAL NOT NULL DEFAULT 0,
+            PRIMARY KEY (day, category)
+        )
+        """,
+        _sales_rollup_trigger('trg_daily_sales_insert', 'INSERT', 'NEW', ''),
+        _sales_rollup_trigger('trg_daily_sales_delete', 'DELETE', 'OLD', '-'),
+        # An update moves the old row out of its day and the new row in
+        _sales_rollup_trigger('trg_daily_sales_update_old',
+                              'UPDATE OF date, status, subtotal, gst_amount, total', 'OLD', '-'),
+        _sales_rollup_trigger('trg_daily_sales_update_new',
+                              'UPDATE OF date, status, subtotal, gst_amount, total', 'NEW', ''),
+        _expense_rollup_trigger('trg_daily_expenses_insert', 'INSERT', 'NEW', ''),
+        _expense_rollup_trigger('trg_daily_expenses_delete', 'DELETE', 'OLD', '-'),
+        _expense_rollup_trigger('trg_daily_expenses_update_old',
+                                'UPDATE OF date, category, amount', 'OLD', '-'),
+        _expense_rollup_trigger('trg_daily_expenses_update_new',
+                                'UPDATE OF date, category, amount', 'NEW', ''),
+        *ROLLUP_REBUILD,
+    ]),
+    (4, "Full-text search over invoices", [_create_invoice_search]),
+    (5, "Keyset pagination indexes", [
+        # (date) indexes end in the rowid, matching ORDER BY date, id
+        "CREATE INDEX IF NOT EXISTS idx_invoices_date ON invoices (date)",
+        "CREATE INDEX IF NOT EXISTS idx_expenses_day ON expenses (date)",
+    ]),
+    (6, "Stock movement ledger keyed by product id", [
+        """
+        CREATE TABLE IF NOT EXISTS stock_movements (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            product_id INTEGER NOT NULL,
+            qty_delta INTEGER NOT NULL,
+            reason TEXT NOT NULL,
+            invoice_id INTEGER,
+            created_by TEXT,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            FOREIGN KEY (product_id) REFERENCES products (id)
+        )
+        """,
+        "CREATE INDEX IF NOT EXISTS idx_stock_movements_product ON stock_movements (product_id)",
+        "CREATE INDEX IF NOT EXISTS idx_stock_movements_invoice ON stock_movements (invoice_id, product_id)",
+        "CREATE INDEX IF NOT EXISTS idx_invoice_items_product ON invoice_items (product_id)",
+        # Old lines only carry the name; resolve to the first product of that name
+        """
+        UPDATE invoice_items SET product_id = (
+            SELECT MIN(id) FROM products WHERE products.name = invoice_items.product_name
+        ) WHERE product_id IS NULL
+        """,
+        # Opening balances so the ledger adds up to today's stock
+        "DELETE FROM stock_movements",
+        """
+        INSERT INTO stock_movements (product_id, qty_delta, reason)
+        SELECT id, stock, 'opening' FROM products WHERE COALESCE(stock, 0) != 0
+        """,
+        # products.stock is the running balance of the ledger from here on
+        """
+        CREATE TRIGGER IF NOT EXISTS trg_stock_movements_balance AFTER INSERT ON stock_movements
+        BEGIN
+            UPDATE products SET stock = COALESCE(stock, 0) + NEW.qty_delta
+            WHERE id = NEW.product_id;
+        END
+        """,
+    ]),
+    (7, "Legacy invoice import checkpoints", [
+        # One row per headers/lines file pair; progress is committed with
+        # each batch so an interrupted import resumes from the last one
+        """
+        CREATE TABLE IF NOT EXISTS legacy_imports (
+            source TEXT PRIMARY KEY,
+            stage TEXT NOT NULL DEFAULT 'headers',
+            headers_done INTEGER NOT NULL DEFAULT 0,
+            lines_done INTEGER NOT NULL DEFAULT 0,
+            deferred TEXT,
+            started_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            finished_at TIMESTAMP
+        )
+        """,
+        """
+        CREATE TABLE IF NOT EXISTS legacy_invoice_map (
+            legacy_no TEXT PRIMARY KEY,
+            invoice_id INTEGER NOT NULL
+        ) WITHOUT ROWID
+        """,
+        """
+        CREATE TABLE IF NOT EXISTS legacy_import_issues (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            source TEXT NOT NULL,
+            file_line INTEGER,
+            legacy_no TEXT,
+            kind TEXT NOT NULL,
+            message TEXT,
+            legacy_value REAL,
+            computed_value REAL
+        )
+        """,
+    ]),
+    (8, "HSN code on invoice lines and daily GST rollup", [
+        # GST returns need the HSN the line was billed under, not whatever the
+        # product carries today
+        _add_item_hsn,
+        """
+        UPDATE invoice_items SET hsn_code = (
+            SELECT hsn_code FROM products WHERE products.id = invoice_items.product_id
+        ) WHERE COALESCE(hsn_code, '') = ''
+        """,
+        """
+        CREATE TABLE IF NOT EXISTS daily_gst (
+            day DATE NOT NULL,
+            place_of_supply TEXT NOT NULL,
+            hsn_code TEXT NOT NULL,
+            rate REAL NOT NULL,
+            line_count INTEGER NOT NULL DEFAULT 0,
+            quantity REAL NOT NULL DEFAULT 0,
+            taxable_value REAL NOT NULL DEFAULT 0,
+            PRIMARY KEY (day, place_of_supply, hsn_code, rate)
+        )
+        """,
+        _gst_rollup_trigger(
+            'trg_daily_gst_item_insert', 'INSERT ON invoice_items',
+            _gst_rollup_upsert('i', 'NEW', "FROM invoices i WHERE i.id = NEW.invoice_id", '')),
+        _gst_rollup_trigger(
+            'trg_daily_gst_item_delete', 'DELETE ON invoice_items',
+            _gst_rollup_upsert('i', 'OLD', "FROM invoices i WHERE i.id = OLD.invoice_id", '-')),
+        _gst_rollup_trigger(
+            'trg_daily_gst_item_update', 'UPDATE OF invoice_id, quantity, price, gst_rate, hsn_code ON invoice_items',
+            _gst_rollup_upsert('i', 'OLD', "FROM invoices i WHERE i.id = OLD.invoice_id", '-'),
+            _gst_rollup_upsert('i', 'NEW', "FROM invoices i WHERE i.id = NEW.invoice_id", '')),
+        # Lines saved before their invoice are picked up when it arrives
+        _gst_rollup_trigger(
+            'trg_daily_gst_invoice_insert', 'INSERT ON invoices',
+            _gst_rollup_upsert('NEW', 'ii', "FROM invoice_items ii WHERE ii.invoice_id = NEW.id", '')),
+        _gst_rollup_trigger(
+            'trg_daily_gst_invoice_delete', 'DELETE ON invoices',
+            _gst_rollup_upsert('OLD', 'ii', "FROM invoice_items ii WHERE ii.invoice_id = OLD.id", '-')),
+        _gst_rollup_trigger(
+            'trg_daily_gst_invoice_update', 'UPDATE OF date, status, customer_gstin ON invoices',
+            _gst_rollup_upsert('OLD', 'ii', "FROM invoice_items ii WHERE ii.invoice_id = OLD.id", '-'),
+            _gst_rollup_upsert('NEW', 'ii', "FROM invoice_items ii WHERE ii.invoice_id = NEW.id", '')),
+        *GST_ROLLUP_REBUILD,
+    ]),
+    (9, "Closed accounting periods", [
+        # A month's P&L as it stood when it was closed. Closed months are
+        # never recomputed, so the guards below keep their rows unchanged.
+        """
+        CREATE TABLE IF NOT EXISTS closed_periods (
+            month TEXT PRIMARY KEY,
+            invoice_count INTEGER NOT NULL,
+            subtotal REAL NOT NULL,
+            gst_amount REAL NOT NULL,
+            sales REAL NOT NULL,
+            expense_count INTEGER NOT NULL,
+            expenses REAL NOT NULL,
+            closed_by TEXT,
+            closed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+        """,
+        _closed_period_guard('trg_closed_period_invoice_insert', 'INSERT ON invoices', ['NEW'],
+                             "NEW.status != 'cancelled'"),
+        _closed_period_guard('trg_closed_period_invoice_delete', 'DELETE ON invoices', ['OLD'],
+                             "OLD.status != 'cancelled'"),
+        # Payment status and customer details may still change
+        _closed_period_guard('trg_closed_period_invoice_update', 'UPDATE ON invoices', ['OLD', 'NEW'], """
+            OLD.date IS NOT NEW.date OR OLD.subtotal IS NOT NEW.subtotal
+            OR OLD.gst_amount IS NOT NEW.gst_amount OR OLD.total IS NOT NEW.total
+            OR (OLD.status = 'cancelled') IS NOT (NEW.status = 'cancelled')
+        """),
+        _closed_period_guard('trg_closed_period_expense_insert', 'INSERT ON expenses', ['NEW'], "1"),
+        _closed_period_guard('trg_closed_period_expense_delete', 'DELETE ON expenses', ['OLD'], "1"),
+        _closed_period_guard('trg_closed_period_expense_update', 'UPDATE ON expenses', ['OLD', 'NEW'],
+                             "OLD.date IS NOT NEW.date OR OLD.amount IS NOT NEW.amount"),
+    ]),
+    (10, "Reorder suggestions from sales velocity", [
+        # Per-product demand as of computed_on, written by refresh_reorder()
+        """
+        CREATE TABLE IF NOT EXISTS reorder_stats (
+            product_id INTEGER PRIMARY KEY,
+            units_7d REAL NOT NULL,
+            units_28d REAL NOT NULL,
+            units_90d REAL NOT NULL,
+            velocity REAL NOT NULL,
+            demand_sd REAL NOT NULL,
+            reorder_point REAL NOT NULL,
+            order_up_to REAL NOT NULL,
+            computed_on DATE NOT NULL
+        )
+        """,
+        # Stock movements up to last_movement_id are reflected in reorder_stats
+        """
+        CREATE TABLE IF NOT EXISTS reorder_state (
+            id INTEGER PRIMARY KEY CHECK (id = 1),
+            last_movement_id INTEGER NOT NULL,
+            computed_on DATE
+        )
+        """,
+        "INSERT OR IGNORE INTO reorder_state (id, last_movement_id) VALUES (1, 0)",
+        # Live stock against the stored demand. Products that haven't sold in
+        # the window fall back to the hand-entered min_stock and sort last.
+        """
+        CREATE VIEW IF NOT EXISTS stock_reorder AS
+        SELECT p.id, p.name, p.hsn_code, p.stock, p.min_stock,
+               COALESCE(r.velocity, 0) AS velocity,
+               CASE WHEN r.velocity > 0 THEN MAX(p.stock, 0) / r.velocity END AS days_of_cover,
+               COALESCE(r.reorder_point, p.min_stock) AS reorder_point,
+               CASE WHEN p.stock <= COALESCE(r.reorder_point, p.min_stock)
+                    THEN MAX(CAST(ROUND(COALESCE(r.order_up_to, 2 * p.min_stock) - p.stock + 0.499)
+                                  AS INTEGER), 0)
+                    ELSE 0 END AS order_qty,
+               CASE WHEN r.velocity > 0 THEN MAX(p.stock, 0) / r.velocity ELSE 1e9 END AS urgency
+        FROM products p LEFT JOIN reorder_stats r ON r.product_id = p.id
+        """,
+    ]),
+    (11, "Closed accounting periods cover invoice lines", [
+        _closed_period_guard('trg_closed_period_item_insert', 'INSERT ON invoice_items', ['NEW'], "1",
+                             INVOICE_LINE_DATE),
+        _closed_period_guard('trg_closed_period_item_delete', 'DELETE ON invoice_items', ['OLD'], "1",
+                             INVOICE_LINE_DATE),
+        _closed_period_guard('trg_closed_period_item_update', 'UPDATE ON invoice_items', ['OLD', 'NEW'],
+                             "1", INVOICE_LINE_DATE),
+    ]),
+]
+
+# Rows fetched per page and the most rows a paged table keeps in its Treeview
+PAGE_SIZE = 200
+PAGE_MAX_ROWS = 1000
+
+# Hot-path statements. They are defined once here and used by the screens,
+# bench.py and tests/test_query_plans.py, which checks each one against its
+# index through hot_queries().
+INVOICE_PAGE = {'columns': "invoice_no, customer_name, date, total, status", 'table': 'invoices',
+                'keys': ('date', 'id'), 'descending': True}
+INVOICE_RANGE = "date BETWEEN ? AND ?"
+PRODUCT_PAGE = {'columns': "name, hsn_code, price, gst_rate, stock, min_stock", 'table': 'products',
+                'keys': ('name', 'id'), 'descending': False}
+EXPENSE_PAGE = {'columns': "date, category, amount, description, created_by", 'table': 'expenses',
+                'keys': ('date', 'id'), 'descending': True}
+# Dashboard figures; the ones with a parameter take today's date
+DASHBOARD_SQL = {
+    'today_sales': "SELECT COALESCE(SUM(total), 0) FROM daily_sales WHERE day = ?",
+    'total_invoices': "SELECT COALESCE(SUM(invoice_count), 0) FROM daily_sales",
+    'low_stock': "SELECT COUNT(*) FROM stock_reorder WHERE stock <= reorder_point",
+    'today_expenses': "SELECT COALESCE(SUM(amount), 0) FROM daily_expenses WHERE day = ?",
+}
+RECENT_INVOICES_SQL = """
+    SELECT invoice_no, customer_name, date, total, status
+    FROM invoices ORDER BY created_at DESC LIMIT 10
+"""
+INVOICE_EDIT_LINES_SQL = """
+    SELECT product_id, product_name, quantity, price, gst_rate, COALESCE(hsn_code, '')
+    FROM invoice_items WHERE invoice_id=? ORDER BY id
+"""
+# Nets out everything an invoice has moved so far: (user, invoice_id)
+STOCK_REVERSAL_SQL = """
+    INSERT INTO stock_movements (product_id, qty_delta, reason, invoice_id, created_by)
+    SELECT product_id, -SUM(qty_delta), 'sale_reversal', invoice_id, ?
+    FROM stock_movements WHERE invoice_id = ?
+    GROUP BY product_id HAVING SUM(qty_delta) != 0
+"""
+SALES_REPORT_SQL = """
+    SELECT day as date, invoice_count as invoices, total
+    FROM daily_sales WHERE invoice_count > 0
+    ORDER BY day DESC
+"""
+GST_SUMMARY_SQL = """
+    SELECT place_of_supply, hsn_code, rate, SUM(quantity) AS quantity,
+           SUM(taxable_value) AS taxable_value
+    FROM daily_gst
+    WHERE day BETWEEN ? AND ? AND line_count != 0
+    GROUP BY place_of_supply, hsn_code, rate
+"""
+
+# Screen queries run on this many worker threads (at most the reader pool
+# size is useful) and the Tk thread checks for finished ones this often
+QUERY_WORKERS = int(os.environ.get('SEIZE_QUERY_WORKERS', 2))
+QUERY_POLL_MS = 25
+
+# With SEIZE_UI_TIMING=1 the app prints when the login screen is first drawn
+# and how long each sidebar click took to build or show its screen, up to the
+# point Tk has laid it out (data loads after)
+UI_TIMING = os.environ.get('SEIZE_UI_TIMING') == '1'
+
+# Report exports read this many rows per fetch; Excel sheets hold at most
+# EXCEL_MAX_ROWS rows including the header, so longer exports roll over
+EXPORT_BATCH = 5000
+EXCEL_MAX_ROWS = 1048576
+
+# Printed invoices are written here as <invoice_no>.pdf
+PDF_DIR = os.environ.get('SEIZE_PDF_DIR', 'invoices')
+
+# Batch PDF runs hand invoices to worker processes this many at a time
+PDF_BATCH_CHUNK = 50
+
+# Product imports are read, validated and written this many rows at a time,
+# one transaction per chunk. Header spellings seen in supplier sheets map
+# onto products columns.
+IMPORT_CHUNK = 20000
+PRODUCT_IMPORT_COLUMNS = {
+    'name': 'name', 'product': 'name', 'product name': 'name', 'item': 'name', 'description': 'name',
+    'hsn_code': 'hsn_code', 'hsn': 'hsn_code', 'hsn code': 'hsn_code', 'hsn/sac': 'hsn_code',
+    'price': 'price', 'rate': 'price', 'mrp': 'price', 'selling price': 'price',
+    'gst_rate': 'gst_rate', 'gst': 'gst_rate', 'gst %': 'gst_rate', 'gst rate': 'gst_rate', 'tax %': 'gst_rate',
+    'stock': 'stock', 'qty': 'stock', 'quantity': 'stock', 'opening stock': 'stock',
+    'min_stock': 'min_stock', 'min stock': 'min_stock', 'reorder level': 'min_stock',
+}
+
+# Legacy invoice imports read this many rows per batch transaction, and
+# flag totals that differ from the recomputed ones by more than this
+LEGACY_CHUNK = 50000
+LEGACY_TOLERANCE = 0.01
+LEGACY_HEADER_COLUMNS = ('invoice_no', 'date', 'customer_name', 'customer_phone', 'customer_gstin',
+                         'status', 'subtotal', 'gst_amount', 'total')
+LEGACY_LINE_COLUMNS = ('invoice_no', 'product_name', 'quantity', 'price', 'gst_rate', 'total')
+
+# Reorder suggestions. Velocity (units/day) blends the sales of the last
+# 7, 28 and 90 days with these weights; the reorder point covers demand over
+# the supplier lead time plus safety stock for REORDER_SERVICE_Z standard
+# deviations of daily demand, and an order tops stock up to a further
+# REORDER_COVER_DAYS of sales.
+REORDER_WINDOWS = {7: 0.5, 28: 0.3, 90: 0.2}
+REORDER_LEAD_DAYS = float(os.environ.get('SEIZE_REORDER_LEAD_DAYS', 7))
+REORDER_COVER_DAYS = float(os.environ.get('SEIZE_REORDER_COVER_DAYS', 30))
+REORDER_SERVICE_Z = float(os.environ.get('SEIZE_REORDER_SERVICE_Z', 1.65))
+
+# JSON API responses at least this large are gzipped for clients that accept it
+API_GZIP_MIN_BYTES = 1024
+
+# TrueType fonts tried in order for invoice PDFs as (regular, bold). The
+# first one found is used; without one that has the rupee sign, amounts are
+# printed with "Rs." in Helvetica.
+PDF_FONTS = [
+    (os.environ.get('SEIZE_PDF_FONT'), os.environ.get('SEIZE_PDF_FONT_BOLD')),
+    ('/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf', '/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf'),
+    ('/usr/share/fonts/TTF/DejaVuSans.ttf', '/usr/share/fonts/TTF/DejaVuSans-Bold.ttf'),
+    ('C:/Windows/Fonts/arial.ttf', 'C:/Windows/Fonts/arialbd.ttf'),
+    ('C:/Windows/Fonts/Nirmala.ttf', 'C:/Windows/Fonts/NirmalaB.ttf'),
+    ('/System/Library/Fonts/Supplemental/Arial Unicode.ttf', None),
+    ('/Library/Fonts/Arial Unicode.ttf', None),
+]
+
+
+def financial_year(day):
+    day = date.fromisoformat(str(day)) if day else date.today()
+    start = day.year if day.month >= 4 else day.year - 1
+    return f"{start % 100:02d}{(start + 1) % 100:02d}"
+
+
+def pnl_period(kind, day=None):
+    # (label, first day, last day) of the month, quarter or financial year
+    # (April to March) that `day` falls in
+    day = date.fromisoformat(str(day)) if day else date.today()
+    fy_start = day.year if day.month >= 4 else day.year - 1
+    fy = f"FY {fy_start}-{(fy_start + 1) % 100:02d}"
+    if kind == 'month':
+        start, months, label = day.replace(day=1), 1, day.strftime('%b %Y')
+    elif kind == 'quarter':
+        start, months = day.replace(month=(day.month - 1) // 3 * 3 + 1, day=1), 3
+        label = f"Q{(start.month - 4) % 12 // 3 + 1} {fy}"
+    elif kind == 'year':
+        start, months, label = date(fy_start, 4, 1), 12, fy
+    else:
+        raise ValueError(f"Unknown period '{kind}'")
+    following = start.month - 1 + months
+    end = date(start.year + following // 12, following % 12 + 1, 1) - timedelta(days=1)
+    return label, start, end
+
+
+def period_months(start, end):
+    # 'YYYY-MM' for every month from start to end
+    months = []
+    year, month = start.year, start.month
+    while (year, month) <= (end.year, end.month):
+        months.append(f"{year}-{month:02d}")
+        year, month = (year + 1, 1) if month == 12 else (year, month + 1)
+    return months
+
+
+def to_paise(value):
+    # Rupees (float, str or Decimal) to whole paise, halves rounded up
+    return int((Decimal(str(value)) * 100).to_integral_value(ROUND_HALF_UP))
+
+
+def line_amounts(quantity, price, gst_rate):
+    # (amount, gst) of an invoice line in paise. GST is worked out per line
+    # on the rounded amount, so invoice totals are exact sums of their lines.
+    price = to_paise(price)
+    if isinstance(quantity, int):
+        amount = quantity * price
+    else:
+        amount = int((Decimal(str(quantity)) * price).to_integral_value(ROUND_HALF_UP))
+    return amount, (amount * to_paise(gst_rate) + 5000) // 10000
+
+
+class InvoiceLine:
+    # One line of an invoice being edited; price and amounts in paise
+    __slots__ = ('product_id', 'name', 'hsn_code', 'quantity', 'price', 'gst_rate', 'amount', 'gst')
+
+    def __init__(self, product_id, name, quantity, price, gst_rate, hsn_code=''):
+        self.product_id = product_id
+        self.name = name
+        self.hsn_code = hsn_code or ''
+        self.price = to_paise(price)
+        self.gst_rate = gst_rate
+        self.set_quantity(quantity)
+
+    def set_quantity(self, quantity):
+        self.quantity = quantity
+        self.amount, self.gst = line_amounts(quantity, self.price / 100, self.gst_rate)
+
+    @property
+    def total(self):
+        return self.amount + self.gst
+
+    def values(self):
+        # Treeview row: Item, HSN, Qty, Rate, GST%, Amount
+        return (self.name, self.hsn_code, self.quantity, f"{self.price / 100:.2f}",
+                self.gst_rate, f"{self.total / 100:,.2f}")
+
+    def item(self):
+        # (product_id, name, quantity, price, gst_rate, total) for Database.save_invoice
+        return (self.product_id, self.name, self.quantity, self.price / 100, self.gst_rate,
+                self.total / 100)
+
+
+class InvoiceDraft:
+    # The lines of an invoice being edited, keyed by the caller's ids (the
+    # invoice screen uses Treeview item ids), with running totals in paise.
+    # Adding, removing or changing a line only adjusts the totals by that
+    # line, whatever the invoice size.
+    __slots__ = ('lines', 'subtotal', 'gst_amount')
+
+    def __init__(self):
+        self.lines = {}
+        self.subtotal = 0
+        self.gst_amount = 0
+
+    def __len__(self):
+        return len(self.lines)
+
+    @property
+    def total(self):
+        return self.subtotal + self.gst_amount
+
+    def add(self, key, line):
+        self.lines[key] = line
+        self.subtotal += line.amount
+        self.gst_amount += line.gst
+        return line
+
+    def remove(self, key):
+        line = self.lines.pop(key)
+        self.subtotal -= line.amount
+        self.gst_amount -= line.gst
+        return line
+
+    def set_quantity(self, key, quantity):
+        line = self.lines[key]
+        self.subtotal -= line.amount
+        self.gst_amount -= line.gst
+        line.set_quantity(quantity)
+        self.subtotal += line.amount
+        self.gst_amount += line.gst
+        return line
+
+    def find(self, product_id):
+        # Key of the first line for product_id, or None
+        for key, line in self.lines.items():
+            if line.product_id == product_id:
+                return key
+        return None
+
+    def items(self):
+        return [line.item() for line in self.lines.values()]
+
+    def totals(self):
+        # In rupees, as stored on the invoice
+        return {'subtotal': self.subtotal / 100, 'gst_amount': self.gst_amount / 100,
+                'total': self.total / 100}
+
+
+class InvoiceNumbers:
+    # Invoice numbers come from the invoice_sequences row for their series and
+    # are allocated inside the save transaction, so two tills can never get
+    # the same number. With block > 1 a terminal leases `block` numbers at a
+    # time and works through its own range without touching the shared row.
+    def __init__(self, db, prefix=None, fy_reset=None, block=None, terminal=None):
+        self.db = db
+        self.prefix = INVOICE_PREFIX if prefix is None else prefix
+        self.fy_reset = INVOICE_FY_RESET if fy_reset is None else fy_reset
+        self.block = block or INVOICE_BLOCK
+        self.terminal = terminal or TERMINAL_ID
+
+    def series(self, day=None):
+        if self.fy_reset:
+            return f"{self.prefix}{financial_year(day)}-"
+        return self.prefix
+
+    def format(self, series, number):
+        return f"{series}{number:04d}"
+
+    def _first(self, conn, series):
+        # First number of a new series: carry on from numbers already issued
+        return conn.execute("""
+            SELECT COALESCE(MAX(CAST(SUBSTR(invoice_no, ?) AS INTEGER)), 0) + 1
+            FROM invoices WHERE SUBSTR(invoice_no, 1, ?) = ?
+        """, (len(series) + 1, len(series), series)).fetchone()[0]
+
+    def _next(self, conn, series):
+        row = conn.execute("SELECT next_no FROM invoice_sequences WHERE series=?",
+                           (series,)).fetchone()
+        if row is None:
+            row = (self._first(conn, series),)
+            conn.execute("INSERT INTO invoice_sequences (series, next_no) VALUES (?, ?)",
+                         (series, row[0]))
+        return row[0]
+
+    def _lease(self, conn, series):
+        return conn.execute("""
+            SELECT next_no, end_no FROM invoice_number_leases
+            WHERE terminal=? AND series=? AND next_no < end_no
+        """, (self.terminal, series)).fetchone()
+
+    def allocate(self, conn, day=None):
+        # conn must be the connection of an open Database.transaction()
+        series = self.series(day)
+        if self.block > 1:
+            lease = self._lease(conn, series)
+            if lease is None:
+                start = self._next(conn, series)
+                conn.execute("UPDATE invoice_sequences SET next_no = ? WHERE series=?",
+                             (start + self.block, series))
+                lease = (start, start + self.block)
+            conn.execute("""
+                INSERT OR REPLACE INTO invoice_number_leases (terminal, series, next_no, end_no)
+                VALUES (?, ?, ?, ?)
+            """, (self.terminal, series, lease[0] + 1, lease[1]))
+            return self.format(series, lease[0])
+
+        number = self._next(conn, series)
+        conn.execute("UPDATE invoice_sequences SET next_no = next_no + 1 WHERE series=?",
+                     (series,))
+        return self.format(series, number)
+
+    def skip_issued(self, conn, numbers):
+        # Moves each series (and any terminal leases in it) past numbers that
+        # were stored without allocate(), e.g. by an import, so they are not
+        # handed out again. conn must be in an open transaction.
+        highest = {}
+        for number in numbers:
+            match = re.fullmatch(r"(.*?)(\d+)", number)
+            if match:
+                series, value = match.group(1), int(match.group(2))
+                highest[series] = max(highest.get(series, 0), value)
+        for series, value in highest.items():
+            self._next(conn, series)
+            conn.execute("UPDATE invoice_sequences SET next_no = MAX(next_no, ?) WHERE series=?",
+                         (value + 1, series))
+            conn.execute("""
+                UPDATE invoice_number_leases SET next_no = ?
+                WHERE series=? AND next_no <= ?
+            """, (value + 1, series, value))
+
+    def peek(self, day=None):
+        # Number the next invoice will most likely get; only allocate() is
+        # binding. Read-only, as it runs on the Tk thread.
+        series = self.series(day)
+        with self.db.reader() as conn:
+            lease = self._lease(conn, series) if self.block > 1 else None
+            if lease:
+                return self.format(series, lease[0])
+            row = conn.execute("SELECT next_no FROM invoice_sequences WHERE series=?",
+                               (series,)).fetchone()
+            return self.format(series, row[0] if row else self._first(conn, series))
+
+
+class QueryCache:
+    # Results keyed by name and the write versions of the tables they read.
+    # Any write to one of those tables through Database makes the entry stale;
+    # the TTL covers writes made by other processes.
+    def __init__(self, db, ttl=CACHE_TTL):
+        self.db = db
+        self.ttl = ttl
+        self.entries = {}
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key, tables, loader, ttl=None):
+        # Versions are read before loading so a write during the load is not masked
+        versions = self.db.table_versions(tables)
+        now = time.monotonic()
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry and entry[1] == versions and now - entry[2] < (ttl or self.ttl):
+                self.hits += 1
+                return entry[3]
+            self.misses += 1
+
+        value = loader()
+        with self.lock:
+            self.entries[key] = (tuple(tables), versions, now, value)
+        return value
+
+    def invalidate(self, table=None):
+        with self.lock:
+            if table is None:
+                self.entries.clear()
+            else:
+                self.entries = {key: entry for key, entry in self.entries.items()
+                                if table not in entry[0]}
+
+    def stats(self):
+        with self.lock:
+            lookups = self.hits + self.misses
+            return {
+                'entries': len(self.entries),
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / lookups if lookups else 0.0,
+                'data_version': self.db.data_version,
+            }
+
+
+class ProductCatalog:
+    # Every product in memory for item entry: a sorted name list for prefix
+    # lookups and a trigram index over name and HSN for matches inside words.
+    # Loaded on first use and reloaded once the products table has changed.
+    def __init__(self, db, ttl=CACHE_TTL):
+        self.db = db
+        self.ttl = ttl
+        self.lock = threading.Lock()
+        self.version = None
+        self.loaded_at = 0.0
+        self.products = {}
+        self.names = []
+        self.name_ids = []
+        self.trigrams = {}
+
+    def refresh(self, force=False):
+        version = self.db.table_versions(('products',))
+        if not force and version == self.version and time.monotonic() - self.loaded_at < self.ttl:
+            return
+        rows = self.db.fetchall("SELECT id, name, hsn_code, price, gst_rate, stock FROM products")
+
+        by_name = sorted(((row[1] or '').lower(), row[0]) for row in rows)
+        products = {row[0]: row for row in rows}
+        # Posting lists are in name order, so a search can stop at `limit` hits
+        trigrams = defaultdict(list)
+        for _, product_id in by_name:
+            row = products[product_id]
+            text = f"{row[1] or ''} {row[2] or ''}".lower()
+            for gram in {text[i:i + 3] for i in range(len(text) - 2)}:
+                trigrams[gram].append(product_id)
+
+        with self.lock:
+            self.products = products
+            self.names = [name for name, _ in by_name]
+            self.name_ids = [product_id for _, product_id in by_name]
+            self.trigrams = dict(trigrams)
+            self.version = version
+            self.loaded_at = time.monotonic()
+
+    def get(self, product_id):
+        self.refresh()
+        return self.products.get(product_id)
+
+    def search(self, text, limit=20):
+        # (id, name, hsn_code, price, gst_rate, stock) rows: name prefix
+        # matches first, then names/HSN codes containing the text
+        self.refresh()
+        query = text.strip().lower()
+        with self.lock:
+            start = bisect.bisect_left(self.names, query)
+            found = []
+            for i in range(start, len(self.names)):
+                if len(found) == limit or not self.names[i].startswith(query):
+                    break
+                found.append(self.name_ids[i])
+            if len(found) == limit or len(query) < 3:
+                return [self.products[product_id] for product_id in found]
+
+            # The rarest trigram gives the smallest candidate list to check
+            grams = [query[i:i + 3] for i in range(len(query) - 2)]
+            candidates = min((self.trigrams.get(gram, ()) for gram in grams), key=len)
+            seen = set(found)
+            for product_id in candidates:
+                if len(found) == limit:
+                    break
+                row = self.products[product_id]
+                if product_id not in seen and query in f"{row[1] or ''} {row[2] or ''}".lower():
+                    found.append(product_id)
+            return [self.products[product_id] for product_id in found]
+
+
+class ConnectionPool:
+    # Bounded set of connections handed out with checkout/checkin. Connections
+    # are opened lazily up to `size`; after that callers wait for a return.
+    def __init__(self, factory, size, timeout=DB_POOL_TIMEOUT):
+        self.factory = factory
+        self.size = size
+        self.timeout = timeout
+        self.idle = queue.LifoQueue()
+        self.all = []
+        self.lock = threading.Lock()
+        self.checkouts = 0
+        self.waits = 0
+        self.wait_time = 0.0
+        self.max_wait = 0.0
+
+    def checkout(self):
+        start = time.perf_counter()
+        try:
+            conn = self.idle.get_nowait()
+        except queue.Empty:
+            conn = None
+            with self.lock:
+                if len(self.all) < self.size:
+                    conn = self.factory()
+                    self.all.append(conn)
+            if conn is None:
+                try:
+                    conn = self.idle.get(timeout=self.timeout)
+                except queue.Empty:
+                    raise sqlite3.OperationalError(
+                        f"Timed out after {self.timeout}s waiting for a database connection")
+
+        waited = time.perf_counter() - start
+        with self.lock:
+            self.checkouts += 1
+            self.wait_time += waited
+            self.max_wait = max(self.max_wait, waited)
+            if waited > 0.001:
+                self.waits += 1
+        return conn
+
+    def checkin(self, conn):
+        self.idle.put(conn)
+
+    @contextmanager
+    def connection(self):
+        conn = self.checkout()
+        try:
+            yield conn
+        finally:
+            self.checkin(conn)
+
+    def stats(self):
+        with self.lock:
+            return {
+                'size': self.size,
+                'open': len(self.all),
+                'idle': self.idle.qsize(),
+                'checkouts': self.checkouts,
+                'waits': self.waits,
+                'wait_time_ms': self.wait_time * 1000,
+                'avg_wait_ms': self.wait_time * 1000 / self.checkouts if self.checkouts else 0.0,
+                'max_wait_ms': self.max_wait * 1000,
+            }
+
+    def close(self):
+        with self.lock:
+            for conn in self.all:
+                conn.close()
+            self.all = []
+            self.idle = queue.LifoQueue()
+
+
+# Database Setup
+class Database:
+    # One writer connection and a pool of read-only connections. A thread keeps
+    # the connection it checked out for nested calls, so reads made while it
+    # holds the writer see its own uncommitted changes.
+    def __init__(self, path=None, profile=None, pool_size=None, readonly=False):
+        # readonly: every connection is opened mode=ro and the schema is left
+        # to the app, for processes that only read (batch PDF workers)
+        self.path = path or DB_PATH
+        self.settings = db_settings(profile)
+        self.local = threading.local()
+        # Bumped after each commit that wrote to a table, see QueryCache
+        self.data_version = 0
+        self.table_version = {}
+        self.version_lock = threading.Lock()
+        self.writer = ConnectionPool(lambda: self.connect(readonly=readonly), 1)
+        if self.path == ':memory:':
+            self.readers = self.writer
+        else:
+            self.readers = ConnectionPool(lambda: self.connect(readonly=True),
+                                          pool_size or DB_POOL_SIZE)
+        if not readonly and not self.schema_current():
+            self.create_tables()
+            self.migrate()
+        self.numbers = InvoiceNumbers(self)
+        self.cache = QueryCache(self)
+        self.catalog = ProductCatalog(self)
+
+    def connect(self, readonly=False):
+        if readonly:
+            conn = sqlite3.connect(f"file:{self.path}?mode=ro", uri=True,
+                                   check_same_thread=False)
+        else:
+            conn = sqlite3.connect(self.path, check_same_thread=False)
+        for pragma, value in self.settings.items():
+            # Journal mode is persistent and set by the writer
+            if readonly and pragma == 'journal_mode':
+                continue
+            conn.execute(f"PRAGMA {pragma}={value}")
+        return conn
+
+    @contextmanager
+    def _use(self, pool):
+        held = getattr(self.local, 'held', None)
+        if held is not None and held[0] in (pool, self.writer):
+            yield held[1]
+            return
+        with pool.connection() as conn:
+            self.local.held = (pool, conn)
+            try:
+                yield conn
+            finally:
+                self.local.held = held
+
+    def reader(self):
+        return self._use(self.readers)
+
+    def writer_connection(self):
+        return self._use(self.writer)
+
+    def pool_stats(self):
+        return {'writer': self.writer.stats(), 'readers': self.readers.stats()}
+
+    def close(self):
+        self.writer.close()
+        if self.readers is not self.writer:
+            self.readers.close()
+
+    def schema_current(self):
+        # True when every migration has been applied, in which case opening
+        # the database skips the CREATE IF NOT EXISTS and migration checks
+        with self.writer_connection() as conn:
+            try:
+                version = conn.execute("SELECT MAX(version) FROM schema_version").fetchone()[0]
+            except sqlite3.OperationalError:
+                return False
+        return (version or 0) >= MIGRATIONS[-1][0]
+
+    def create_tables(self):
+        with self.writer_connection() as conn:
+            self._create_tables(conn.cursor())
+            conn.commit()
+
+    def _create_tables(self, cursor):
+        # Users table
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS users (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                username TEXT UNIQUE NOT NULL,
+                password TEXT NOT NULL,
+                role TEXT DEFAULT 'user',
+                email TEXT,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        ''')
+
+        # Company settings
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS company (
+                id INTEGER PRIMARY KEY,
+                name TEXT DEFAULT 'SEIZE',
+                address TEXT,
+                phone TEXT,
+                email TEXT,
+                gstin TEXT,
+                logo_path TEXT
+            )
+        ''')
+
+        # Products
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS products (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                name TEXT NOT NULL,
+                hsn_code TEXT,
+                price REAL DEFAULT 0,
+                gst_rate REAL DEFAULT 18,
+                stock INTEGER DEFAULT 0,
+                min_stock INTEGER DEFAULT 10,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        ''')
+
+        # Invoices
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS invoices (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                invoice_no TEXT UNIQUE NOT NULL,
+                customer_name TEXT,
+                customer_phone TEXT,
+                customer_gstin TEXT,
+                date DATE DEFAULT CURRENT_DATE,
+                subtotal REAL DEFAULT 0,
+                gst_amount REAL DEFAULT 0,
+                total REAL DEFAULT 0,
+                status TEXT DEFAULT 'pending',
+                created_by TEXT,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        ''')
+
+        # Invoice Items
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS invoice_items (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                invoice_id INTEGER,
+                product_id INTEGER,
+                product_name TEXT,
+                quantity INTEGER DEFAULT 1,
+                price REAL,
+                gst_rate REAL,
+                total REAL,
+                FOREIGN KEY (invoice_id) REFERENCES invoices (id)
+            )
+        ''')
+
+        # Expenses
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS expenses (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                category TEXT,
+                amount REAL,
+                description TEXT,
+                date DATE DEFAULT CURRENT_DATE,
+                created_by TEXT,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        ''')
+
+        # Applied migrations
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS schema_version (
+                version INTEGER PRIMARY KEY,
+                description TEXT,
+                applied_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        ''')
+
+        # Insert default admin user
+        cursor.execute('''
+            INSERT OR IGNORE INTO users (id, username, password, role, email)
+            VALUES (1, 'admin', 'admin123', 'admin', 'admin@seize.com')
+        ''')
+
+        # Insert default company
+        cursor.execute('''
+            INSERT OR IGNORE INTO company (id, name, address, phone, email)
+            VALUES (1, 'SEIZE', 'Your Business Address', 'Phone Number', 'email@seize.com')
+        ''')
+
+    def schema_version(self):
+        return self.fetchone("SELECT COALESCE(MAX(version), 0) FROM schema_version")[0]
+
+    def migrate(self):
+        applied = []
+        for version, description, steps in MIGRATIONS:
+            with self.transaction() as conn:
+                # Re-checked under the write lock in case another process got here first
+                current = conn.execute("SELECT COALESCE(MAX(version), 0) FROM schema_version").fetchone()[0]
+                if version <= current:
+                    continue
+                for step in steps:
+                    if callable(step):
+                        step(conn)
+                    else:
+                        conn.execute(step)
+                conn.execute("INSERT INTO schema_version (version, description) VALUES (?, ?)",
+                             (version, description))
+                applied.append(version)
+
+        if applied:
+            self.execute("ANALYZE")
+        return applied
+
+    @contextmanager
+    def transaction(self):
+        # Unit of work: statements run through the yielded connection (or
+        # execute/executemany on this thread) commit together or not at all.
+        # Nested transactions join the outer one.
+        if getattr(self.local, 'in_transaction', False):
+            yield self.local.held[1]
+            return
+        with self.writer_connection() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            self.local.in_transaction = True
+            self.local.written = set()
+            try:
+                yield conn
+                conn.commit()
+            except BaseException:
+                conn.rollback()
+                raise
+            finally:
+                self.local.in_transaction = False
+                self.touch(*self.local.written)
+
+    def touch(self, *tables):
+        # Record a committed write; callers writing through a raw transaction
+        # connection instead of execute() must call this for cached reads
+        if getattr(self.local, 'in_transaction', False):
+            self.local.written.update(tables)
+            return
+        if tables:
+            with self.version_lock:
+                self.data_version += 1
+                for table in tables:
+                    self.table_version[table] = self.data_version
+
+    def table_versions(self, tables):
+        with self.version_lock:
+            return tuple(self.table_version.get(table, 0) for table in tables)
+
+    def execute(self, query, params=()):
+        with self.transaction() as conn:
+            cursor = conn.execute(query, params)
+            written = WRITE_TABLE.match(query)
+            if written:
+                self.touch(written.group(1).lower())
+            return cursor
+
+    def executemany(self, query, seq_of_params):
+        with self.transaction() as conn:
+            cursor = conn.executemany(query, seq_of_params)
+            written = WRITE_TABLE.match(query)
+            if written:
+                self.touch(written.group(1).lower())
+            return cursor
+
+    def fetchall(self, query, params=()):
+        with self.reader() as conn:
+            return conn.execute(query, params).fetchall()
+
+    def fetchone(self, query, params=()):
+        with self.reader() as conn:
+            return conn.execute(query, params).fetchone()
+
+    def fetch_table(self, query, params=()):
+        with self.reader() as conn:
+            cursor = conn.execute(query, params)
+            return [d[0] for d in cursor.description], cursor.fetchall()
+
+    def iter_table(self, query, params=(), size=EXPORT_BATCH):
+        # Yields the column names, then the rows in batches of `size`. The
+        # reader connection is held until the generator finishes or is closed.
+        with self.reader() as conn:
+            cursor = conn.execute(query, params)
+            yield [d[0] for d in cursor.description]
+            while True:
+                rows = cursor.fetchmany(size)
+                if not rows:
+                    return
+                yield rows
+
+    def rebuild_rollups(self):
+        with self.transaction():
+            for statement in ROLLUP_REBUILD + GST_ROLLUP_REBUILD:
+                self.execute(statement)
+
+    def dashboard_stats(self):
+        # Served from the cache until invoices, products, expenses or the
+        # reorder points change
+        today = date.today()
+        return self.cache.get(('dashboard', today),
+                              ('invoices', 'products', 'expenses', 'reorder_stats'),
+                              lambda: self._dashboard_stats(today))
+
+    def _dashboard_stats(self, today):
+        with self.reader() as conn:
+            stats = {name: conn.execute(sql, (today,) if '?' in sql else ()).fetchone()[0]
+                     for name, sql in DASHBOARD_SQL.items()}
+            stats['recent_invoices'] = conn.execute(RECENT_INVOICES_SQL).fetchall()
+        return stats
+
+    def profit_loss(self, start, end):
+        # Sales and expenses for the whole months start..end. Closed months
+        # are read as stored; only open ones are summed from the daily
+        # rollups, so the cost doesn't grow with history.
+        return self.cache.get(('profit_loss', str(start), str(end)),
+                              ('invoices', 'expenses', 'closed_periods'),
+                              lambda: self._profit_loss(start, end))
+
+    def _profit_loss(self, start, end):
+        months = period_months(start, end)
+        totals = [0, 0.0, 0.0, 0.0, 0.0]
+        with self.reader() as conn:
+            closed = conn.execute("""
+                SELECT month, invoice_count, subtotal, gst_amount, sales, expenses
+                FROM closed_periods WHERE month BETWEEN ? AND ?
+            """, (months[0], months[-1])).fetchall()
+            for month, *values in closed:
+                totals = [total + value for total, value in zip(totals, values)]
+
+            closed_months = {row[0] for row in closed}
+            for month in months:
+                if month in closed_months:
+                    continue
+                label, first, last = pnl_period('month', f"{month}-01")
+                sales = conn.execute("""
+                    SELECT COALESCE(SUM(invoice_count), 0), COALESCE(SUM(subtotal), 0),
+                           COALESCE(SUM(gst_amount), 0), COALESCE(SUM(total), 0)
+                    FROM daily_sales WHERE day BETWEEN ? AND ?
+                """, (first, last)).fetchone()
+                expenses = conn.execute("""
+                    SELECT COALESCE(SUM(amount), 0) FROM daily_expenses WHERE day BETWEEN ? AND ?
+                """, (first, last)).fetchone()
+                totals = [total + value for total, value in zip(totals, sales + expenses)]
+
+        invoices, subtotal, gst_amount, sales, expenses = totals
+        return {
+            'invoices': invoices,
+            'subtotal': subtotal,
+            'gst_amount': gst_amount,
+            'sales': sales,
+            'expenses': expenses,
+            'profit': sales - expenses,
+            'months': len(months),
+            'closed': len(closed),
+        }
+
+    def close_period(self, month, user=None):
+        # month is 'YYYY-MM'. Its result is taken from the raw tables and
+        # stored; the guard triggers then refuse changes to its invoices,
+        # their lines and its expenses until it is reopened.
+        label, start, end = pnl_period('month', f"{month}-01")
+        if end >= date.today():
+            raise ValueError(f"{label} has not ended yet")
+        with self.transaction():
+            if self.fetchone("SELECT 1 FROM closed_periods WHERE month=?", (month,)):
+                raise ValueError(f"{label} is already closed")
+            self.execute("""
+                INSERT INTO closed_periods (month, invoice_count, subtotal, gst_amount, sales,
+                                            expense_count, expenses, closed_by)
+                SELECT ?, s.invoice_count, s.subtotal, s.gst_amount, s.total,
+                       e.expense_count, e.amount, ?
+                FROM (SELECT COUNT(*) AS invoice_count, COALESCE(SUM(subtotal), 0) AS subtotal,
+                             COALESCE(SUM(gst_amount), 0) AS gst_amount, COALESCE(SUM(total), 0) AS total
+                      FROM invoices WHERE date BETWEEN ? AND ? AND status != 'cancelled') s,
+                     (SELECT COUNT(*) AS expense_count, COALESCE(SUM(amount), 0) AS amount
+                      FROM expenses WHERE date BETWEEN ? AND ?) e
+            """, (month, user, start, end, start, end))
+        return label
+
+    def reopen_period(self, month):
+        return self.execute("DELETE FROM closed_periods WHERE month=?", (month,)).rowcount > 0
+
+    def check_rollups(self, tolerance=0.005):
+        # (table, key, column, rollup value, raw value) for every difference
+        checks = [
+            ('daily_sales', """
+                SELECT day, invoice_count, subtotal, gst_amount, total
+                FROM daily_sales WHERE invoice_count != 0
+            """, """
+                SELECT date, COUNT(*), COALESCE(SUM(subtotal), 0),
+                       COALESCE(SUM(gst_amount), 0), COALESCE(SUM(total), 0)
+                FROM invoices WHERE status != 'cancelled' GROUP BY date
+            """, ('invoice_count', 'subtotal', 'gst_amount', 'total')),
+            ('daily_expenses', """
+                SELECT day || ' ' || category, expense_count, amount
+                FROM daily_expenses WHERE expense_count != 0
+            """, """
+                SELECT date || ' ' || COALESCE(category, ''), COUNT(*), COALESCE(SUM(amount), 0)
+                FROM expenses GROUP BY date, COALESCE(category, '')
+            """, ('expense_count', 'amount')),
+            ('daily_gst', """
+                SELECT day || ' ' || place_of_supply || ' ' || hsn_code || ' ' || rate,
+                       line_count, quantity, taxable_value
+                FROM daily_gst WHERE line_count != 0
+            """, f"""
+                SELECT i.date || ' ' || {_gstin_state_sql('i.customer_gstin')} || ' '
+                       || COALESCE(ii.hsn_code, '') || ' ' || COALESCE(ii.gst_rate, 0),
+                       COUNT(*), COALESCE(SUM(ii.quantity), 0), COALESCE(SUM(ii.quantity * ii.price), 0)
+                FROM invoices i JOIN invoice_items ii ON ii.invoice_id = i.id
+                WHERE i.status != 'cancelled'
+                GROUP BY 1
+            """, ('line_count', 'quantity', 'taxable_value')),
+        ]
+
+        mismatches = []
+        with self.reader() as conn:
+            for table, rollup_query, raw_query, columns in checks:
+                rollup = {row[0]: row[1:] for row in conn.execute(rollup_query)}
+                raw = {row[0]: row[1:] for row in conn.execute(raw_query)}
+                empty = (0,) * len(columns)
+                for key in sorted(rollup.keys() | raw.keys(), key=str):
+                    for column, got, want in zip(columns, rollup.get(key, empty), raw.get(key, empty)):
+                        if abs(got - want) > tolerance:
+                            mismatches.append((table, key, column, got, want))
+        return mismatches
+
+    def has_table(self, name):
+        return self.fetchone("SELECT 1 FROM sqlite_master WHERE name=?", (name,)) is not None
+
+    def search_invoices(self, search, from_date, to_date, limit=500):
+        # Best matches first: invoice number, then customer/phone/GSTIN, then items
+        match = fts_query(search)
+        if not match:
+            return []
+        if self.has_table('invoice_search'):
+            return self.fetchall("""
+                SELECT i.invoice_no, i.customer_name, i.date, i.total, i.status
+                FROM invoice_search s JOIN invoices i ON i.id = s.rowid
+                WHERE invoice_search MATCH ? AND i.date BETWEEN ? AND ?
+                ORDER BY bm25(invoice_search, 10.0, 5.0, 5.0, 5.0, 1.0)
+                LIMIT ?
+            """, (match, from_date, to_date, limit))
+
+        return self.fetchall("""
+            SELECT invoice_no, customer_name, date, total, status
+            FROM invoices
+            WHERE date BETWEEN ? AND ?
+              AND (invoice_no LIKE ? OR customer_name LIKE ? OR customer_phone LIKE ?
+                   OR customer_gstin LIKE ?)
+            ORDER BY date DESC
+            LIMIT ?
+        """, (from_date, to_date, *[f'%{search}%'] * 4, limit))
+
+    def save_invoice(self, invoice, items):
+        # invoice: dict of invoices columns, items: (product_id, product_name,
+        # quantity, price, gst_rate, total) tuples. Header, lines and stock move
+        # together. Without an invoice_no the next number is allocated in the
+        # same commit.
+        with self.transaction() as conn:
+            invoice_no = invoice.get('invoice_no') or self.numbers.allocate(conn, invoice.get('date'))
+            cursor = self.execute("""
+                INSERT INTO invoices (invoice_no, customer_name, customer_phone,
+                                    customer_gstin, date, subtotal, gst_amount, total,
+                                    status, created_by)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """, (
+                invoice_no,
+                invoice['customer_name'],
+                invoice.get('customer_phone', ''),
+                invoice.get('customer_gstin', ''),
+                invoice.get('date') or date.today(),
+                invoice['subtotal'],
+                invoice['gst_amount'],
+                invoice['total'],
+                invoice.get('status', 'pending'),
+                invoice.get('created_by')
+            ))
+            invoice_id = cursor.lastrowid
+            self._write_items(invoice_id, items, invoice.get('created_by'))
+
+        return invoice_id, invoice_no
+
+    def update_invoice(self, invoice_id, invoice, items, user=None):
+        # Replaces the header fields and all lines; stock for the old lines is
+        # returned with reversing movements before the new lines are posted
+        with self.transaction():
+            self.execute("""
+                UPDATE invoices SET customer_name=?, customer_phone=?, customer_gstin=?,
+                                    date=?, subtotal=?, gst_amount=?, total=?
+                WHERE id=?
+            """, (
+                invoice['customer_name'],
+                invoice.get('customer_phone', ''),
+                invoice.get('customer_gstin', ''),
+                invoice.get('date') or date.today(),
+                invoice['subtotal'],
+                invoice['gst_amount'],
+                invoice['total'],
+                invoice_id
+            ))
+            self._reverse_stock(invoice_id, user)
+            self.execute("DELETE FROM invoice_items WHERE invoice_id=?", (invoice_id,))
+            self._write_items(invoice_id, items, user)
+
+    def delete_invoice(self, invoice_id, user=None):
+        with self.transaction():
+            self._reverse_stock(invoice_id, user)
+            self.execute("DELETE FROM invoice_items WHERE invoice_id=?", (invoice_id,))
+            self.execute("DELETE FROM invoices WHERE id=?", (invoice_id,))
+
+    def _write_items(self, invoice_id, items, user):
+        # The line keeps the product's HSN code as billed
+        self.executemany("""
+            INSERT INTO invoice_items (invoice_id, product_id, product_name, quantity,
+                                     price, gst_rate, total, hsn_code)
+            VALUES (?, ?, ?, ?, ?, ?, ?, (SELECT hsn_code FROM products WHERE id = ?))
+        """, [(invoice_id, *item, item[0]) for item in items])
+
+        self.executemany("""
+            INSERT INTO stock_movements (product_id, qty_delta, reason, invoice_id, created_by)
+            VALUES (?, ?, 'sale', ?, ?)
+        """, [(item[0], -item[2], invoice_id, user) for item in items if item[0]])
+        self.touch('products')
+
+    def _reverse_stock(self, invoice_id, user):
+        # Net out everything the invoice has moved so far
+        self.execute(STOCK_REVERSAL_SQL, (user, invoice_id))
+        self.touch('products')
+
+    def add_product(self, name, hsn_code='', price=0, gst_rate=18, stock=0, min_stock=10, user=None):
+        with self.transaction():
+            product_id = self.execute("""
+                INSERT INTO products (name, hsn_code, price, gst_rate, stock, min_stock)
+                VALUES (?, ?, ?, ?, 0, ?)
+            """, (name, hsn_code, price, gst_rate, min_stock)).lastrowid
+            if stock:
+                self.execute("""
+                    INSERT INTO stock_movements (product_id, qty_delta, reason, created_by)
+                    VALUES (?, ?, 'opening', ?)
+                """, (product_id, stock, user))
+        return product_id
+
+    def check_stock(self):
+        # (product_id, name, stock, ledger balance) where the two disagree
+        return self.fetchall("""
+            SELECT p.id, p.name, COALESCE(p.stock, 0), COALESCE(m.balance, 0)
+            FROM products p
+            LEFT JOIN (SELECT product_id, SUM(qty_delta) AS balance
+                       FROM stock_movements GROUP BY product_id) m ON m.product_id = p.id
+            WHERE COALESCE(p.stock, 0) != COALESCE(m.balance, 0)
+        """)
+
+
+def export_table(db, query, path, params=(), progress=None, stop=None):
+    # Streams a query into a .csv or .xlsx file one batch at a time, so memory
+    # use does not grow with the report. progress(rows) is called after each
+    # batch. Setting the `stop` event abandons the export and removes the
+    # partial file. Returns the number of rows written, or None if stopped.
+    batches = db.iter_table(query, params)
+    columns = next(batches)
+    written = 0
+    try:
+        if path.lower().endswith('.csv'):
+            out = open(path, 'w', newline='', encoding='utf-8-sig')
+            writer = csv.writer(out)
+            writer.writerow(columns)
+            write, finish, discard = writer.writerows, out.close, out.close
+        else:
+            # Only exports need openpyxl, so it is not imported at startup
+            from openpyxl import Workbook
+            book = Workbook(write_only=True)
+            sheets = []
+
+            def write(rows):
+                for row in rows:
+                    if not sheets or sheets[-1][1] == EXCEL_MAX_ROWS:
+                        sheet = book.create_sheet(f"Sheet{len(sheets) + 1}")
+                        sheet.append(columns)
+                        sheets.append([sheet, 1])
+                    sheets[-1][0].append(row)
+                    sheets[-1][1] += 1
+
+            def finish():
+                if not sheets:
+                    book.create_sheet("Sheet1").append(columns)
+                book.save(path)
+
+            discard = book.close
+
+        done = False
+        try:
+            for rows in batches:
+                if stop is not None and stop.is_set():
+                    return None
+                write(rows)
+                written += len(rows)
+                if progress:
+                    progress(written)
+            finish()
+            done = True
+            return written
+        finally:
+            if not done:
+                discard()
+                if os.path.exists(path):
+                    os.remove(path)
+    finally:
+        batches.close()
+
+
+def gstin_state(gstin):
+    # The first two digits of a GSTIN are the registrant's state code
+    gstin = (gstin or '').strip()
+    return gstin[:2] if len(gstin) == 15 and gstin[:2].isdigit() else None
+
+
+def gst_return(db, from_date, to_date):
+    # GSTR-1 style tables for the invoices dated from_date..to_date, leaving
+    # out cancelled ones, as {name: (columns, rows)}:
+    #   b2b    per invoice and rate, for customers with a GSTIN
+    #   b2cs   per place of supply and rate, for everyone else
+    #   hsn    per HSN code and rate
+    #   rates  per rate, split into intra- and inter-state supplies
+    # Supplies to a customer registered in another state are inter-state and
+    # carry IGST; the rest are split evenly into CGST and SGST. Customers
+    # without a GSTIN are taken to be in our own state.
+    import pandas as pd
+
+    company = db.fetchone("SELECT gstin FROM company LIMIT 1")
+    home = gstin_state(company[0] if company else None) or ''
+    amounts = ['taxable_value', 'igst', 'cgst', 'sgst']
+    # Every rupee column in the output, rounded to the paisa by rows()
+    money = {*amounts, 'total_value', 'invoice_value'}
+
+    with db.reader() as conn:
+        # The summary tables come from the daily rollup; only B2B needs the lines
+        summary = pd.read_sql_query(GST_SUMMARY_SQL, conn, params=(from_date, to_date))
+        # B2B lines are summed per invoice and rate, and the invoice details
+        # joined on afterwards, which keeps the rows SQLite sorts narrow
+        state = _gstin_state_sql('i.customer_gstin')
+        lines = pd.read_sql_query(f"""
+            SELECT ii.invoice_id, COALESCE(ii.gst_rate, 0) AS rate,
+                   SUM(ii.quantity * ii.price) AS taxable_value
+            FROM invoices i JOIN invoice_items ii ON ii.invoice_id = i.id
+            WHERE i.date BETWEEN ? AND ? AND i.status != 'cancelled' AND {state} != ''
+            GROUP BY ii.invoice_id, COALESCE(ii.gst_rate, 0)
+        """, conn, params=(from_date, to_date))
+        invoices = pd.read_sql_query(f"""
+            SELECT i.id AS invoice_id, i.customer_gstin AS gstin, i.customer_name AS receiver,
+                   i.invoice_no, i.date, i.total AS invoice_value, {state} AS place_of_supply
+            FROM invoices i
+            WHERE i.date BETWEEN ? AND ? AND i.status != 'cancelled' AND {state} != ''
+        """, conn, params=(from_date, to_date))
+
+    b2b = (invoices.merge(lines, on='invoice_id').sort_values(['date', 'invoice_id', 'rate'])
+           .drop(columns='invoice_id'))
+    registered = summary['place_of_supply'].ne('')
+    summary['place_of_supply'] = summary['place_of_supply'].where(registered, home)
+    for table in (summary, b2b):
+        tax = table['taxable_value'] * table['rate'] / 100
+        inter = table['place_of_supply'].ne(home) & bool(home)
+        table['igst'] = tax.where(inter, 0.0)
+        table['cgst'] = table['sgst'] = (tax / 2).where(~inter, 0.0)
+        table['supply'] = inter.map({True: 'inter-state', False: 'intra-state'})
+
+    b2cs = summary[~registered].groupby(['place_of_supply', 'rate'], as_index=False)[amounts].sum()
+    hsn = summary.groupby(['hsn_code', 'rate'], as_index=False)[['quantity', *amounts]].sum()
+    rates = summary.groupby(['rate', 'supply'], as_index=False)[amounts].sum()
+    for table in (hsn, rates):
+        table['total_value'] = table[amounts].sum(axis=1)
+
+    tables = {
+        'b2b': b2b.drop(columns='supply'),
+        'b2cs': b2cs,
+        'hsn': hsn,
+        'rates': rates,
+    }
+
+    def rows(table):
+        # Plain Python values, money rounded to the paisa
+        return list(zip(*((table[column].round(2) if column in money else table[column]).tolist()
+                          for column in table.columns)))
+
+    return {name: (list(table.columns), rows(table)) for name, table in tables.items()}
+
+
+def export_tables(tables, path):
+    # {name: (columns, rows)} into one .xlsx sheet per table, or for a .csv
+    # path one file per table named <path>-<name>.csv
+    stem, ext = os.path.splitext(path)
+    if ext.lower() == '.csv':
+        for name, (columns, rows) in tables.items():
+            with open(f"{stem}-{name}.csv", 'w', newline='', encoding='utf-8-sig') as out:
+                writer = csv.writer(out)
+                writer.writerow(columns)
+                writer.writerows(rows)
+        return
+
+    from openpyxl import Workbook
+    book = Workbook(write_only=True)
+    for name, (columns, rows) in tables.items():
+        sheet = book.create_sheet(name)
+        sheet.append(columns)
+        for row in rows:
+            sheet.append(row)
+    book.save(path)
+
+
+def refresh_reorder(db, full=False):
+    # Brings reorder_stats up to date and returns how many products were
+    # recomputed. Within a day only products with stock movements since the
+    # last run are redone; the first run of a day (or full=True) redoes
+    # everything, as the windows have moved on for every product.
+    import numpy as np
+    import pandas as pd
+
+    today = date.today()
+    longest = max(REORDER_WINDOWS)
+    last_id, computed_on = db.fetchone("SELECT last_movement_id, computed_on FROM reorder_state")
+    high = db.fetchone("SELECT COALESCE(MAX(id), 0) FROM stock_movements")[0]
+    full = full or computed_on != today.isoformat()
+
+    if full:
+        targets, where, params = None, "", ()
+    else:
+        targets = [row[0] for row in db.fetchall(
+            "SELECT DISTINCT product_id FROM stock_movements WHERE id > ?", (last_id,))]
+        if not targets:
+            return 0
+        where = "AND ii.product_id IN (SELECT value FROM json_each(?))"
+        params = (json.dumps(targets),)
+
+    # Units sold per product and day, with the day's age (0 = today)
+    with db.reader() as conn:
+        sales = pd.read_sql_query(f"""
+            SELECT ii.product_id, CAST(julianday(?) - julianday(i.date) AS INTEGER) AS age,
+                   SUM(ii.quantity) AS units
+            FROM invoices i JOIN invoice_items ii ON ii.invoice_id = i.id
+            WHERE i.date > ? AND i.date <= ? AND i.status != 'cancelled'
+              AND ii.product_id IS NOT NULL {where}
+            GROUP BY ii.product_id, i.date
+        """, conn, params=(today.isoformat(), (today - timedelta(days=longest)).isoformat(),
+                           today.isoformat(), *params))
+
+    units = sales['units'].astype(float)
+    windows = pd.DataFrame({'product_id': sales['product_id']})
+    for days in REORDER_WINDOWS:
+        windows[f'units_{days}d'] = units.where(sales['age'] < days, 0.0)
+    windows['squares'] = (units ** 2).where(sales['age'] < 28, 0.0)
+    stats = windows.groupby('product_id').sum()
+
+    stats['velocity'] = sum(weight * stats[f'units_{days}d'] / days
+                            for days, weight in REORDER_WINDOWS.items())
+    # Spread of daily demand over the last 28 days, days without sales included
+    mean = stats['units_28d'] / 28
+    stats['demand_sd'] = np.sqrt((stats['squares'] / 28 - mean ** 2).clip(lower=0))
+    safety = REORDER_SERVICE_Z * stats['demand_sd'] * np.sqrt(REORDER_LEAD_DAYS)
+    stats['reorder_point'] = stats['velocity'] * REORDER_LEAD_DAYS + safety
+    stats['order_up_to'] = stats['velocity'] * (REORDER_LEAD_DAYS + REORDER_COVER_DAYS) + safety
+
+    columns = ['units_7d', 'units_28d', 'units_90d', 'velocity', 'demand_sd', 'reorder_point',
+               'order_up_to']
+    stats = stats[columns].round(4)
+    with db.transaction():
+        # Products without sales in the window get no row, so the view falls
+        # back to min_stock for them, the same on both paths
+        if full:
+            db.execute("DELETE FROM reorder_stats")
+        else:
+            db.execute("DELETE FROM reorder_stats WHERE product_id IN (SELECT value FROM json_each(?))",
+                       params)
+        db.executemany(f"""
+            INSERT INTO reorder_stats (product_id, {', '.join(columns)}, computed_on)
+            VALUES ({', '.join('?' * (len(columns) + 2))})
+        """, [(int(product_id), *values, today)
+              for product_id, *values in stats.itertuples(name=None)])
+        db.execute("UPDATE reorder_state SET last_movement_id = ?, computed_on = ?", (high, today))
+    return len(stats) if full else len(targets)
+
+
+class InvoicePDFRenderer:
+    # Draws invoices straight onto a reportlab canvas. Fonts are registered
+    # once per process and the page template (company header, decoded logo,
+    # column layout) is cached until the company table changes, so each
+    # invoice only pays for drawing its own lines.
+    fonts = None
+
+    PAGE_MARGIN = 40
+    ROW_HEIGHT = 16
+    # title, left edge, width, right aligned
+    COLUMNS = [
+        ('#', 40, 22, False),
+        ('Item', 62, 228, False),
+        ('HSN', 290, 55, False),
+        ('Qty', 345, 40, True),
+        ('Rate', 385, 70, True),
+        ('GST %', 455, 40, True),
+        ('Amount', 495, 60, True),
+    ]
+
+    def __init__(self, db):
+        self.db = db
+
+    @classmethod
+    def load_fonts(cls):
+        # (regular, bold, currency prefix)
+        if cls.fonts is None:
+            from reportlab.pdfbase import pdfmetrics
+            from reportlab.pdfbase.ttfonts import TTFont
+
+            cls.fonts = ('Helvetica', 'Helvetica-Bold', 'Rs. ')
+            for regular, bold in PDF_FONTS:
+                if not regular or not os.path.exists(regular):
+                    continue
+                font = TTFont('InvoiceSans', regular)
+                pdfmetrics.registerFont(font)
+                bold_name = 'InvoiceSans'
+                if bold and os.path.exists(bold):
+                    pdfmetrics.registerFont(TTFont('InvoiceSans-Bold', bold))
+                    bold_name = 'InvoiceSans-Bold'
+                currency = '₹' if 0x20B9 in font.face.charToGlyph else 'Rs. '
+                cls.fonts = ('InvoiceSans', bold_name, currency)
+                break
+        return cls.fonts
+
+    def template(self):
+        return self.db.cache.get(('pdf_template',), ('company',), self._build_template)
+
+    def _build_template(self):
+        from reportlab.lib.pagesizes import A4
+        from reportlab.lib.utils import ImageReader
+
+        regular, bold, currency = self.load_fonts()
+        company = self.db.fetchone("""
+            SELECT name, address, phone, email, gstin, logo_path FROM company LIMIT 1
+        """) or ('SEIZE', '', '', '', '', None)
+        name, address, phone, email, gstin, logo_path = company
+
+        lines = [line.strip() for line in (address or '').splitlines() if line.strip()]
+        contact = '  |  '.join(part for part in (phone, email) if part)
+        if contact:
+            lines.append(contact)
+        if gstin:
+            lines.append(f"GSTIN: {gstin}")
+
+        logo = None
+        if logo_path and os.path.exists(logo_path):
+            # Decoded once here rather than for every invoice
+            image = ImageReader(logo_path)
+            width, height = image.getSize()
+            scale = min(120 / width, 60 / height, 1)
+            logo = (image, width * scale, height * scale)
+
+        return {
+            'page_size': A4,
+            'regular': regular,
+            'bold': bold,
+            'currency': currency,
+            'name': name or 'SEIZE',
+            'lines': lines,
+            'logo': logo,
+        }
+
+    def load(self, invoice_id):
+        invoice = self.db.fetchone("""
+            SELECT invoice_no, customer_name, customer_phone, customer_gstin, date,
+                   subtotal, gst_amount, total, status
+            FROM invoices WHERE id=?
+        """, (invoice_id,))
+        items = self.db.fetchall("""
+            SELECT product_name, COALESCE(hsn_code, ''), quantity, price, gst_rate, total
+            FROM invoice_items WHERE invoice_id=?
+            ORDER BY id
+        """, (invoice_id,))
+        return invoice, items
+
+    def render(self, invoice_id, out):
+        # out is a path or a binary file object
+        from reportlab.pdfgen.canvas import Canvas
+
+        invoice, items = self.load(invoice_id)
+        if invoice is None:
+            raise ValueError(f"Invoice {invoice_id} not found")
+        t = self.template()
+        c = Canvas(out, pagesize=t['page_size'])
+        c.setTitle(f"Invoice {invoice[0]}")
+        y = self._draw_page_top(c, t, invoice)
+
+        for n, (name, hsn, qty, price, gst_rate, total) in enumerate(items, 1):
+            if y < self.PAGE_MARGIN + 80:
+                c.showPage()
+                y = self._draw_page_top(c, t, invoice)
+            c.setFont(t['regular'], 9)
+            values = (str(n), (name or '')[:48], hsn or '', f"{qty:g}",
+                      f"{price:,.2f}", f"{gst_rate:g}", f"{total:,.2f}")
+            for (title, x, width, right), value in zip(self.COLUMNS, values):
+                if right:
+                    c.drawRightString(x + width, y, value)
+                else:
+                    c.drawString(x, y, value)
+            y -= self.ROW_HEIGHT
+
+        self._draw_totals(c, t, invoice, y)
+        c.showPage()
+        c.save()
+
+    def _draw_page_top(self, c, t, invoice):
+        width, height = t['page_size']
+        left, right = self.PAGE_MARGIN, width - self.PAGE_MARGIN
+        y = height - self.PAGE_MARGIN - 10
+
+        if t['logo']:
+            image, w, h = t['logo']
+            c.drawImage(image, right - w, height - self.PAGE_MARGIN - h, w, h, mask='auto')
+        c.setFont(t['bold'], 18)
+        c.drawString(left, y, t['name'])
+        c.setFont(t['regular'], 9)
+        for line in t['lines']:
+            y -= 12
+            c.drawString(left, y, line)
+
+        y -= 28
+        c.setFont(t['bold'], 13)
+        c.drawString(left, y, "TAX INVOICE")
+        c.setFont(t['regular'], 10)
+        c.drawRightString(right, y, f"Invoice No: {invoice[0]}")
+        y -= 14
+        c.drawRightString(right, y, f"Date: {invoice[4]}")
+
+        c.drawString(left, y, f"Bill To: {invoice[1] or ''}")
+        for label, value in (("Phone", invoice[2]), ("GSTIN", invoice[3])):
+            if value:
+                y -= 13
+                c.drawString(left, y, f"{label}: {value}")
+
+        y -= 24
+        c.setFont(t['bold'], 9)
+        for title, x, w, align_right in self.COLUMNS:
+            if align_right:
+                c.drawRightString(x + w, y, title)
+            else:
+                c.drawString(x, y, title)
+        c.line(left, y - 5, right, y - 5)
+        return y - self.ROW_HEIGHT - 4
+
+    def _draw_totals(self, c, t, invoice, y):
+        right = t['page_size'][0] - self.PAGE_MARGIN
+        c.line(self.PAGE_MARGIN, y + 8, right, y + 8)
+        currency = t['currency']
+        for label, value, font in (("Subtotal", invoice[5], t['regular']),
+                                   ("GST", invoice[6], t['regular']),
+                                   ("Total", invoice[7], t['bold'])):
+            y -= 14
+            c.setFont(font, 10)
+            c.drawRightString(right - 110, y, label)
+            c.drawRightString(right, y, f"{currency}{value or 0:,.2f}")
+        c.setFont(t['regular'], 8)
+        c.drawString(self.PAGE_MARGIN, self.PAGE_MARGIN, "Thank you for your business!")
+
+
+def _product_chunks(path, size, sheet=None):
+    # Yields (file line of the first row, DataFrame of raw strings)
+    import pandas as pd
+
+    if path.lower().endswith('.csv'):
+        line = 2
+        for chunk in pd.read_csv(path, dtype=str, chunksize=size, skipinitialspace=True,
+                                 encoding='utf-8-sig'):
+            yield line, chunk
+            line += len(chunk)
+        return
+
+    # read_excel has no chunked mode; openpyxl's read-only mode streams rows
+    from openpyxl import load_workbook
+    book = load_workbook(path, read_only=True, data_only=True)
+    try:
+        rows = (book[sheet] if sheet else book.worksheets[0]).iter_rows(values_only=True)
+        header = [str(c) if c is not None else '' for c in next(rows, ())]
+        line, batch = 2, []
+        for row in rows:
+            batch.append(row)
+            if len(batch) == size:
+                yield line, pd.DataFrame(batch, columns=header, dtype=object).astype('string')
+                line, batch = line + size, []
+        if batch:
+            yield line, pd.DataFrame(batch, columns=header, dtype=object).astype('string')
+    finally:
+        book.close()
+
+
+def _clean_products(raw, first_line):
+    # Coerces a chunk to products columns and splits off the invalid rows.
+    # Returns (clean DataFrame, [(line, message), ...]).
+    import pandas as pd
+
+    raw = raw.rename(columns=lambda c: PRODUCT_IMPORT_COLUMNS.get(str(c).strip().lower(),
+                                                                  str(c).strip().lower()))
+    missing = {'name', 'price'} - set(raw.columns)
+    if missing:
+        raise ValueError(f"Missing column(s): {', '.join(sorted(missing))}")
+    raw = raw.loc[:, ~raw.columns.duplicated()]
+
+    def text(column):
+        if column not in raw:
+            return pd.Series('', index=raw.index, dtype='string')
+        return raw[column].astype('string').fillna('').str.strip()
+
+    def number(column):
+        values = text(column)
+        blank = values.eq('')
+        parsed = pd.to_numeric(values, errors='coerce').astype(float)
+        # Spreadsheet prices often carry separators or a currency sign; only
+        # the cells that did not parse are cleaned up and tried again
+        retry = parsed.isna() & ~blank
+        if retry.any():
+            parsed[retry] = pd.to_numeric(
+                values[retry].str.replace(r'[,₹\s]|^Rs\.?', '', regex=True),
+                errors='coerce').astype(float)
+        return blank, parsed
+
+    lines = pd.Series(range(first_line, first_line + len(raw)), index=raw.index)
+    clean = pd.DataFrame({
+        'name': text('name'),
+        # Numeric HSN codes come back from Excel as 8471.0
+        'hsn_code': text('hsn_code').str.replace(r'\.0$', '', regex=True),
+    })
+    price_blank, clean['price'] = number('price')
+    gst_blank, clean['gst_rate'] = number('gst_rate')
+    stock_blank, clean['stock'] = number('stock')
+    min_blank, clean['min_stock'] = number('min_stock')
+
+    checks = [
+        (clean['name'].eq(''), "name is empty"),
+        (price_blank, "price is empty"),
+        (~price_blank & clean['price'].isna(), "price is not a number"),
+        (clean['price'] < 0, "price is negative"),
+        (~gst_blank & ~clean['gst_rate'].between(0, 100), "GST rate must be 0-100"),
+        (~stock_blank & (clean['stock'].isna() | (clean['stock'] % 1 != 0)), "stock is not a whole number"),
+        (~min_blank & (clean['min_stock'].isna() | (clean['min_stock'] % 1 != 0)),
+         "min stock is not a whole number"),
+    ]
+    bad = pd.Series(False, index=raw.index)
+    errors = []
+    for mask, message in checks:
+        mask = mask.fillna(False).astype(bool)
+        errors.extend((int(line), message) for line in lines[mask])
+        bad |= mask
+    errors.sort()
+
+    # Blank optional cells stay NaN: defaults for new products, unchanged
+    # values for existing ones
+    for column, blank in (('gst_rate', gst_blank), ('stock', stock_blank), ('min_stock', min_blank)):
+        clean[column] = clean[column].where(~blank)
+    clean = clean[~bad]
+    # A product listed twice in the file takes its last row
+    clean = clean.drop_duplicates(['name', 'hsn_code'], keep='last')
+    return clean, errors
+
+
+def import_products(db, path, user=None, progress=None, sheet=None, chunk=IMPORT_CHUNK):
+    # Adds or updates products from a CSV or Excel file, matching existing
+    # products on name and HSN code. Rows that fail validation are reported
+    # and skipped; the rest are written one transaction per chunk. Stock in
+    # the file becomes the product's stock through 'opening' (new products)
+    # or 'import' (existing) movements in the ledger.
+    start = time.perf_counter()
+    existing = {}
+    for product_id, name, hsn_code in db.fetchall("SELECT id, name, hsn_code FROM products ORDER BY id DESC"):
+        # Duplicates already in the table resolve to the oldest product
+        existing[(name, hsn_code or '')] = product_id
+    stock = dict(db.fetchall("SELECT id, COALESCE(stock, 0) FROM products"))
+
+    inserted = updated = rows = 0
+    errors = []
+    for first_line, raw in _product_chunks(path, chunk, sheet):
+        clean, chunk_errors = _clean_products(raw, first_line)
+        errors.extend(chunk_errors)
+        rows += len(raw)
+
+        def values(column, cast=float):
+            return [None if v != v else cast(v) for v in clean[column].tolist()]
+
+        keys = list(zip(clean['name'].tolist(), clean['hsn_code'].tolist()))
+        ids = [existing.get(key) for key in keys]
+        records = list(zip(ids, keys, values('price'), values('gst_rate'),
+                           values('stock', int), values('min_stock', int)))
+        new = [r for r in records if r[0] is None]
+        old = [r for r in records if r[0] is not None]
+
+        with db.transaction():
+            db.executemany("""
+                UPDATE products SET price=?, gst_rate=COALESCE(?, gst_rate),
+                                    min_stock=COALESCE(?, min_stock)
+                WHERE id=?
+            """, [(price, gst, min_stock, product_id)
+                  for product_id, key, price, gst, qty, min_stock in old])
+
+            first_id = db.fetchone("SELECT COALESCE(MAX(id), 0) FROM products")[0]
+            db.executemany("""
+                INSERT INTO products (name, hsn_code, price, gst_rate, stock, min_stock)
+                VALUES (?, ?, ?, COALESCE(?, 18), 0, COALESCE(?, 10))
+            """, [(name, hsn, price, gst, min_stock)
+                  for product_id, (name, hsn), price, gst, qty, min_stock in new])
+            # The writer is held for the whole transaction, so the new ids
+            # are exactly those above first_id
+            for product_id, name, hsn_code in db.fetchall("""
+                SELECT id, name, hsn_code FROM products WHERE id > ? ORDER BY id
+            """, (first_id,)):
+                existing.setdefault((name, hsn_code or ''), product_id)
+                stock[product_id] = 0
+
+            movements = []
+            for product_id, key, price, gst, qty, min_stock in records:
+                if qty is None:
+                    continue
+                reason = 'opening' if product_id is None else 'import'
+                product_id = existing[key]
+                delta = qty - stock[product_id]
+                if delta:
+                    movements.append((product_id, delta, reason, user))
+                    stock[product_id] = qty
+            db.executemany("""
+                INSERT INTO stock_movements (product_id, qty_delta, reason, created_by)
+                VALUES (?, ?, ?, ?)
+            """, movements)
+            db.touch('products')
+
+        inserted += len(new)
+        updated += len(old)
+        if progress:
+            progress(rows)
+
+    return {
+        'rows': rows,
+        'inserted': inserted,
+        'updated': updated,
+        'rejected': len({line for line, message in errors}),
+        'errors': errors,
+        'seconds': time.perf_counter() - start,
+    }
+
+
+def _legacy_chunks(path, columns, required, done, size):
+    # Yields (file line of the first row, DataFrame of stripped strings with
+    # every one of `columns`) for the rows after the first `done`
+    import pandas as pd
+
+    line = 2 + done
+    reader = pd.read_csv(path, dtype=str, chunksize=size, skipinitialspace=True,
+                         encoding='utf-8-sig', keep_default_na=False,
+                         skiprows=(lambda i: 0 < i <= done) if done else None)
+    for chunk in reader:
+        chunk.columns = [str(c).strip().lower() for c in chunk.columns]
+        missing = [c for c in required if c not in chunk.columns]
+        if missing:
+            raise ValueError(f"{os.path.basename(path)} is missing column(s): {', '.join(missing)}")
+        chunk = chunk.reindex(columns=list(columns), fill_value='')
+        yield line, chunk.apply(lambda column: column.str.strip())
+        line += len(chunk)
+
+
+def _legacy_dates(values):
+    # ISO dates first, then the day-first formats older Indian systems use
+    import pandas as pd
+
+    parsed = pd.to_datetime(values, format='ISO8601', errors='coerce')
+    retry = parsed.isna() & values.ne('')
+    if retry.any():
+        parsed[retry] = pd.to_datetime(values[retry], dayfirst=True, format='mixed', errors='coerce')
+    return parsed.dt.strftime('%Y-%m-%d')
+
+
+def _legacy_number(values):
+    import pandas as pd
+
+    return pd.to_numeric(values.str.replace(',', '', regex=False), errors='coerce').astype(float)
+
+
+def _optional(value):
+    return None if value != value else value
+
+
+def import_legacy_invoices(db, headers_path, lines_path, prefix='', progress=None,
+                           chunk=LEGACY_CHUNK):
+    # Loads invoice history exported from the old system: a headers CSV
+    # (LEGACY_HEADER_COLUMNS) and a lines CSV (LEGACY_LINE_COLUMNS).
+    #
+    # Runs in stages, each committed batch by batch with its checkpoint in
+    # legacy_imports, so running it again after an interruption resumes:
+    #   headers  invoices keep their old number (with `prefix`); blank or
+    #            clashing numbers get a new one
+    #   lines    line totals are recomputed as line_amounts() does and
+    #            lines are joined to their invoice through legacy_invoice_map
+    #   finish   deferred indexes and triggers are restored, header totals
+    #            are recomputed from the lines, rollups and search rebuilt
+    # Rejected rows and totals that disagree with the old system are
+    # recorded in legacy_import_issues. Secondary indexes and triggers on
+    # invoices/invoice_items are dropped for the load, so run it while no
+    # one is billing. progress(stage, rows) is called after each batch.
+    source = f"{os.path.abspath(headers_path)}|{os.path.abspath(lines_path)}"
+    with db.transaction() as conn:
+        state = conn.execute("SELECT stage, headers_done, lines_done FROM legacy_imports WHERE source=?",
+                             (source,)).fetchone()
+        if state is None:
+            # Deferred until the end: maintaining them row by row costs more
+            # than building them once. The closed-period guards stay.
+            deferred = conn.execute("""
+                SELECT type, name, sql FROM sqlite_master
+                WHERE type IN ('index', 'trigger') AND tbl_name IN ('invoices', 'invoice_items')
+                  AND sql IS NOT NULL AND name NOT LIKE 'trg_closed_period_%'
+            """).fetchall()
+            for kind, name, sql in deferred:
+                conn.execute(f"DROP {kind.upper()} IF EXISTS {name}")
+            conn.execute("INSERT INTO legacy_imports (source, deferred) VALUES (?, ?)",
+                         (source, json.dumps(deferred)))
+            state = ('headers', 0, 0)
+    stage, headers_done, lines_done = state
+
+    def issues(conn, rows):
+        conn.executemany("""
+            INSERT INTO legacy_import_issues (source, file_line, legacy_no, kind, message,
+                                              legacy_value, computed_value)
+            VALUES (?, ?, ?, ?, ?, ?, ?)
+        """, [(source, *row) for row in rows])
+
+    if stage == 'headers':
+        for first_line, raw in _legacy_chunks(headers_path, LEGACY_HEADER_COLUMNS,
+                                              ('invoice_no', 'date'), headers_done, chunk):
+            raw['date'] = _legacy_dates(raw['date'])
+            for column in ('subtotal', 'gst_amount', 'total'):
+                raw[column] = _legacy_number(raw[column])
+            raw['repeated'] = raw['invoice_no'].ne('') & raw['invoice_no'].duplicated()
+            raw['line'] = range(first_line, first_line + len(raw))
+
+            with db.transaction() as conn:
+                numbers = [n for n in raw['invoice_no'].tolist() if n]
+                seen = {row[0] for row in conn.execute("""
+                    SELECT value FROM json_each(?) WHERE value IN (SELECT legacy_no FROM legacy_invoice_map)
+                """, (json.dumps(numbers),))}
+                existing = {row[0] for row in conn.execute("""
+                    SELECT value FROM json_each(?) WHERE value IN (SELECT invoice_no FROM invoices)
+                """, (json.dumps([prefix + n for n in numbers]),))}
+                # New numbers must also miss the old numbers later in this chunk
+                taken = existing | {prefix + n for n in numbers}
+
+                def allocate(day):
+                    while True:
+                        number = db.numbers.allocate(conn, day)
+                        if number not in taken and not conn.execute(
+                                "SELECT 1 FROM invoices WHERE invoice_no=?", (number,)).fetchone():
+                            taken.add(number)
+                            return number
+
+                rows, mapped, problems = [], [], []
+                for row in raw.itertuples(index=False):
+                    if not isinstance(row.date, str):
+                        problems.append((row.line, row.invoice_no, 'rejected', "date is missing or invalid",
+                                         None, None))
+                        continue
+                    if row.invoice_no and (row.repeated or row.invoice_no in seen):
+                        problems.append((row.line, row.invoice_no, 'rejected', "invoice number repeated",
+                                         None, None))
+                        continue
+                    invoice_no = prefix + row.invoice_no if row.invoice_no else ''
+                    if not invoice_no or invoice_no in existing:
+                        invoice_no = allocate(row.date)
+                        if row.invoice_no:
+                            problems.append((row.line, row.invoice_no, 'renumbered',
+                                             f"stored as {invoice_no}", None, None))
+                    rows.append((invoice_no, row.customer_name, row.customer_phone, row.customer_gstin,
+                                 row.date, _optional(row.subtotal), _optional(row.gst_amount),
+                                 _optional(row.total), row.status or 'paid'))
+                    # Lines without a number in the old system cannot be matched
+                    mapped.append(row.invoice_no or f"#{row.line}")
+
+                first_id = conn.execute("SELECT COALESCE(MAX(id), 0) FROM invoices").fetchone()[0]
+                # Header totals are the old system's until the finish stage
+                # recomputes them from the lines
+                conn.executemany("""
+                    INSERT INTO invoices (invoice_no, customer_name, customer_phone, customer_gstin,
+                                          date, subtotal, gst_amount, total, status, created_by)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, 'legacy import')
+                """, rows)
+                db.numbers.skip_issued(conn, [row[0] for row in rows])
+                # One writer holds the transaction, so the new ids follow first_id in order
+                conn.executemany("INSERT INTO legacy_invoice_map (legacy_no, invoice_id) VALUES (?, ?)",
+                                 zip(mapped, range(first_id + 1, first_id + 1 + len(rows))))
+                issues(conn, problems)
+                headers_done += len(raw)
+                conn.execute("UPDATE legacy_imports SET headers_done=? WHERE source=?", (headers_done, source))
+            db.touch('invoices')
+            if progress:
+                progress('headers', headers_done)
+
+        with db.transaction() as conn:
+            conn.execute("UPDATE legacy_imports SET stage='lines' WHERE source=?", (source,))
+        stage = 'lines'
+
+    if stage == 'lines':
+        for first_line, raw in _legacy_chunks(lines_path, LEGACY_LINE_COLUMNS,
+                                              ('invoice_no', 'quantity', 'price', 'gst_rate'),
+                                              lines_done, chunk):
+            qty, price, gst_rate, legacy_total = (_legacy_number(raw[c])
+                                                  for c in ('quantity', 'price', 'gst_rate', 'total'))
+            # Same paise arithmetic as line_amounts(), for the whole chunk at
+            # once; the float steps are exact for whole quantities
+            paise = (price * 100).round()
+            amount = (qty * paise + 0.5) // 1
+            gst = (amount * (gst_rate * 100).round() + 5000) // 10000
+            price, total = paise / 100, (amount + gst) / 100
+            invalid = qty.isna() | price.isna() | gst_rate.isna() | raw['invoice_no'].eq('')
+            differs = ~invalid & legacy_total.notna() & (legacy_total - total).abs().gt(LEGACY_TOLERANCE)
+            lines = range(first_line, first_line + len(raw))
+
+            problems = [(line, number, 'rejected', "quantity, price or gst_rate is not a number", None, None)
+                        for line, number, bad in zip(lines, raw['invoice_no'], invalid) if bad]
+            problems.extend((line, number, 'line total', name, old, new)
+                            for line, number, name, old, new, bad in zip(
+                                lines, raw['invoice_no'], raw['product_name'], legacy_total, total, differs)
+                            if bad)
+            rows = [row for row, bad in zip(zip(lines, raw['invoice_no'], raw['product_name'],
+                                                qty, price, gst_rate, total), invalid) if not bad]
+
+            with db.transaction() as conn:
+                conn.execute("""
+                    CREATE TEMP TABLE IF NOT EXISTS legacy_lines (
+                        file_line INTEGER, legacy_no TEXT, product_name TEXT,
+                        quantity REAL, price REAL, gst_rate REAL, total REAL
+                    )
+                """)
+                conn.executemany("INSERT INTO temp.legacy_lines VALUES (?, ?, ?, ?, ?, ?, ?)", rows)
+                conn.execute("""
+                    INSERT INTO invoice_items (invoice_id, product_id, product_name, quantity,
+                                               price, gst_rate, total, hsn_code)
+                    SELECT m.invoice_id, p.id, l.product_name, l.quantity, l.price, l.gst_rate,
+                           l.total, p.hsn_code
+                    FROM temp.legacy_lines l JOIN legacy_invoice_map m ON m.legacy_no = l.legacy_no
+                    LEFT JOIN products p
+                        ON p.id = (SELECT MIN(id) FROM products WHERE name = l.product_name)
+                    ORDER BY l.file_line
+                """)
+                conn.execute("""
+                    INSERT INTO legacy_import_issues (source, file_line, legacy_no, kind, message)
+                    SELECT ?, file_line, legacy_no, 'rejected', 'no invoice with this number'
+                    FROM temp.legacy_lines l
+                    WHERE NOT EXISTS (SELECT 1 FROM legacy_invoice_map m WHERE m.legacy_no = l.legacy_no)
+                """, (source,))
+                conn.execute("DELETE FROM temp.legacy_lines")
+                issues(conn, problems)
+                lines_done += len(raw)
+                conn.execute("UPDATE legacy_imports SET lines_done=? WHERE source=?", (lines_done, source))
+            db.touch('invoice_items')
+            if progress:
+                progress('lines', lines_done)
+
+        with db.transaction() as conn:
+            conn.execute("UPDATE legacy_imports SET stage='finish' WHERE source=?", (source,))
+        stage = 'finish'
+
+    if stage == 'finish':
+        _finish_legacy_import(db, source, chunk, progress)
+    return legacy_import_summary(db, source)
+
+
+def _finish_legacy_import(db, source, chunk, progress=None):
+    # Safe to run again: each step checks or recomputes rather than appends
+    import pandas as pd
+
+    with db.transaction() as conn:
+        deferred = json.loads(conn.execute("SELECT deferred FROM legacy_imports WHERE source=?",
+                                           (source,)).fetchone()[0])
+        existing = {row[0] for row in conn.execute("SELECT name FROM sqlite_master")}
+        for kind, name, sql in deferred:
+            if kind == 'index' and name not in existing:
+                conn.execute(sql)
+        conn.execute("DELETE FROM legacy_import_issues WHERE source=? AND kind='invoice total'", (source,))
+    if progress:
+        progress('indexes', len(deferred))
+
+    # Header totals as the sums of their lines' amount and GST, in paise as
+    # InvoiceDraft keeps them, compared with what the old system printed; the
+    # recomputed ones are kept
+    done = last_id = 0
+    while True:
+        with db.reader() as conn:
+            totals = pd.read_sql_query("""
+                SELECT m.invoice_id, m.legacy_no, i.total AS legacy_total,
+                       COALESCE(SUM(ROUND(ii.quantity * ii.price * 100)), 0) / 100 AS subtotal,
+                       COALESCE(SUM(ROUND(ii.total * 100) - ROUND(ii.quantity * ii.price * 100)), 0)
+                           / 100 AS gst_amount
+                FROM legacy_invoice_map m
+                JOIN invoices i ON i.id = m.invoice_id
+                LEFT JOIN invoice_items ii ON ii.invoice_id = m.invoice_id
+                WHERE m.invoice_id > ?
+                GROUP BY m.invoice_id
+                ORDER BY m.invoice_id
+                LIMIT ?
+            """, conn, params=(last_id, chunk))
+        if totals.empty:
+            break
+        last_id = int(totals['invoice_id'].iat[-1])
+        totals['subtotal'] = totals['subtotal'].round(2)
+        totals['gst_amount'] = totals['gst_amount'].round(2)
+        totals['total'] = (totals['subtotal'] + totals['gst_amount']).round(2)
+        differs = (totals['legacy_total'].notna()
+                   & (totals['legacy_total'] - totals['total']).abs().gt(LEGACY_TOLERANCE))
+
+        with db.transaction() as conn:
+            conn.executemany("UPDATE invoices SET subtotal=?, gst_amount=?, total=? WHERE id=?",
+                             totals[['subtotal', 'gst_amount', 'total', 'invoice_id']]
+                             .itertuples(index=False, name=None))
+            conn.executemany("""
+                INSERT INTO legacy_import_issues (source, legacy_no, kind, message,
+                                                  legacy_value, computed_value)
+                VALUES (?, ?, 'invoice total', 'header total differs from its lines', ?, ?)
+            """, [(source, *row) for row in totals.loc[differs, ['legacy_no', 'legacy_total', 'total']]
+                  .itertuples(index=False, name=None)])
+        done += len(totals)
+        if progress:
+            progress('totals', done)
+
+    with db.transaction() as conn:
+        existing = {row[0] for row in conn.execute("SELECT name FROM sqlite_master")}
+        for kind, name, sql in deferred:
+            if kind == 'trigger' and name not in existing:
+                conn.execute(sql)
+        # The triggers were off for the load, so rollups and search are rebuilt
+        for statement in ROLLUP_REBUILD + GST_ROLLUP_REBUILD:
+            conn.execute(statement)
+        _create_invoice_search(conn)
+        conn.execute("UPDATE legacy_imports SET stage='done', finished_at=CURRENT_TIMESTAMP WHERE source=?",
+                     (source,))
+    db.touch('invoices', 'invoice_items')
+    db.execute("ANALYZE")
+
+
+def legacy_import_summary(db, source):
+    stage, headers, lines = db.fetchone("""
+        SELECT stage, headers_done, lines_done FROM legacy_imports WHERE source=?
+    """, (source,))
+    return {
+        'stage': stage,
+        'headers': headers,
+        'lines': lines,
+        'issues': dict(db.fetchall("""
+            SELECT kind, COUNT(*) FROM legacy_import_issues WHERE source=? GROUP BY kind
+        """, (source,))),
+    }
+
+
+def pdf_filename(invoice_no):
+    return re.sub(r'[^\w.-]', '_', invoice_no) + '.pdf'
+
+
+# Each batch PDF worker process opens the database read-only once and keeps
+# its own renderer, so fonts and the page template are set up once per
+# process and the workers never contend for the write lock
+_batch_renderer = None
+
+
+def _batch_pdf_init(db_path):
+    global _batch_renderer
+    _batch_renderer = InvoicePDFRenderer(Database(db_path, pool_size=1, readonly=True))
+
+
+def _batch_pdf_render(invoices, out_dir):
+    for invoice_id, invoice_no in invoices:
+        path = os.path.join(out_dir, pdf_filename(invoice_no))
+        # Written under a temporary name so an interrupted run never leaves
+        # a truncated PDF that a resumed run would take as finished
+        _batch_renderer.render(invoice_id, path + '.part')
+        os.replace(path + '.part', path)
+    return len(invoices)
+
+
+def batch_pdfs(db_path, out_dir, from_date, to_date, status=None, workers=None,
+               merge=None, progress=None):
+    # Renders every invoice in the date range (and status, if given) into
+    # out_dir across a process pool. Invoices that already have a PDF there
+    # are skipped, so an interrupted run picks up where it stopped. With
+    # `merge`, the PDFs are also combined into that one file.
+    # progress(done, total) is called as chunks finish.
+    import multiprocessing
+    from concurrent.futures import ProcessPoolExecutor, as_completed
+
+    db = Database(db_path, pool_size=1, readonly=True)
+    try:
+        invoices = db.fetchall(f"""
+            SELECT id, invoice_no FROM invoices
+            WHERE date BETWEEN ? AND ? {'AND status = ?' if status else ''}
+            ORDER BY date, id
+        """, (from_date, to_date, status) if status else (from_date, to_date))
+    finally:
+        db.close()
+
+    os.makedirs(out_dir, exist_ok=True)
+    todo = [inv for inv in invoices
+            if not os.path.exists(os.path.join(out_dir, pdf_filename(inv[1])))]
+    workers = workers or os.cpu_count() or 1
+    start = time.perf_counter()
+    done = 0
+    if todo:
+        # spawn rather than fork: the GUI calls this from a worker thread
+        with ProcessPoolExecutor(workers, mp_context=multiprocessing.get_context('spawn'),
+                                 initializer=_batch_pdf_init, initargs=(db_path,)) as pool:
+            futures = [pool.submit(_batch_pdf_render, todo[i:i + PDF_BATCH_CHUNK], out_dir)
+                       for i in range(0, len(todo), PDF_BATCH_CHUNK)]
+            for future in as_completed(futures):
+                done += future.result()
+                if progress:
+                    progress(done, len(todo))
+    elapsed = time.perf_counter() - start
+
+    if merge:
+        # Only merging needs pypdf, so it is not imported at startup
+        from pypdf import PdfWriter
+        writer = PdfWriter()
+        for invoice_id, invoice_no in invoices:
+            writer.append(os.path.join(out_dir, pdf_filename(invoice_no)))
+        with open(merge, 'wb') as f:
+            writer.write(f)
+
+    return {
+        'invoices': len(invoices),
+        'skipped': len(invoices) - len(todo),
+        'rendered': done,
+        'seconds': elapsed,
+        'per_second': done / elapsed if elapsed else 0.0,
+        'workers': workers,
+    }
+
+
+def keyset_query(columns, table, keys, where, params, after, descending, limit):
+    # (sql, params) for one page of `columns` plus the `keys` values, ordered
+    # by keys and starting after the row whose keys are `after` (None for the
+    # first page)
+    order = 'DESC' if descending else 'ASC'
+    where = f"({where})"
+    params = list(params)
+    if after is not None:
+        op = '<' if descending else '>'
+        where += f" AND ({', '.join(keys)}) {op} ({', '.join('?' * len(after))})"
+        params.extend(after)
+    return f"""
+        SELECT {columns}, {', '.join(keys)} FROM {table}
+        WHERE {where}
+        ORDER BY {', '.join(f'{k} {order}' for k in keys)}
+        LIMIT ?
+    """, (*params, limit)
+
+
+def keyset_page(db, columns, table, keys, where, params, after, descending, limit):
+    return db.fetchall(*keyset_query(columns, table, keys, where, params, after, descending, limit))
+
+
+def hot_queries(today=None):
+    # (name, sql, params, index) for each hot-path statement and the index
+    # it must be served by; pages are checked past their first page, where
+    # the keyset condition has to use the index too
+    today = today or date.today()
+    month = today.replace(day=1)
+    return [
+        ("dashboard today_sales", DASHBOARD_SQL['today_sales'], (today,),
+         'sqlite_autoindex_daily_sales_1'),
+        ("dashboard today_expenses", DASHBOARD_SQL['today_expenses'], (today,),
+         'sqlite_autoindex_daily_expenses_1'),
+        ("dashboard recent_invoices", RECENT_INVOICES_SQL, (), 'idx_invoices_created_at'),
+        ("invoices page", *keyset_query(**INVOICE_PAGE, where=INVOICE_RANGE, params=(month, today),
+                                        after=(today, 1 << 62), limit=PAGE_SIZE), 'idx_invoices_date'),
+        ("invoice edit lines", INVOICE_EDIT_LINES_SQL, (1,), 'idx_invoice_items_invoice'),
+        ("invoice stock reversal", STOCK_REVERSAL_SQL, ('admin', 1), 'idx_stock_movements_invoice'),
+        ("expenses page", *keyset_query(**EXPENSE_PAGE, where='1', params=(),
+                                        after=(today, 1 << 62), limit=PAGE_SIZE), 'idx_expenses_day'),
+        ("gst return summary", GST_SUMMARY_SQL, (month, today), 'sqlite_autoindex_daily_gst_1'),
+        ("products page", *keyset_query(**PRODUCT_PAGE, where='1', params=(),
+                                        after=('', 0), limit=PAGE_SIZE), 'idx_products_name'),
+    ]
+
+
+class PagedTable:
+    # Fills a Treeview from a query a page at a time using keyset pagination on
+    # `keys` (e.g. date, id) and fetches the next or previous page as the user
+    # scrolls near either end. At most max_rows rows are held; rows scrolled
+    # far out of view are dropped and fetched again when scrolled back to.
+    # With a QueryExecutor pages are fetched off the Tk thread.
+    def __init__(self, tree, scrollbar, db, columns, table, keys, where='1', params=(),
+                 descending=False, tags=None, page_size=PAGE_SIZE, max_rows=PAGE_MAX_ROWS,
+                 queries=None):
+        self.tree = tree
+        self.scrollbar = scrollbar
+        self.db = db
+        self.columns = columns
+        self.table = table
+        self.keys = keys
+        self.descending = descending
+        self.tags = tags or (lambda row: ())
+        self.page_size = page_size
+        self.max_rows = max(max_rows, page_size * 2)
+        self.queries = queries
+        self.row_keys = {}
+        self.loading = False
+        self.load_id = 0
+        tree.configure(yscrollcommand=self.on_scroll)
+        self.reload(where, params)
+
+    def _clear(self):
+        # Results of loads started before this point are ignored
+        self.load_id += 1
+        self.tree.delete(*self.tree.get_children())
+        self.row_keys = {}
+        self.has_prev = False
+        self.has_next = False
+        self.tree.insert('', 'end', iid='loading', values=("Loading...",))
+
+    def _load(self, func, args, done):
+        self.loading = True
+        load_id = self.load_id
+
+        def show(rows):
+            if load_id != self.load_id:
+                return
+            self.loading = False
+            if self.tree.exists('loading'):
+                self.tree.delete('loading')
+            done(rows)
+
+        def failed(error):
+            self.loading = False
+            if self.tree.exists('loading'):
+                self.tree.delete('loading')
+            self.queries.report_error(error)
+
+        if self.queries is None:
+            show(func(*args))
+        else:
+            self.queries.submit(func, *args, on_done=show, on_error=failed)
+
+    def reload(self, where='1', params=()):
+        self.where = where
+        self.params = tuple(params)
+        self._clear()
+        self._load(self._fetch, (None, True), self._show_next)
+
+    def fill(self, loader, *args):
+        # Replaces the pages with every row from loader(*args), for short
+        # result sets such as ranked search hits
+        self._clear()
+
+        def show(rows):
+            for row in rows:
+                self.tree.insert('', 'end', values=row, tags=self.tags(row))
+        self._load(loader, args, show)
+
+    def _fetch(self, key, forward):
+        # forward = in display order; backward pages are read reversed
+        rows = keyset_page(self.db, self.columns, self.table, self.keys, self.where,
+                           self.params, key, self.descending == forward, self.page_size)
+        return rows if forward else rows[::-1]
+
+    def _insert(self, rows, index):
+        width = len(self.keys)
+        for row in (rows if index == 'end' else reversed(rows)):
+            values = row[:-width]
+            iid = self.tree.insert('', index, values=values, tags=self.tags(values))
+            self.row_keys[iid] = row[-width:]
+
+    def _trim(self, from_start):
+        items = self.tree.get_children()
+        extra = len(items) - self.max_rows
+        if extra <= 0:
+            return
+        dropped = items[:extra] if from_start else items[-extra:]
+        for iid in dropped:
+            del self.row_keys[iid]
+        self.tree.delete(*dropped)
+        if from_start:
+            self.has_prev = True
+        else:
+            self.has_next = True
+
+    def _show_next(self, rows, last=None):
+        self.has_next = len(rows) == self.page_size
+        self._insert(rows, 'end')
+        self._trim(from_start=True)
+        if last and self.tree.exists(last):
+            self.tree.see(last)
+
+    def _show_prev(self, rows, first):
+        self.has_prev = len(rows) == self.page_size
+        self._insert(rows, 0)
+        self._trim(from_start=False)
+        if self.tree.exists(first):
+            self.tree.see(first)
+
+    def load_next(self):
+        items = self.tree.get_children()
+        if not items:
+            self.loading = False
+            return
+        last = items[-1]
+        self._load(self._fetch, (self.row_keys[last], True),
+                   lambda rows: self._show_next(rows, last))
+
+    def load_prev(self):
+        items = self.tree.get_children()
+        if not items:
+            self.loading = False
+            return
+        first = items[0]
+        self._load(self._fetch, (self.row_keys[first], False),
+                   lambda rows: self._show_prev(rows, first))
+
+    def on_scroll(self, first, last):
+        self.scrollbar.set(first, last)
+        if self.loading:
+            return
+        if float(last) > 0.9 and self.has_next:
+            action = self.load_next
+        elif float(first) < 0.1 and self.has_prev:
+            action = self.load_prev
+        else:
+            return
+        self.loading = True
+        self.tree.after_idle(action)
+
+
+class QueryExecutor:
+    # Runs database calls on worker threads so the Tk event loop keeps
+    # drawing while a report or list loads. Callbacks are run on the Tk thread
+    # from a root.after poll. cancel() starts a new generation: queued work
+    # from the old one is skipped and results still in flight are dropped, so
+    # a screen that has been left never gets drawn into. Jobs submitted with
+    # screen=False (exports and the like) outlive screen changes.
+    def __init__(self, root, workers=QUERY_WORKERS, poll_ms=QUERY_POLL_MS):
+        self.root = root
+        self.poll_ms = poll_ms
+        self.jobs = queue.Queue()
+        self.results = queue.Queue()
+        self.local = threading.local()
+        self.generation = 0
+        self.pending = 0
+        self.polling = False
+        for n in range(max(1, workers)):
+            threading.Thread(target=self._work, name=f"seize-query-{n}", daemon=True).start()
+
+    def submit(self, func, *args, on_done=None, on_error=None, screen=True):
+        self.pending += 1
+        self.jobs.put((self.generation if screen else None, func, args, on_done, on_error))
+        if not self.polling:
+            self.polling = True
+            self.root.after(self.poll_ms, self._poll)
+
+    def post(self, callback, *args):
+        # Called from a running job to have callback(*args) run on the Tk
+        # thread, e.g. for progress updates
+        self.results.put((getattr(self.local, 'generation', None), False, callback, args))
+
+    def cancel(self):
+        self.generation += 1
+
+    def _work(self):
+        while True:
+            generation, func, args, on_done, on_error = self.jobs.get()
+            if generation is not None and generation != self.generation:
+                self.results.put((generation, True, None, ()))
+                continue
+            self.local.generation = generation
+            try:
+                result = func(*args)
+            except Exception as e:
+                self.results.put((generation, True, on_error or self.report_error, (e,)))
+            else:
+                self.results.put((generation, True, on_done, (result,)))
+
+    def _poll(self):
+        while True:
+            try:
+                generation, final, callback, args = self.results.get_nowait()
+            except queue.Empty:
+                break
+            if final:
+                self.pending -= 1
+            if callback is None or (generation is not None and generation != self.generation):
+                continue
+            try:
+                callback(*args)
+            except tk.TclError:
+                # A widget the callback meant to fill has gone
+                pass
+        if self.pending:
+            self.root.after(self.poll_ms, self._poll)
+        else:
+            self.polling = False
+
+    def report_error(self, error):
+        messagebox.showerror("Error", f"Could not load data: {error}")
+
+
+# Main Application
+class SeizeBillingApp:
+    def __init__(self, root):
+        self.root = root
+        self.root.title("SEIZE - Billing & Inventory Management")
+        self.root.geometry("1400x900")
+        self.root.configure(bg='#f0f2f5')
+
+        # Initialize database
+        self.db = Database()
+        self.queries = QueryExecutor(root)
+        self.invoice_pdf = InvoicePDFRenderer(self.db)
+        self.current_user = None
+        self.current_role = None
+
+        # Colors
+        self.colors = {
+            'primary': '#2c3e50',
+            'secondary': '#34495e',
+            'accent': '#3498db',
+            'success': '#27ae60',
+            'danger': '#e74c3c',
+            'warning': '#f39c12',
+            'light': '#ecf0f1',
+            'white': '#ffffff',
+            'border': '#bdc3c7'
+        }
+
+        # Fonts, created once and shared by every screen
+        self.fonts = {
+            'brand': Font(family="Helvetica", size=36, weight="bold"),
+            'logo': Font(family="Helvetica", size=28, weight="bold"),
+            'title': Font(family="Helvetica", size=24, weight="bold"),
+            'amount': Font(family="Helvetica", size=18, weight="bold"),
+            'header': Font(family="Helvetica", size=16, weight="bold"),
+            'button': Font(family="Helvetica", size=14, weight="bold"),
+            'normal': Font(family="Helvetica", size=11),
+            'small': Font(family="Helvetica", size=9)
+        }
+
+        # Screens built so far this login as {name: (frame, refresh)}
+        self.screens = {}
+
+        self.show_login_screen()
+
+    def show_login_screen(self):
+        self.clear_window()
+
+        # Main container with border
+        container = tk.Frame(self.root, bg=self.colors['white'], 
+                           highlightbackground=self.colors['accent'], 
+                           highlightthickness=3)
+        container.place(relx=0.5, rely=0.5, anchor='center', width=500, height=600)
+
+        # Logo/Title Section
+        title_frame = tk.Frame(container, bg=self.colors['primary'], height=150)
+        title_frame.pack(fill='x', pady=0)
+        title_frame.pack_propagate(False)
+
+        tk.Label(title_frame, text="SEIZE", font=self.fonts['brand'],
+                bg=self.colors['primary'], fg=self.colors['white']).pack(pady=20)
+        tk.Label(title_frame, text="Billing & Inventory System", 
+                font=self.fonts['header'], bg=self.colors['primary'], 
+                fg=self.colors['light']).pack()
+
+        # Login Form
+        form_frame = tk.Frame(container, bg=self.colors['white'], padx=50, pady=40)
+        form_frame.pack(fill='both', expand=True)
+
+        # Username
+        tk.Label(form_frame, text="Username", font=self.fonts['header'], 
+                bg=self.colors['white'], fg=self.colors['primary']).pack(anchor='w', pady=(0,5))
+
+        username_frame = tk.Frame(form_frame, bg=self.colors['white'], 
+                                 highlightbackground=self.colors['border'], 
+                                 highlightthickness=2)
+        username_frame.pack(fill='x', pady=(0,20))
+
+        self.username_entry = tk.Entry(username_frame, font=self.fonts['normal'], 
+                                      bg=self.colors['white'], fg=self.colors['primary'],
+                                      insertbackground=self.colors['primary'],
+                                      relief='flat', bd=10)
+        self.username_entry.pack(fill='x')
+        self.username_entry.insert(0, "admin")
+
+        # Password
+        tk.Label(form_frame, text="Password", font=self.fonts['header'],
+                bg=self.colors['white'], fg=self.colors['primary']).pack(anchor='w', pady=(0,5))
+
+        password_frame = tk.Frame(form_frame, bg=self.colors['white'],
+                                 highlightbackground=self.colors['border'],
+                                 highlightthickness=2)
+        password_frame.pack(fill='x', pady=(0,30))
+
+        self.password_entry = tk.Entry(password_frame, font=self.fonts['normal'],
+                                      bg=self.colors['white'], fg=self.colors['primary'],
+                                      insertbackground=self.colors['primary'],
+                                      relief='flat', bd=10, show='•')
+        self.password_entry.pack(fill='x')
+        self.password_entry.insert(0, "admin123")
+
+        # Login Button
+        login_btn = tk.Button(form_frame, text="LOGIN", font=self.fonts['button'],
+                             bg=self.colors['accent'], fg=self.colors['white'],
+                             activebackground=self.colors['primary'],
+                             activeforeground=self.colors['white'],
+                             cursor='hand2', relief='flat', bd=0,
+                             command=self.login)
+        login_btn.pack(fill='x', ipady=12)
+
+        # Bind Enter key
+        self.password_entry.bind('<Return>', lambda e: self.login())
+
+        # Footer
+        footer_frame = tk.Frame(container, bg=self.colors['light'], height=50)
+        footer_frame.pack(fill='x', side='bottom')
+        footer_frame.pack_propagate(False)
+
+        tk.Label(footer_frame, text="© 2024 SEIZE Software", 
+                font=self.fonts['small'], bg=self.colors['light'],
+                fg=self.colors['secondary']).pack(pady=15)
+
+    def login(self):
+        username = self.username_entry.get().strip()
+        password = self.password_entry.get().strip()
+
+        if not username or not password:
+            messagebox.showerror("Error", "Please enter both username and password")
+            return
+
+        user = self.db.fetchone("SELECT * FROM users WHERE username=? AND password=?", 
+                               (username, password))
+
+        if user:
+            self.current_user = username
+            self.current_role = user[3]
+            self.show_dashboard()
+        else:
+            messagebox.showerror("Error", "Invalid username or password")
+
+    def show_dashboard(self):
+        self.clear_window()
+
+        # Main layout
+        self.root.configure(bg=self.colors['light'])
+
+        # Sidebar
+        self.sidebar = tk.Frame(self.root, bg=self.colors['primary'], width=250)
+        self.sidebar.pack(side='left', fill='y')
+        self.sidebar.pack_propagate(False)
+
+        # Logo in sidebar
+        logo_frame = tk.Frame(self.sidebar, bg=self.colors['secondary'], height=100)
+        logo_frame.pack(fill='x', pady=0)
+        logo_frame.pack_propagate(False)
+
+        tk.Label(logo_frame, text="SEIZE", font=self.fonts['logo'],
+                bg=self.colors['secondary'], fg=self.colors['white']).pack(pady=20)
+
+        # Menu Items
+        menu_items = [
+            ("Dashboard", self.show_dashboard_content),
+            ("New Invoice", self.show_invoice_screen),
+            ("Invoices", self.show_invoices_list),
+            ("Products", self.show_products),
+            ("Stock", self.show_stock),
+            ("Expenses", self.show_expenses),
+            ("Reports", self.show_reports),
+            ("Settings", self.show_settings)
+        ]
+
+        if self.current_role == 'admin':
+            menu_items.insert(-1, ("Users", self.show_users))
+
+        for text, command in menu_items:
+            btn = tk.Button(self.sidebar, text=text, font=self.fonts['normal'],
+                          bg=self.colors['primary'], fg=self.colors['white'],
+                          activebackground=self.colors['accent'],
+                          activeforeground=self.colors['white'],
+                          relief='flat', bd=0, cursor='hand2',
+                          command=lambda t=text, c=command: self.navigate(t, c))
+            btn.pack(fill='x', pady=2, ipady=10)
+
+        # Logout button at bottom
+        logout_btn = tk.Button(self.sidebar, text="Logout", font=self.fonts['normal'],
+                              bg=self.colors['danger'], fg=self.colors['white'],
+                              activebackground='#c0392b',
+                              relief='flat', bd=0, cursor='hand2',
+                              command=self.logout)
+        logout_btn.pack(fill='x', side='bottom', pady=10, ipady=10)
+
+        # User info
+        user_frame = tk.Frame(self.sidebar, bg=self.colors['secondary'], height=60)
+        user_frame.pack(fill='x', side='bottom')
+        user_frame.pack_propagate(False)
+
+        tk.Label(user_frame, text=f"Logged in as: {self.current_user}",
+                font=self.fonts['small'], bg=self.colors['secondary'],
+                fg=self.colors['light']).pack(pady=20)
+
+        # Main content area
+        self.main_content = tk.Frame(self.root, bg=self.colors['light'])
+        self.main_content.pack(side='right', fill='both', expand=True, padx=20, pady=20)
+
+        self.show_dashboard_content()
+
+    def show_dashboard_content(self):
+        self.show_screen('dashboard', self.build_dashboard)
+
+    def build_dashboard(self, screen):
+        # Header
+        header = tk.Frame(screen, bg=self.colors['white'], 
+                         highlightbackground=self.colors['border'],
+                         highlightthickness=1, height=80)
+        header.pack(fill='x', pady=(0,20))
+        header.pack_propagate(False)
+
+        tk.Label(header, text="Dashboard", font=self.fonts['title'],
+                bg=self.colors['white'], fg=self.colors['primary']).pack(side='left', padx=30, pady=20)
+
+        # Date
+        today = tk.Label(header, font=self.fonts['normal'], bg=self.colors['white'],
+                         fg=self.colors['secondary'])
+        today.pack(side='right', padx=30, pady=20)
+
+        # Stats Cards
+        stats_frame = tk.Frame(screen, bg=self.colors['light'])
+        stats_frame.pack(fill='x', pady=10)
+
+        # Cards and the recent list show placeholders until the stats load
+        stats = [
+            ('today_sales', "Today's Sales", self.colors['success']),
+            ('total_invoices', "Total Invoices", self.colors['accent']),
+            ('low_stock', "Low Stock Items", self.colors['success']),
+            ('today_expenses', "Today's Expenses", self.colors['danger'])
+        ]
+
+        values = {}
+        for key, title, color in stats:
+            card = tk.Frame(stats_frame, bg=self.colors['white'],
+                          highlightbackground=color,
+                          highlightthickness=2, width=300, height=150)
+            card.pack(side='left', padx=10, pady=10)
+            card.pack_propagate(False)
+
+            tk.Label(card, text=title, font=self.fonts['normal'],
+                    bg=self.colors['white'], fg=self.colors['secondary']).pack(pady=(20,5))
+            values[key] = (card, tk.Label(card, text="...", font=self.fonts['title'],
+                                          bg=self.colors['white'], fg=color))
+            values[key][1].pack()
+
+        # Recent Activity
+        activity_frame = tk.Frame(screen, bg=self.colors['white'],
+                                 highlightbackground=self.colors['border'],
+                                 highlightthickness=1)
+        activity_frame.pack(fill='both', expand=True, pady=20)
+
+        tk.Label(activity_frame, text="Recent Invoices", font=self.fonts['header'],
+                bg=self.colors['white'], fg=self.colors['primary']).pack(anchor='w', padx=20, pady=15)
+
+        # Treeview for recent invoices
+        columns = ('Invoice No', 'Customer', 'Date', 'Amount', 'Status')
+        tree = ttk.Treeview(activity_frame, columns=columns, show='headings', height=10)
+
+        for col in columns:
+            tree.heading(col, text=col)
+            tree.column(col, width=150)
+
+        # Add scrollbar
+        scrollbar = ttk.Scrollbar(activity_frame, orient='vertical', command=tree.yview)
+        tree.configure(yscrollcommand=scrollbar.set)
+        scrollbar.pack(side='right', fill='y')
+        tree.pack(fill='both', expand=True, padx=20, pady=(0,20))
+
+        tree.tag_configure('paid', foreground=self.colors['success'])
+        tree.tag_configure('pending', foreground=self.colors['warning'])
+
+        def show(dashboard):
+            low_stock = dashboard['low_stock']
+            values['today_sales'][1].config(text=f"₹{dashboard['today_sales']:,.2f}")
+            values['total_invoices'][1].config(text=str(dashboard['total_invoices']))
+            values['today_expenses'][1].config(text=f"₹{dashboard['today_expenses']:,.2f}")
+            # The screen is kept between visits, so the card is set either way
+            color = self.colors['warning'] if low_stock > 0 else self.colors['success']
+            values['low_stock'][0].config(highlightbackground=color)
+            values['low_stock'][1].config(text=str(low_stock), fg=color)
+
+            tree.delete(*tree.get_children())
+            for inv in dashboard['recent_invoices']:
+                tree.insert('', 'end', values=inv, tags=(inv[4],))
+
+        def refresh():
+            today.config(text=datetime.now().strftime("%d %B, %Y"))
+            if not tree.exists('loading'):
+                tree.insert('', 0, iid='loading', values=("Loading...",))
+            self.queries.submit(self.db.dashboard_stats, on_done=show)
+
+        refresh()
+        return refresh
+
+    def show_invoice_screen(self, edit_invoice_id=None):
+        # One form for new and edited invoices, cleared each time it is shown
+        self.show_screen('invoice', self.build_invoice_screen)
+        self.reset_invoice_screen(edit_invoice_id)
+
+    def reset_invoice_screen(self, edit_invoice_id=None):
+        self.edit_invoice_id = edit_invoice_id
+        self.invoice_title.config(text="Edit Invoice" if edit_invoice_id else "New Invoice")
+        # Provisional; the number is allocated when the invoice is saved
+        self.inv_no_var.set('' if edit_invoice_id else self.db.numbers.peek())
+        self.inv_date_var.set(date.today().strftime("%Y-%m-%d"))
+        for var in (self.cust_name_var, self.cust_phone_var, self.cust_gstin_var):
+            var.set('')
+        self.items_tree.delete(*self.items_tree.get_children())
+        self.draft = InvoiceDraft()
+        self.show_totals()
+        self.load_quick_products()
+
+        if edit_invoice_id:
+            self.load_invoice_for_edit(edit_invoice_id)
+
+    def build_invoice_screen(self, screen):
+        # Header
+        header = tk.Frame(screen, bg=self.colors['white'],
+                         highlightbackground=self.colors['border'],
+                         highlightthickness=1, height=80)
+        header.pack(fill='x', pady=(0,20))
+        header.pack_propagate(False)
+
+        self.invoice_title = tk.Label(header, font=self.fonts['title'],
+                                      bg=self.colors['white'], fg=self.colors['primary'])
+        self.invoice_title.pack(side='left', padx=30, pady=20)
+
+        # Invoice Form Container
+        form_container = tk.Frame(screen, bg=self.colors['light'])
+        form_container.pack(fill='both', expand=True)
+
+        # Left side - Invoice Details
+        left_frame = tk.Frame(form_container, bg=self.colors['white'],
+                             highlightbackground=self.colors['border'],
+                             highlightthickness=1)
+        left_frame.pack(side='left', fill='both', expand=True, padx=(0,10))
+
+        # Customer Details Section
+        cust_frame = tk.LabelFrame(left_frame, text="Customer Details", 
+                                  font=self.fonts['header'],
+                                  bg=self.colors['white'], fg=self.colors['primary'],
+                                  padx=20, pady=15)
+        cust_frame.pack(fill='x', padx=20, pady=20)
+
+        # Invoice Number
+        tk.Label(cust_frame, text="Invoice No:", font=self.fonts['normal'],
+                bg=self.colors['white']).grid(row=0, column=0, sticky='w', pady=5)
+        self.inv_no_var = tk.StringVar()
+        inv_no_entry = tk.Entry(cust_frame, font=self.fonts['normal'],
+                               textvariable=self.inv_no_var, state='readonly',
+                               bg=self.colors['light'])
+        inv_no_entry.grid(row=0, column=1, sticky='ew', padx=10)
+
+        # Date
+        tk.Label(cust_frame, text="Date:", font=self.fonts['normal'],
+                bg=self.colors['white']).grid(row=0, column=2, sticky='w', padx=(20,0))
+        self.inv_date_var = tk.StringVar()
+        date_entry = tk.Entry(cust_frame, font=self.fonts['normal'],
+                             textvariable=self.inv_date_var)
+        date_entry.grid(row=0, column=3, sticky='ew', padx=10)
+
+        # Customer Name
+        tk.Label(cust_frame, text="Customer Name:*", font=self.fonts['normal'],
+                bg=self.colors['white']).grid(row=1, column=0, sticky='w', pady=5)
+        self.cust_name_var = tk.StringVar()
+        tk.Entry(cust_frame, font=self.fonts['normal'],
+                textvariable=self.cust_name_var).grid(row=1, column=1, sticky='ew', padx=10)
+
+        # Customer Phone
+        tk.Label(cust_frame, text="Phone:", font=self.fonts['normal'],
+                bg=self.colors['white']).grid(row=1, column=2, sticky='w', padx=(20,0))
+        self.cust_phone_var = tk.StringVar()
+        tk.Entry(cust_frame, font=self.fonts['normal'],
+                textvariable=self.cust_phone_var).grid(row=1, column=3, sticky='ew', padx=10)
+
+        # Customer GSTIN
+        tk.Label(cust_frame, text="GSTIN:", font=self.fonts['normal'],
+                bg=self.colors['white']).grid(row=2, column=0, sticky='w', pady=5)
+        self.cust_gstin_var = tk.StringVar()
+        tk.Entry(cust_frame, font=self.fonts['normal'],
+                textvariable=self.cust_gstin_var).grid(row=2, column=1, sticky='ew', padx=10)
+
+        cust_frame.columnconfigure(1, weight=1)
+        cust_frame.columnconfigure(3, weight=1)
+
+        # Items Section - AUTO EXPANDING
+        items_frame = tk.LabelFrame(left_frame, text="Invoice Items",
+                                   font=self.fonts['header'],
+                                   bg=self.colors['white'], fg=self.colors['primary'],
+                                   padx=20, pady=15)
+        items_frame.pack(fill='both', expand=True, padx=20, pady=10)
+
+        # Items Treeview with auto-expand
+        columns = ('Item', 'HSN', 'Qty', 'Rate', 'GST%', 'Amount')
+        self.items_tree = ttk.Treeview(items_frame, columns=columns, show='headings', height=8)
+
+        for col in columns:
+            self.items_tree.heading(col, text=col)
+            self.items_tree.column(col, width=100)
+
+        self.items_tree.column('Item', width=250)
+
+        scrollbar = ttk.Scrollbar(items_frame, orient='vertical', command=self.items_tree.yview)
+        self.items_tree.configure(yscrollcommand=scrollbar.set)
+        scrollbar.pack(side='right', fill='y')
+        self.items_tree.pack(fill='both', expand=True)
+        # Double-click a line to change its quantity. The lines and totals
+        # live in self.draft; the Treeview only shows them.
+        self.items_tree.bind('<Double-1>', lambda e: self.change_item_quantity())
+
+        # Add Item Button
+        btn_frame = tk.Frame(items_frame, bg=self.colors['white'])
+        btn_frame.pack(fill='x', pady=10)
+
+        tk.Button(btn_frame, text="+ Add Item", font=self.fonts['normal'],
+                 bg=self.colors['accent'], fg=self.colors['white'],
+                 relief='flat', cursor='hand2',
+                 command=self.add_item_dialog).pack(side='left', padx=5)
+
+        tk.Button(btn_frame, text="- Remove Item", font=self.fonts['normal'],
+                 bg=self.colors['danger'], fg=self.colors['white'],
+                 relief='flat', cursor='hand2',
+                 command=self.remove_item).pack(side='left', padx=5)
+
+        # Totals Section
+        totals_frame = tk.Frame(left_frame, bg=self.colors['white'],
+                               highlightbackground=self.colors['border'],
+                               highlightthickness=1, padx=20, pady=15)
+        totals_frame.pack(fill='x', padx=20, pady=20)
+
+        self.subtotal_var = tk.StringVar(value="0.00")
+        self.gst_var = tk.StringVar(value="0.00")
+        self.total_var = tk.StringVar(value="0.00")
+
+        tk.Label(totals_frame, text="Subtotal:", font=self.fonts['normal'],
+                bg=self.colors['white']).grid(row=0, column=0, sticky='e', padx=10)
+        tk.Label(totals_frame, textvariable=self.subtotal_var,
+                font=self.fonts['header'], bg=self.colors['white'],
+                fg=self.colors['primary']).grid(row=0, column=1, sticky='w')
+
+        tk.Label(totals_frame, text="GST Amount:", font=self.fonts['normal'],
+                bg=self.colors['white']).grid(row=1, column=0, sticky='e', padx=10)
+        tk.Label(totals_frame, textvariable=self.gst_var,
+                font=self.fonts['header'], bg=self.colors['white'],
+                fg=self.colors['primary']).grid(row=1, column=1, sticky='w')
+
+        tk.Label(totals_frame, text="Total:", font=self.fonts['button'],
+                bg=self.colors['white']).grid(row=2, column=0, sticky='e', padx=10, pady=10)
+        tk.Label(totals_frame, textvariable=self.total_var,
+                font=self.fonts['amount'],
+                bg=self.colors['white'], fg=self.colors['success']).grid(row=2, column=1, sticky='w')
+
+        # Action Buttons
+        action_frame = tk.Frame(left_frame, bg=self.colors['white'])
+        action_frame.pack(fill='x', padx=20, pady=20)
+
+        tk.Button(action_frame, text="Save Invoice", font=self.fonts['normal'],
+                 bg=self.colors['success'], fg=self.colors['white'],
+                 relief='flat', cursor='hand2', padx=30, pady=10,
+                 command=self.save_invoice).pack(side='left', padx=5)
+
+        tk.Button(action_frame, text="Print", font=self.fonts['normal'],
+                 bg=self.colors['primary'], fg=self.colors['white'],
+                 relief='flat', cursor='hand2', padx=30, pady=10,
+                 command=self.print_invoice).pack(side='left', padx=5)
+
+        tk.Button(action_frame, text="Cancel", font=self.fonts['normal'],
+                 bg=self.colors['danger'], fg=self.colors['white'],
+                 relief='flat', cursor='hand2', padx=30, pady=10,
+                 command=self.show_dashboard_content).pack(side='left', padx=5)
+
+        # Right side - Quick Products
+        right_frame = tk.Frame(form_container, bg=self.colors['white'],
+                              highlightbackground=self.colors['border'],
+                              highlightthickness=1, width=300)
+        right_frame.pack(side='right', fill='y')
+        right_frame.pack_propagate(False)
+
+        tk.Label(right_frame, text="Quick Add Products",
+                font=self.fonts['header'], bg=self.colors['white'],
+                fg=self.colors['primary']).pack(pady=20)
+
+        # Product list, filled by reset_invoice_screen
+        self.quick_canvas = tk.Canvas(right_frame, bg=self.colors['white'], highlightthickness=0)
+        prod_scrollbar = ttk.Scrollbar(right_frame, orient='vertical', command=self.quick_canvas.yview)
+        self.quick_frame = tk.Frame(self.quick_canvas, bg=self.colors['white'])
+
+        self.quick_canvas.configure(yscrollcommand=prod_scrollbar.set)
+        prod_scrollbar.pack(side='right', fill='y')
+        self.quick_canvas.pack(side='left', fill='both', expand=True, padx=10)
+        self.quick_canvas.create_window((0,0), window=self.quick_frame, anchor='nw', width=260)
+
+    def load_quick_products(self):
+        # Read each time the screen is shown, so new products and prices show up
+        def show(products):
+            for child in self.quick_frame.winfo_children():
+                child.destroy()
+            for prod in products:
+                prod_btn = tk.Button(self.quick_frame,
+                                   text=f"{prod[1]}\n₹{prod[2]} ({prod[3]}% GST)",
+                                   font=self.fonts['small'],
+                                   bg=self.colors['light'], fg=self.colors['primary'],
+                                   relief='flat', cursor='hand2',
+                                   command=lambda p=prod: self.quick_add_product(p))
+                prod_btn.pack(fill='x', pady=2, ipady=5)
+
+            self.quick_frame.update_idletasks()
+            self.quick_canvas.configure(scrollregion=self.quick_canvas.bbox('all'))
+
+        self.queries.submit(self.db.fetchall,
+                            "SELECT id, name, price, gst_rate, hsn_code FROM products LIMIT 20",
+                            on_done=show)
+
+    def add_item_dialog(self):
+        dialog = tk.Toplevel(self.root)
+        dialog.title("Add Item")
+        dialog.geometry("500x520")
+        dialog.configure(bg=self.colors['white'])
+        dialog.transient(self.root)
+        dialog.grab_set()
+
+        # Product selection: type part of a name or HSN code
+        tk.Label(dialog, text="Search Product:", font=self.fonts['normal'],
+                bg=self.colors['white']).pack(pady=(20,5))
+
+        search_var = tk.StringVar()
+        search_entry = tk.Entry(dialog, textvariable=search_var, font=self.fonts['normal'])
+        search_entry.pack(fill='x', padx=20, pady=5)
+        search_entry.focus_set()
+
+        results = tk.Listbox(dialog, font=self.fonts['normal'], height=8,
+                             exportselection=False)
+        results.pack(fill='x', padx=20, pady=5)
+        matches = []
+
+        def update_matches(*args):
+            matches[:] = self.db.catalog.search(search_var.get())
+            results.delete(0, 'end')
+            for prod in matches:
+                hsn = f" [{prod[2]}]" if prod[2] else ''
+                results.insert('end', f"{prod[1]}{hsn} - ₹{prod[3]}")
+            if matches:
+                results.selection_set(0)
+
+        search_var.trace_add('write', update_matches)
+        update_matches()
+
+        # Quantity
+        tk.Label(dialog, text="Quantity:", font=self.fonts['normal'],
+                bg=self.colors['white']).pack(pady=(10,5))
+        qty_var = tk.IntVar(value=1)
+        tk.Spinbox(dialog, from_=1, to=1000, textvariable=qty_var,
+                  font=self.fonts['normal']).pack(fill='x', padx=20, pady=5)
+
+        def add_item():
+            selected = results.curselection()
+            if not selected:
+                messagebox.showerror("Error", "Please select a product")
+                return
+
+            prod = matches[selected[0]]
+            self.add_line(InvoiceLine(prod[0], prod[1], qty_var.get(), prod[3], prod[4], prod[2]))
+            self.show_totals()
+            dialog.destroy()
+
+        search_entry.bind('<Return>', lambda e: add_item())
+        results.bind('<Double-1>', lambda e: add_item())
+
+        tk.Button(dialog, text="Add", font=self.fonts['normal'],
+                 bg=self.colors['success'], fg=self.colors['white'],
+                 relief='flat', cursor='hand2', padx=30, pady=10,
+                 command=add_item).pack(pady=30)
+
+    def quick_add_product(self, product):
+        # Adding a product that is already on the invoice bumps its quantity
+        key = self.draft.find(product[0])
+        if key is not None:
+            self.set_item_quantity(key, self.draft.lines[key].quantity + 1)
+            return
+        self.add_line(InvoiceLine(product[0], product[1], 1, product[2], product[3], product[4]))
+        self.show_totals()
+
+    def add_line(self, line):
+        iid = self.items_tree.insert('', 'end', values=line.values())
+        self.draft.add(iid, line)
+
+    def set_item_quantity(self, iid, quantity):
+        line = self.draft.set_quantity(iid, quantity)
+        self.items_tree.item(iid, values=line.values())
+        self.show_totals()
+
+    def change_item_quantity(self):
+        from tkinter import simpledialog
+        selected = self.items_tree.selection()
+        if not selected:
+            return
+        line = self.draft.lines[selected[0]]
+        quantity = simpledialog.askinteger("Quantity", line.name, parent=self.root,
+                                           initialvalue=line.quantity, minvalue=1)
+        if quantity:
+            self.set_item_quantity(selected[0], quantity)
+
+    def remove_item(self):
+        selected = self.items_tree.selection()
+        if selected:
+            for iid in selected:
+                self.draft.remove(iid)
+            self.items_tree.delete(*selected)
+            self.show_totals()
+
+    def show_totals(self):
+        self.subtotal_var.set(f"₹{self.draft.subtotal / 100:,.2f}")
+        self.gst_var.set(f"₹{self.draft.gst_amount / 100:,.2f}")
+        self.total_var.set(f"₹{self.draft.total / 100:,.2f}")
+
+    def save_invoice(self):
+        if not self.cust_name_var.get().strip():
+            messagebox.showerror("Error", "Customer name is required")
+            return
+
+        if not self.draft:
+            messagebox.showerror("Error", "Please add at least one item")
+            return
+
+        # Lines in the order shown
+        items = [self.draft.lines[iid].item() for iid in self.items_tree.get_children()]
+
+        try:
+            invoice = {
+                'customer_name': self.cust_name_var.get(),
+                'customer_phone': self.cust_phone_var.get(),
+                'customer_gstin': self.cust_gstin_var.get(),
+                'date': self.inv_date_var.get(),
+                **self.draft.totals(),
+                'created_by': self.current_user
+            }
+            if self.edit_invoice_id:
+                self.db.update_invoice(self.edit_invoice_id, invoice, items, self.current_user)
+                invoice_no = self.inv_no_var.get()
+            else:
+                _, invoice_no = self.db.save_invoice(invoice, items)
+
+            messagebox.showinfo("Success", f"Invoice {invoice_no} saved successfully!")
+            self.show_invoices_list()
+
+        except Exception as e:
+            messagebox.showerror("Error", f"Failed to save invoice: {str(e)}")
+
+    def show_invoices_list(self):
+        self.show_screen('invoices', self.build_invoices_list)
+
+    def build_invoices_list(self, screen):
+        # Header
+        header = tk.Frame(screen, bg=self.colors['white'],
+                         highlightbackground=self.colors['border'],
+                         highlightthickness=1, height=80)
+        header.pack(fill='x', pady=(0,20))
+        header.pack_propagate(False)
+
+        tk.Label(header, text="Invoices", font=self.fonts['title'],
+                bg=self.colors['white'], fg=self.colors['primary']).pack(side='left', padx=30, pady=20)
+
+        tk.Button(header, text="+ New Invoice", font=self.fonts['normal'],
+                 bg=self.colors['success'], fg=self.colors['white'],
+                 relief='flat', cursor='hand2',
+                 command=self.show_invoice_screen).pack(side='right', padx=30, pady=20)
+
+        # Filter Frame
+        filter_frame = tk.Frame(screen, bg=self.colors['light'])
+        filter_frame.pack(fill='x', pady=10)
+
+        tk.Label(filter_frame, text="Search:", font=self.fonts['normal'],
+                bg=self.colors['light']).pack(side='left', padx=5)
+
+        search_var = tk.StringVar()
+        search_entry = tk.Entry(filter_frame, textvariable=search_var,
+                               font=self.fonts['normal'], width=30)
+        search_entry.pack(side='left', padx=5)
+        search_entry.bind('<Return>', lambda e: self.load_invoices(tree, from_date.get(), to_date.get(), search_var.get()))
+
+        tk.Label(filter_frame, text="From:", font=self.fonts['normal'],
+                bg=self.colors['light']).pack(side='left', padx=(20,5))
+
+        from_date = tk.StringVar(value=date.today().strftime("%Y-%m-01"))
+        tk.Entry(filter_frame, textvariable=from_date,
+                font=self.fonts['normal'], width=12).pack(side='left')
+
+        tk.Label(filter_frame, text="To:", font=self.fonts['normal'],
+                bg=self.colors['light']).pack(side='left', padx=(10,5))
+
+        to_date = tk.StringVar(value=date.today().strftime("%Y-%m-%d"))
+        tk.Entry(filter_frame, textvariable=to_date,
+                font=self.fonts['normal'], width=12).pack(side='left')
+
+        tk.Button(filter_frame, text="Filter", font=self.fonts['normal'],
+                 bg=self.colors['accent'], fg=self.colors['white'],
+                 relief='flat', cursor='hand2',
+                 command=lambda: self.load_invoices(tree, from_date.get(), to_date.get(), search_var.get())).pack(side='left', padx=20)
+
+        tk.Button(filter_frame, text="Batch PDF", font=self.fonts['normal'],
+                 bg=self.colors['secondary'], fg=self.colors['white'],
+                 relief='flat', cursor='hand2',
+                 command=lambda: self.batch_pdf_dialog(from_date.get(), to_date.get())).pack(side='left')
+
+        # Invoices Table
+        table_frame = tk.Frame(screen, bg=self.colors['white'],
+                              highlightbackground=self.colors['border'],
+                              highlightthickness=1)
+        table_frame.pack(fill='both', expand=True, pady=10)
+
+        columns = ('Invoice No', 'Customer', 'Date', 'Amount', 'Status', 'Actions')
+        tree = ttk.Treeview(table_frame, columns=columns, show='headings', height=20)
+
+        for col in columns:
+            tree.heading(col, text=col)
+            tree.column(col, width=150)
+
+        tree.column('Invoice No', width=120)
+        tree.column('Customer', width=200)
+        tree.column('Actions', width=200)
+
+        scrollbar = ttk.Scrollbar(table_frame, orient='vertical', command=tree.yview)
+        scrollbar.pack(side='right', fill='y')
+        tree.pack(fill='both', expand=True, padx=20, pady=20)
+
+        tree.tag_configure('paid', foreground=self.colors['success'])
+        tree.tag_configure('pending', foreground=self.colors['warning'])
+
+        self.invoice_pages = PagedTable(
+            tree, scrollbar, self.db, **INVOICE_PAGE,
+            where=INVOICE_RANGE, params=(from_date.get(), to_date.get()),
+            tags=lambda inv: ('paid' if inv[4] == 'paid' else 'pending',),
+            queries=self.queries)
+
+        # Action buttons frame
+        def on_select(event):
+            item = tree.selection()[0]
+            values = tree.item(item, 'values')
+            if values:
+                self.show_invoice_actions(values[0])
+
+        tree.bind('<Double-1>', on_select)
+
+        return lambda: self.load_invoices(tree, from_date.get(), to_date.get(), search_var.get())
+
+    def load_invoices(self, tree, from_date, to_date, search=''):
+        if not search.strip():
+            self.invoice_pages.reload(INVOICE_RANGE, (from_date, to_date))
+            return
+
+        # Search results are ranked and capped, so they are loaded in one go
+        self.invoice_pages.fill(self.db.search_invoices, search, from_date, to_date)
+
+    def batch_pdf_dialog(self, from_date, to_date):
+        from tkinter import filedialog
+        out_dir = filedialog.askdirectory(title="Save invoice PDFs to")
+        if not out_dir:
+            return
+        merge = None
+        if messagebox.askyesno("Batch PDF", "Also combine them into a single PDF?"):
+            merge = os.path.join(out_dir, f"invoices_{from_date}_{to_date}.pdf")
+
+        dialog = tk.Toplevel(self.root)
+        dialog.title("Batch PDF")
+        dialog.geometry("360x120")
+        dialog.configure(bg=self.colors['white'])
+        dialog.transient(self.root)
+
+        status = tk.Label(dialog, text=f"Rendering invoices {from_date} to {to_date}...",
+                          font=self.fonts['normal'], bg=self.colors['white'])
+        status.pack(pady=40)
+
+        def show_progress(done, total):
+            status.config(text=f"{done:,} of {total:,} invoices rendered")
+
+        def finished(result):
+            dialog.destroy()
+            messagebox.showinfo("Success",
+                f"{result['rendered']:,} PDFs created ({result['per_second']:.1f}/s), "
+                f"{result['skipped']:,} already present in {out_dir}")
+
+        def failed(error):
+            dialog.destroy()
+            messagebox.showerror("Error", f"Batch PDF failed: {error}\nRun it again to resume.")
+
+        self.queries.submit(
+            batch_pdfs, self.db.path, out_dir, from_date, to_date, None, None, merge,
+            lambda done, total: self.queries.post(show_progress, done, total),
+            on_done=finished, on_error=failed, screen=False)
+
+    def show_reports(self):
+        self.show_screen('reports', self.build_reports)
+
+    def build_reports(self, screen):
+        header = tk.Frame(screen, bg=self.colors['white'],
+                         highlightbackground=self.colors['border'],
+                         highlightthickness=1, height=80)
+        header.pack(fill='x', pady=(0,20))
+        header.pack_propagate(False)
+
+        tk.Label(header, text="Reports", font=self.fonts['title'],
+                bg=self.colors['white'], fg=self.colors['primary']).pack(side='left', padx=30, pady=20)
+
+        # Report buttons
+        reports_frame = tk.Frame(screen, bg=self.colors['light'])
+        reports_frame.pack(fill='both', expand=True)
+
+        reports = [
+            ("Sales Report", self.show_sales_report),
+            ("Purchase Report", self.show_purchase_report),
+            ("Stock Report", self.show_stock_report),
+            ("Profit & Loss", self.show_profit_loss),
+            ("GST Report", self.show_gst_report),
+            ("Expense Report", self.show_expense_report)
+        ]
+
+        for name, command in reports:
+            btn = tk.Button(reports_frame, text=name, font=self.fonts['header'],
+                          bg=self.colors['white'], fg=self.colors['primary'],
+                          activebackground=self.colors['accent'],
+                          activeforeground=self.colors['white'],
+                          relief='flat', bd=2, cursor='hand2',
+                          command=command, width=30, height=5)
+            btn.pack(pady=10)
+
+        return None
+
+    def show_sales_report(self):
+        self.generate_report("Sales Report", SALES_REPORT_SQL)
+
+    def show_expense_report(self):
+        self.generate_report("Expense Report", """
+            SELECT day as date, category, expense_count as entries, amount
+            FROM daily_expenses WHERE expense_count > 0
+            ORDER BY day DESC, category
+        """)
+
+    def show_purchase_report(self):
+        # Stock received, from the movement ledger; sale reversals are returns
+        # to shelf rather than purchases
+        self.generate_report("Purchase Report", """
+            SELECT date(m.created_at) as date, p.name as product, m.reason,
+                   SUM(m.qty_delta) as quantity
+            FROM stock_movements m JOIN products p ON p.id = m.product_id
+            WHERE m.qty_delta > 0 AND m.reason != 'sale_reversal'
+            GROUP BY date(m.created_at), m.product_id, m.reason
+            ORDER BY date DESC, product
+        """)
+
+    def show_stock_report(self):
+        self.generate_report("Stock Report", """
+            SELECT r.name as product, r.hsn_code, r.stock, ROUND(r.reorder_point, 1) as reorder_point,
+                   p.price, ROUND(COALESCE(r.stock, 0) * p.price, 2) as stock_value,
+                   CASE WHEN r.stock <= r.reorder_point THEN 'Reorder' ELSE '' END as status
+            FROM stock_reorder r JOIN products p ON p.id = r.id
+            ORDER BY r.name
+        """)
+
+    def show_gst_report(self):
+        self.clear_main_content()
+
+        header = tk.Frame(self.main_content, bg=self.colors['white'],
+                         highlightbackground=self.colors['border'],
+                         highlightthickness=1, height=80)
+        header.pack(fill='x', pady=(0,20))
+        header.pack_propagate(False)
+
+        tk.Label(header, text="GST Report", font=self.fonts['title'],
+                bg=self.colors['white'], fg=self.colors['primary']).pack(side='left', padx=30, pady=20)
+
+        # Return period
+        filter_frame = tk.Frame(self.main_content, bg=self.colors['light'])
+        filter_frame.pack(fill='x', pady=10)
+
+        tk.Label(filter_frame, text="From:", font=self.fonts['normal'],
+                bg=self.colors['light']).pack(side='left', padx=5)
+
+        from_date = tk.StringVar(value=date.today().strftime("%Y-%m-01"))
+        tk.Entry(filter_frame, textvariable=from_date,
+                font=self.fonts['normal'], width=12).pack(side='left')
+
+        tk.Label(filter_frame, text="To:", font=self.fonts['normal'],
+                bg=self.colors['light']).pack(side='left', padx=(10,5))
+
+        to_date = tk.StringVar(value=date.today().strftime("%Y-%m-%d"))
+        tk.Entry(filter_frame, textvariable=to_date,
+                font=self.fonts['normal'], width=12).pack(side='left')
+
+        tk.Button(filter_frame, text="Generate", font=self.fonts['normal'],
+                 bg=self.colors['accent'], fg=self.colors['white'],
+                 relief='flat', cursor='hand2',
+                 command=lambda: load()).pack(side='left', padx=20)
+
+        export_btn = tk.Button(filter_frame, text="Export to Excel", font=self.fonts['normal'],
+                              bg=self.colors['success'], fg=self.colors['white'],
+                              relief='flat', cursor='hand2', state='disabled')
+        export_btn.pack(side='left')
+
+        # One tab per return table
+        notebook = ttk.Notebook(self.main_content)
+        notebook.pack(fill='both', expand=True, pady=10)
+        titles = {'b2b': "B2B Invoices", 'b2cs': "B2C (Small)", 'hsn': "HSN Summary",
+                  'rates': "Rate-wise Summary"}
+        trees = {}
+        for name, title in titles.items():
+            frame = tk.Frame(notebook, bg=self.colors['white'])
+            notebook.add(frame, text=title)
+            tree = ttk.Treeview(frame, show='headings', height=20)
+            scrollbar = ttk.Scrollbar(frame, orient='vertical', command=tree.yview)
+            tree.configure(yscrollcommand=scrollbar.set)
+            scrollbar.pack(side='right', fill='y')
+            tree.pack(fill='both', expand=True, padx=20, pady=20)
+            trees[name] = tree
+
+        def show(tables):
+            for name, (columns, rows) in tables.items():
+                tree = trees[name]
+                tree.delete(*tree.get_children())
+                tree.configure(columns=columns)
+                for col in columns:
+                    tree.heading(col, text=col.replace('_', ' ').title())
+                    tree.column(col, width=110)
+                for row in rows:
+                    tree.insert('', 'end', values=row)
+            period = f"{from_date.get()} to {to_date.get()}"
+            export_btn.config(state='normal', command=lambda: self.export_gst_return(tables, period))
+
+        def load():
+            export_btn.config(state='disabled')
+            for tree in trees.values():
+                tree.delete(*tree.get_children())
+            self.queries.submit(gst_return, self.db, from_date.get(), to_date.get(), on_done=show)
+
+        load()
+
+    def export_gst_return(self, tables, period):
+        from tkinter import filedialog
+        path = filedialog.asksaveasfilename(
+            title="Export GST Report", initialfile=f"GST Report {period}.xlsx", defaultextension=".xlsx",
+            filetypes=[("Excel Workbook", "*.xlsx"), ("CSV Files", "*.csv")])
+        if not path:
+            return
+
+        self.queries.submit(
+            export_tables, tables, path,
+            on_done=lambda result: messagebox.showinfo("Success", f"GST report exported to {path}"),
+            on_error=lambda error: messagebox.showerror("Error", f"Export failed: {error}"),
+            screen=False)
+
+    def show_profit_loss(self, kind='month', day=None):
+        self.clear_main_content()
+        label, start, end = pnl_period(kind, day)
+        previous_label, previous_start, previous_end = pnl_period(kind, start - timedelta(days=1))
+
+        header = tk.Frame(self.main_content, bg=self.colors['white'],
+                         highlightbackground=self.colors['border'],
+                         highlightthickness=1, height=80)
+        header.pack(fill='x', pady=(0,20))
+        header.pack_propagate(False)
+
+        tk.Label(header, text="Profit & Loss Statement", font=self.fonts['title'],
+                bg=self.colors['white'], fg=self.colors['primary']).pack(side='left', padx=30, pady=20)
+
+        if self.current_role == 'admin':
+            tk.Button(header, text="Close Month", font=self.fonts['normal'],
+                     bg=self.colors['secondary'], fg=self.colors['white'],
+                     relief='flat', cursor='hand2',
+                     command=lambda: self.close_period_dialog(kind, start)).pack(side='right', padx=30, pady=20)
+
+        # Period picker
+        filter_frame = tk.Frame(self.main_content, bg=self.colors['light'])
+        filter_frame.pack(fill='x', pady=10)
+
+        kind_var = tk.StringVar(value=kind.title())
+        kind_box = ttk.Combobox(filter_frame, textvariable=kind_var, values=['Month', 'Quarter', 'Year'],
+                                state='readonly', width=10, font=self.fonts['normal'])
+        kind_box.pack(side='left', padx=5)
+        kind_box.bind('<<ComboboxSelected>>',
+                      lambda e: self.show_profit_loss(kind_var.get().lower(), start))
+
+        tk.Button(filter_frame, text="◀", font=self.fonts['normal'], relief='flat', cursor='hand2',
+                 command=lambda: self.show_profit_loss(kind, previous_start)).pack(side='left', padx=(20,5))
+        tk.Label(filter_frame, text=label, font=self.fonts['header'], width=18,
+                bg=self.colors['light']).pack(side='left')
+        tk.Button(filter_frame, text="▶", font=self.fonts['normal'], relief='flat', cursor='hand2',
+                 command=lambda: self.show_profit_loss(kind, end + timedelta(days=1))).pack(side='left', padx=5)
+
+        content = tk.Frame(self.main_content, bg=self.colors['white'],
+                          highlightbackground=self.colors['border'],
+                          highlightthickness=1, padx=50, pady=50)
+        content.pack(fill='both', expand=True, pady=20)
+
+        loading = tk.Label(content, text="Loading...", font=self.fonts['header'],
+                           bg=self.colors['white'], fg=self.colors['secondary'])
+        loading.pack(anchor='w')
+
+        def load():
+            return (self.db.profit_loss(start, end),
+                    self.db.profit_loss(previous_start, previous_end))
+
+        def show(results):
+            loading.destroy()
+            self.show_profit_loss_totals(content, (label, results[0]), (previous_label, results[1]))
+
+        self.queries.submit(load, on_done=show)
+
+    def show_profit_loss_totals(self, content, current, previous):
+        (label, totals), (previous_label, previous_totals) = current, previous
+
+        for column, heading in enumerate(["", label, previous_label, "Change"]):
+            tk.Label(content, text=heading, font=self.fonts['header'],
+                    bg=self.colors['white'], fg=self.colors['secondary']).grid(
+                        row=0, column=column, sticky='e', padx=20, pady=(0,15))
+
+        rows = [
+            ("Total Sales:", 'sales', self.colors['success']),
+            ("GST Collected:", 'gst_amount', self.colors['primary']),
+            ("Total Expenses:", 'expenses', self.colors['danger']),
+            ("Net Profit:", 'profit', None),
+        ]
+        for row, (text, key, color) in enumerate(rows, 1):
+            value, before = totals[key], previous_totals[key]
+            color = color or (self.colors['success'] if value >= 0 else self.colors['danger'])
+            change = f"{(value - before) / abs(before):+.1%}" if before else "—"
+            tk.Label(content, text=text, font=self.fonts['header'],
+                    bg=self.colors['white'], fg=self.colors['primary']).grid(row=row, column=0, sticky='w', pady=8)
+            tk.Label(content, text=f"₹{value:,.2f}", font=self.fonts['title'],
+                    bg=self.colors['white'], fg=color).grid(row=row, column=1, sticky='e', padx=20)
+            tk.Label(content, text=f"₹{before:,.2f}", font=self.fonts['normal'],
+                    bg=self.colors['white'], fg=self.colors['secondary']).grid(row=row, column=2, sticky='e', padx=20)
+            tk.Label(content, text=change, font=self.fonts['normal'],
+                    bg=self.colors['white'], fg=self.colors['secondary']).grid(row=row, column=3, sticky='e', padx=20)
+
+        if totals['closed'] == totals['months']:
+            status = "Closed"
+        elif totals['closed']:
+            status = f"{totals['closed']} of {totals['months']} months closed"
+        else:
+            status = "Open"
+        tk.Label(content, text=f"{status} · {totals['invoices']:,} invoices", font=self.fonts['normal'],
+                bg=self.colors['white'], fg=self.colors['secondary']).grid(
+                    row=len(rows) + 1, column=0, columnspan=4, sticky='w', pady=(20,0))
+
+    def close_period_dialog(self, kind, start):
+        # Offers the latest ended month up to the one on screen
+        month = min(start, date.today().replace(day=1) - timedelta(days=1)).strftime('%Y-%m')
+        label = pnl_period('month', f"{month}-01")[0]
+        if not messagebox.askyesno("Close Month",
+                                   f"Close {label}? Its P&L will be stored and its invoices and "
+                                   f"expenses can no longer be added, changed or deleted."):
+            return
+        try:
+            self.db.close_period(month, self.current_user)
+        except ValueError as e:
+            messagebox.showerror("Error", str(e))
+            return
+        messagebox.showinfo("Success", f"{label} closed")
+        self.show_profit_loss(kind, start)
+
+    def generate_report(self, title, query):
+        self.clear_main_content()
+
+        header = tk.Frame(self.main_content, bg=self.colors['white'],
+                         highlightbackground=self.colors['border'],
+                         highlightthickness=1, height=80)
+        header.pack(fill='x', pady=(0,20))
+        header.pack_propagate(False)
+
+        tk.Label(header, text=title, font=self.fonts['title'],
+                bg=self.colors['white'], fg=self.colors['primary']).pack(side='left', padx=30, pady=20)
+
+        tk.Button(header, text="Export to Excel", font=self.fonts['normal'],
+                 bg=self.colors['success'], fg=self.colors['white'],
+                 relief='flat', cursor='hand2',
+                 command=lambda: self.export_report(title, query)).pack(side='right', padx=30, pady=20)
+
+        # Report table
+        table_frame = tk.Frame(self.main_content, bg=self.colors['white'],
+                              highlightbackground=self.colors['border'],
+                              highlightthickness=1)
+        table_frame.pack(fill='both', expand=True, pady=10)
+
+        loading = tk.Label(table_frame, text="Loading...", font=self.fonts['header'],
+                           bg=self.colors['white'], fg=self.colors['secondary'])
+        loading.pack(padx=20, pady=20)
+
+        def show(result):
+            columns, data = result
+            loading.destroy()
+
+            tree = ttk.Treeview(table_frame, columns=columns, show='headings', height=20)
+
+            for col in columns:
+                tree.heading(col, text=col.replace('_', ' ').title())
+                tree.column(col, width=150)
+
+            scrollbar = ttk.Scrollbar(table_frame, orient='vertical', command=tree.yview)
+            tree.configure(yscrollcommand=scrollbar.set)
+            scrollbar.pack(side='right', fill='y')
+            tree.pack(fill='both', expand=True, padx=20, pady=20)
+
+            for row in data:
+                tree.insert('', 'end', values=row)
+
+        self.queries.submit(self.db.fetch_table, query, on_done=show)
+
+    def export_report(self, title, query):
+        from tkinter import filedialog
+        path = filedialog.asksaveasfilename(
+            title="Export Report", initialfile=f"{title}.xlsx", defaultextension=".xlsx",
+            filetypes=[("Excel Workbook", "*.xlsx"), ("CSV File", "*.csv")])
+        if not path:
+            return
+
+        dialog = tk.Toplevel(self.root)
+        dialog.title("Exporting")
+        dialog.geometry("360x160")
+        dialog.configure(bg=self.colors['white'])
+        dialog.transient(self.root)
+
+        status = tk.Label(dialog, text="Starting export...", font=self.fonts['normal'],
+                          bg=self.colors['white'])
+        status.pack(pady=(30,15))
+
+        # The export runs on a query worker and keeps going if the user
+        # moves to another screen; only Cancel stops it
+        stop = threading.Event()
+        started = time.perf_counter()
+        tk.Button(dialog, text="Cancel", font=self.fonts['normal'],
+                 bg=self.colors['danger'], fg=self.colors['white'],
+                 relief='flat', cursor='hand2', padx=20,
+                 command=stop.set).pack()
+        dialog.protocol("WM_DELETE_WINDOW", stop.set)
+
+        def show_progress(rows):
+            rate = rows / max(time.perf_counter() - started, 1e-6)
+            status.config(text=f"{rows:,} rows written ({rate:,.0f} rows/s)")
+
+        def done(rows):
+            dialog.destroy()
+            if rows is None:
+                messagebox.showinfo("Export", "Export cancelled")
+            else:
+                messagebox.showinfo("Success", f"Exported {rows:,} rows to {path}")
+
+        def failed(error):
+            dialog.destroy()
+            messagebox.showerror("Error", f"Export failed: {error}")
+
+        self.queries.submit(
+            export_table, self.db, query, path, (),
+            lambda rows: self.queries.post(show_progress, rows), stop,
+            on_done=done, on_error=failed, screen=False)
+
+    def show_users(self):
+        self.show_screen('users', self.build_users)
+
+    def build_users(self, screen):
+        header = tk.Frame(screen, bg=self.colors['white'],
+                         highlightbackground=self.colors['border'],
+                         highlightthickness=1, height=80)
+        header.pack(fill='x', pady=(0,20))
+        header.pack_propagate(False)
+
+        tk.Label(header, text="User Management", font=self.fonts['title'],
+                bg=self.colors['white'], fg=self.colors['primary']).pack(side='left', padx=30, pady=20)
+
+        tk.Button(header, text="+ Add User", font=self.fonts['normal'],
+                 bg=self.colors['success'], fg=self.colors['white'],
+                 relief='flat', cursor='hand2',
+                 command=self.add_user_dialog).pack(side='right', padx=30, pady=20)
+
+        # Users table
+        table_frame = tk.Frame(screen, bg=self.colors['white'],
+                              highlightbackground=self.colors['border'],
+                              highlightthickness=1)
+        table_frame.pack(fill='both', expand=True, pady=10)
+
+        columns = ('Username', 'Role', 'Email', 'Created At')
+        tree = ttk.Treeview(table_frame, columns=columns, show='headings', height=20)
+
+        for col in columns:
+            tree.heading(col, text=col)
+            tree.column(col, width=200)
+
+        scrollbar = ttk.Scrollbar(table_frame, orient='vertical', command=tree.yview)
+        tree.configure(yscrollcommand=scrollbar.set)
+        scrollbar.pack(side='right', fill='y')
+        tree.pack(fill='both', expand=True, padx=20, pady=20)
+
+        # Load users
+        def load():
+            tree.delete(*tree.get_children())
+            for user in self.db.fetchall("SELECT username, role, email, created_at FROM users"):
+                tree.insert('', 'end', values=user)
+
+        load()
+        return load
+
+    def add_user_dialog(self):
+        dialog = tk.Toplevel(self.root)
+        dialog.title("Add User")
+        dialog.geometry("400x400")
+        dialog.configure(bg=self.colors['white'])
+        dialog.transient(self.root)
+        dialog.grab_set()
+
+        tk.Label(dialog, text="Username:", font=self.fonts['normal'],
+                bg=self.colors['white']).pack(pady=(20,5))
+        username_var = tk.StringVar()
+        tk.Entry(dialog, textvariable=username_var, font=self.fonts['normal']).pack(fill='x', padx=20)
+
+        tk.Label(dialog, text="Password:", font=self.fonts['normal'],
+                bg=self.colors['white']).pack(pady=(15,5))
+        password_var = tk.StringVar()
+        tk.Entry(dialog, textvariable=password_var, show='•', font=self.fonts['normal']).pack(fill='x', padx=20)
+
+        tk.Label(dialog, text="Role:", font=self.fonts['normal'],
+                bg=self.colors['white']).pack(pady=(15,5))
+        role_var = tk.StringVar(value='user')
+        ttk.Combobox(dialog, textvariable=role_var, values=['admin', 'user', 'salesman'],
+                    font=self.fonts['normal'], state='readonly').pack(fill='x', padx=20)
+
+        tk.Label(dialog, text="Email:", font=self.fonts['normal'],
+                bg=self.colors['white']).pack(pady=(15,5))
+        email_var = tk.StringVar()
+        tk.Entry(dialog, textvariable=email_var, font=self.fonts['normal']).pack(fill='x', padx=20)
+
+        def save():
+            try:
+                self.db.execute("""
+                    INSERT INTO users (username, password, role, email)
+                    VALUES (?, ?, ?, ?)
+                """, (username_var.get(), password_var.get(), role_var.get(), email_var.get()))
+                messagebox.showinfo("Success", "User added!")
+                dialog.destroy()
+                self.show_users()
+            except Exception as e:
+                messagebox.showerror("Error", str(e))
+
+        tk.Button(dialog, text="Save", font=self.fonts['normal'],
+                 bg=self.colors['success'], fg=self.colors['white'],
+                 relief='flat', cursor='hand2', padx=30, pady=10,
+                 command=save).pack(pady=30)
+
+    def show_settings(self):
+        self.show_screen('settings', self.build_settings)
+
+    def build_settings(self, screen):
+        header = tk.Frame(screen, bg=self.colors['white'],
+                         highlightbackground=self.colors['border'],
+                         highlightthickness=1, height=80)
+        header.pack(fill='x', pady=(0,20))
+        header.pack_propagate(False)
+
+        tk.Label(header, text="Settings", font=self.fonts['title'],
+                bg=self.colors['white'], fg=self.colors['primary']).pack(side='left', padx=30, pady=20)
+
+        # Settings form
+        form_frame = tk.Frame(screen, bg=self.colors['white'],
+                             highlightbackground=self.colors['border'],
+                             highlightthickness=1, padx=50, pady=30)
+        form_frame.pack(fill='both', expand=True, pady=20)
+
+        # Company settings
+        tk.Label(form_frame, text="Company Name:", font=self.fonts['normal'],
+                bg=self.colors['white']).grid(row=0, column=0, sticky='w', pady=10)
+        name_var = tk.StringVar()
+        tk.Entry(form_frame, textvariable=name_var, font=self.fonts['normal'], width=40).grid(row=0, column=1, padx=10)
+
+        tk.Label(form_frame, text="Address:", font=self.fonts['normal'],
+                bg=self.colors['white']).grid(row=1, column=0, sticky='w', pady=10)
+        address_var = tk.StringVar()
+        tk.Entry(form_frame, textvariable=address_var, font=self.fonts['normal'], width=40).grid(row=1, column=1, padx=10)
+
+        tk.Label(form_frame, text="Phone:", font=self.fonts['normal'],
+                bg=self.colors['white']).grid(row=2, column=0, sticky='w', pady=10)
+        phone_var = tk.StringVar()
+        tk.Entry(form_frame, textvariable=phone_var, font=self.fonts['normal'], width=40).grid(row=2, column=1, padx=10)
+
+        tk.Label(form_frame, text="Email:", font=self.fonts['normal'],
+                bg=self.colors['white']).grid(row=3, column=0, sticky='w', pady=10)
+        email_var = tk.StringVar()
+        tk.Entry(form_frame, textvariable=email_var, font=self.fonts['normal'], width=40).grid(row=3, column=1, padx=10)
+
+        tk.Label(form_frame, text="GSTIN:", font=self.fonts['normal'],
+                bg=self.colors['white']).grid(row=4, column=0, sticky='w', pady=10)
+        gstin_var = tk.StringVar()
+        tk.Entry(form_frame, textvariable=gstin_var, font=self.fonts['normal'], width=40).grid(row=4, column=1, padx=10)
+
+        def save_settings():
+            self.db.execute("""
+                UPDATE company SET name=?, address=?, phone=?, email=?, gstin=?
+                WHERE id=1
+            """, (name_var.get(), address_var.get(), phone_var.get(), 
+                 email_var.get(), gstin_var.get()))
+            messagebox.showinfo("Success", "Settings saved!")
+
+        tk.Button(form_frame, text="Save Settings", font=self.fonts['normal'],
+                 bg=self.colors['success'], fg=self.colors['white'],
+                 relief='flat', cursor='hand2', padx=30, pady=10,
+                 command=save_settings).grid(row=5, column=1, pady=30, sticky='e')
+
+        def load():
+            company = self.db.fetchone("SELECT * FROM company LIMIT 1")
+            name_var.set(company[1] if company else 'SEIZE')
+            for var, value in zip((address_var, phone_var, email_var, gstin_var),
+                                  company[2:6] if company else ('',) * 4):
+                var.set(value or '')
+
+        load()
+        return load
+
+    def logout(self):
+        self.current_user = None
+        self.current_role = None
+        self.show_login_screen()
+
+    def clear_window(self):
+        self.queries.cancel()
+        self.screens = {}
+        for widget in self.root.winfo_children():
+            widget.destroy()
+
+    def clear_main_content(self):
+        # Built screens are only hidden; one-off screens such as reports are
+        # destroyed
+        self.queries.cancel()
+        kept = {str(frame) for frame, refresh in self.screens.values()}
+        for widget in self.main_content.winfo_children():
+            if str(widget) in kept:
+                widget.pack_forget()
+            else:
+                widget.destroy()
+
+    def show_screen(self, name, build):
+        # The first time a screen is shown build(frame) lays it out, loads its
+        # data and returns a function that reloads the data (or None); after
+        # that the frame is just shown again and refreshed
+        self.clear_main_content()
+        if name in self.screens:
+            frame, refresh = self.screens[name]
+            frame.pack(fill='both', expand=True)
+            if refresh:
+                refresh()
+            return
+        frame = tk.Frame(self.main_content, bg=self.colors['light'])
+        frame.pack(fill='both', expand=True)
+        self.screens[name] = (frame, build(frame))
+
+    def navigate(self, name, show):
+        start = time.perf_counter()
+        built = len(self.screens)
+        show()
+        if UI_TIMING:
+            self.root.update_idletasks()
+            print(f"{name}: {(time.perf_counter() - start) * 1000:.1f} ms"
+                  f"{' (built)' if len(self.screens) > built else ''}", flush=True)
+
+    def show_invoice_actions(self, invoice_no):
+        dialog = tk.Toplevel(self.root)
+        dialog.title(f"Invoice {invoice_no}")
+        dialog.geometry("300x250")
+        dialog.configure(bg=self.colors['white'])
+        dialog.transient(self.root)
+        dialog.grab_set()
+
+        tk.Label(dialog, text=f"Invoice: {invoice_no}",
+                font=self.fonts['header'], bg=self.colors['white'],
+                fg=self.colors['primary']).pack(pady=20)
+
+        tk.Button(dialog, text="View/Edit", font=self.fonts['normal'],
+                 bg=self.colors['accent'], fg=self.colors['white'],
+                 relief='flat', cursor='hand2', width=20, pady=10,
+                 command=lambda: [dialog.destroy(), self.edit_invoice(invoice_no)]).pack(pady=5)
+
+        tk.Button(dialog, text="Print", font=self.fonts['normal'],
+                 bg=self.colors['success'], fg=self.colors['white'],
+                 relief='flat', cursor='hand2', width=20, pady=10,
+                 command=lambda: [dialog.destroy(), self.print_invoice(invoice_no)]).pack(pady=5)
+
+        if self.current_role == 'admin':
+            tk.Button(dialog, text="Delete", font=self.fonts['normal'],
+                     bg=self.colors['danger'], fg=self.colors['white'],
+                     relief='flat', cursor='hand2', width=20, pady=10,
+                     command=lambda: [dialog.destroy(), self.delete_invoice(invoice_no)]).pack(pady=5)
+
+    def edit_invoice(self, invoice_no):
+        inv = self.db.fetchone("SELECT id FROM invoices WHERE invoice_no=?", (invoice_no,))
+        if inv:
+            self.show_invoice_screen(edit_invoice_id=inv[0])
+
+    def load_invoice_for_edit(self, invoice_id):
+        inv = self.db.fetchone("""
+            SELECT invoice_no, customer_name, customer_phone, customer_gstin, date
+            FROM invoices WHERE id=?
+        """, (invoice_id,))
+
+        if inv:
+            self.inv_no_var.set(inv[0])
+            self.cust_name_var.set(inv[1])
+            self.cust_phone_var.set(inv[2])
+            self.cust_gstin_var.set(inv[3])
+            self.inv_date_var.set(inv[4])
+
+            # Load items
+            items = self.db.fetchall(INVOICE_EDIT_LINES_SQL, (invoice_id,))
+
+            for item in items:
+                self.add_line(InvoiceLine(*item))
+
+            self.show_totals()
+
+    def delete_invoice(self, invoice_no):
+        if messagebox.askyesno("Confirm", f"Delete invoice {invoice_no}?"):
+            inv = self.db.fetchone("SELECT id FROM invoices WHERE invoice_no=?", (invoice_no,))
+            if inv:
+                try:
+                    self.db.delete_invoice(inv[0], self.current_user)
+                except sqlite3.IntegrityError as e:
+                    messagebox.showerror("Error", f"Cannot delete invoice: {e}")
+                    return
+            messagebox.showinfo("Success", "Invoice deleted")
+            self.show_invoices_list()
+
+    def print_invoice(self, invoice_no=None):
+        if not invoice_no:
+            invoice_no = self.inv_no_var.get()
+
+        row = self.db.fetchone("SELECT id FROM invoices WHERE invoice_no=?", (invoice_no,))
+        if not row:
+            messagebox.showerror("Error", "Save the invoice before printing it")
+            return
+
+        os.makedirs(PDF_DIR, exist_ok=True)
+        path = os.path.abspath(os.path.join(PDF_DIR, pdf_filename(invoice_no)))
+
+        def render():
+            self.invoice_pdf.render(row[0], path)
+            return path
+
+        def open_pdf(path):
+            import webbrowser
+            from pathlib import Path
+            webbrowser.open(Path(path).as_uri())
+
+        def failed(error):
+            messagebox.showerror("Error", f"Could not create the PDF: {error}")
+
+        # Opened in the system PDF viewer, which handles printing
+        self.queries.submit(render, on_done=open_pdf, on_error=failed, screen=False)
+
+    def show_products(self):
+        self.show_screen('products', self.build_products)
+
+    def build_products(self, screen):
+        header = tk.Frame(screen, bg=self.colors['white'],
+                         highlightbackground=self.colors['border'],
+                         highlightthickness=1, height=80)
+        header.pack(fill='x', pady=(0,20))
+        header.pack_propagate(False)
+
+        tk.Label(header, text="Products", font=self.fonts['title'],
+                bg=self.colors['white'], fg=self.colors['primary']).pack(side='left', padx=30, pady=20)
+
+        if self.current_role == 'admin':
+            tk.Button(header, text="+ Add Product", font=self.fonts['normal'],
+                     bg=self.colors['success'], fg=self.colors['white'],
+                     relief='flat', cursor='hand2',
+                     command=self.add_product_dialog).pack(side='right', padx=30, pady=20)
+            tk.Button(header, text="Import", font=self.fonts['normal'],
+                     bg=self.colors['accent'], fg=self.colors['white'],
+                     relief='flat', cursor='hand2',
+                     command=self.import_products_dialog).pack(side='right', pady=20)
+
+        # Products table
+        table_frame = tk.Frame(screen, bg=self.colors['white'],
+                              highlightbackground=self.colors['border'],
+                              highlightthickness=1)
+        table_frame.pack(fill='both', expand=True, pady=10)
+
+        columns = ('Name', 'HSN', 'Price', 'GST%', 'Stock', 'Min Stock')
+        tree = ttk.Treeview(table_frame, columns=columns, show='headings', height=20)
+
+        for col in columns:
+            tree.heading(col, text=col)
+            tree.column(col, width=120)
+
+        tree.column('Name', width=250)
+
+        scrollbar = ttk.Scrollbar(table_frame, orient='vertical', command=tree.yview)
+        scrollbar.pack(side='right', fill='y')
+        tree.pack(fill='both', expand=True, padx=20, pady=20)
+
+        tree.tag_configure('low', foreground=self.colors['danger'])
+        tree.tag_configure('normal', foreground=self.colors['success'])
+
+        # Load products
+        table = PagedTable(tree, scrollbar, self.db, **PRODUCT_PAGE,
+                           tags=lambda prod: ('low' if prod[4] <= prod[5] else 'normal',),
+                           queries=self.queries)
+        return table.reload
+
+    def add_product_dialog(self):
+        dialog = tk.Toplevel(self.root)
+        dialog.title("Add Product")
+        dialog.geometry("400x500")
+        dialog.configure(bg=self.colors['white'])
+        dialog.transient(self.root)
+        dialog.grab_set()
+
+        fields = [
+            ('Product Name:', 'name'),
+            ('HSN Code:', 'hsn'),
+            ('Price:', 'price'),
+            ('GST Rate (%):', 'gst'),
+            ('Opening Stock:', 'stock'),
+            ('Min Stock Level:', 'min_stock')
+        ]
+
+        entries = {}
+        for label, key in fields:
+            tk.Label(dialog, text=label, font=self.fonts['normal'],
+                    bg=self.colors['white']).pack(pady=(15,5))
+            entry = tk.Entry(dialog, font=self.fonts['normal'])
+            entry.pack(fill='x', padx=20)
+            entries[key] = entry
+
+        def save():
+            try:
+                self.db.add_product(
+                    entries['name'].get(),
+                    entries['hsn'].get(),
+                    float(entries['price'].get() or 0),
+                    float(entries['gst'].get() or 18),
+                    int(entries['stock'].get() or 0),
+                    int(entries['min_stock'].get() or 10),
+                    user=self.current_user
+                )
+                messagebox.showinfo("Success", "Product added!")
+                dialog.destroy()
+                self.show_products()
+            except Exception as e:
+                messagebox.showerror("Error", str(e))
+
+        tk.Button(dialog, text="Save", font=self.fonts['normal'],
+                 bg=self.colors['success'], fg=self.colors['white'],
+                 relief='flat', cursor='hand2', padx=30, pady=10,
+                 command=save).pack(pady=30)
+
+    def import_products_dialog(self):
+        from tkinter import filedialog
+        path = filedialog.askopenfilename(
+            title="Import Products",
+            filetypes=[("Product lists", "*.csv *.xlsx"), ("CSV File", "*.csv"), ("Excel Workbook", "*.xlsx")])
+        if not path:
+            return
+
+        dialog = tk.Toplevel(self.root)
+        dialog.title("Importing")
+        dialog.geometry("360x120")
+        dialog.configure(bg=self.colors['white'])
+        dialog.transient(self.root)
+
+        status = tk.Label(dialog, text="Reading file...", font=self.fonts['normal'],
+                          bg=self.colors['white'])
+        status.pack(pady=40)
+
+        def finished(result):
+            dialog.destroy()
+            message = (f"{result['inserted']:,} products added, {result['updated']:,} updated "
+                       f"in {result['seconds']:.1f} s")
+            if result['errors']:
+                lines = '\n'.join(f"Line {line}: {error}" for line, error in result['errors'][:10])
+                more = len(result['errors']) - 10
+                message += (f"\n\n{result['rejected']:,} rows were skipped:\n{lines}"
+                            + (f"\n...and {more:,} more" if more > 0 else ""))
+            messagebox.showinfo("Import", message)
+
+        def failed(error):
+            dialog.destroy()
+            messagebox.showerror("Error", f"Import failed: {error}")
+
+        self.queries.submit(
+            import_products, self.db, path, self.current_user,
+            lambda rows: self.queries.post(lambda: status.config(text=f"{rows:,} rows imported")),
+            on_done=finished, on_error=failed, screen=False)
+
+    def show_stock(self):
+        self.show_screen('stock', self.build_stock)
+
+    def build_stock(self, screen):
+        # Products by days of stock left at their current sales rate. The
+        # stored reorder points show straight away; they are brought up to
+        # date in the background and the table reloaded if anything changed.
+        header = tk.Frame(screen, bg=self.colors['white'],
+                         highlightbackground=self.colors['border'],
+                         highlightthickness=1, height=80)
+        header.pack(fill='x', pady=(0,20))
+        header.pack_propagate(False)
+
+        tk.Label(header, text="Stock", font=self.fonts['title'],
+                bg=self.colors['white'], fg=self.colors['primary']).pack(side='left', padx=30, pady=20)
+
+        status = tk.Label(header, font=self.fonts['small'],
+                          bg=self.colors['white'], fg=self.colors['secondary'])
+        status.pack(side='right', padx=30)
+
+        table_frame = tk.Frame(screen, bg=self.colors['white'],
+                              highlightbackground=self.colors['border'],
+                              highlightthickness=1)
+        table_frame.pack(fill='both', expand=True, pady=10)
+
+        columns = ('Name', 'Stock', 'Sold/Day', 'Days Left', 'Reorder At', 'Order Qty')
+        tree = ttk.Treeview(table_frame, columns=columns, show='headings', height=20)
+
+        for col in columns:
+            tree.heading(col, text=col)
+            tree.column(col, width=110)
+
+        tree.column('Name', width=250)
+
+        scrollbar = ttk.Scrollbar(table_frame, orient='vertical', command=tree.yview)
+        scrollbar.pack(side='right', fill='y')
+        tree.pack(fill='both', expand=True, padx=20, pady=20)
+
+        # Out within the lead time, at or below the reorder point, or fine
+        tree.tag_configure('urgent', foreground=self.colors['danger'])
+        tree.tag_configure('low', foreground=self.colors['warning'])
+        tree.tag_configure('normal', foreground=self.colors['success'])
+
+        def tags(row):
+            name, stock, velocity, cover, reorder_at, qty = row
+            if cover != '-' and float(cover) < REORDER_LEAD_DAYS:
+                return ('urgent',)
+            return ('low' if stock <= float(reorder_at) else 'normal',)
+
+        table = PagedTable(tree, scrollbar, self.db,
+                           columns="""name, stock, printf('%.2f', velocity),
+                                      COALESCE(printf('%.1f', days_of_cover), '-'),
+                                      printf('%.1f', reorder_point), order_qty""",
+                           table="stock_reorder", keys=('urgency', 'id'),
+                           tags=tags, queries=self.queries)
+
+        def refreshed(count):
+            status.config(text="")
+            if count:
+                table.reload()
+
+        def refresh(reload=True):
+            status.config(text="Updating sales rates...")
+            if reload:
+                table.reload()
+            self.queries.submit(refresh_reorder, self.db, on_done=refreshed)
+
+        refresh(reload=False)
+        return refresh
+
+    def show_expenses(self):
+        self.show_screen('expenses', self.build_expenses)
+
+    def build_expenses(self, screen):
+        header = tk.Frame(screen, bg=self.colors['white'],
+                         highlightbackground=self.colors['border'],
+                         highlightthickness=1, height=80)
+        header.pack(fill='x', pady=(0,20))
+        header.pack_propagate(False)
+
+        tk.Label(header, text="Expenses", font=self.fonts['title'],
+                bg=self.colors['white'], fg=self.colors['primary']).pack(side='left', padx=30, pady=20)
+
+        tk.Button(header, text="+ Add Expense", font=self.fonts['normal'],
+                 bg=self.colors['danger'], fg=self.colors['white'],
+                 relief='flat', cursor='hand2',
+                 command=self.add_expense_dialog).pack(side='right', padx=30, pady=20)
+
+        # Expenses table
+        table_frame = tk.Frame(screen, bg=self.colors['white'],
+                              highlightbackground=self.colors['border'],
+                              highlightthickness=1)
+        table_frame.pack(fill='both', expand=True, pady=10)
+
+        columns = ('Date', 'Category', 'Amount', 'Description', 'Added By')
+        tree = ttk.Treeview(table_frame, columns=columns, show='headings', height=20)
+
+        for col in columns:
+            tree.heading(col, text=col)
+            tree.column(col, width=150)
+
+        tree.column('Description', width=300)
+
+        scrollbar = ttk.Scrollbar(table_frame, orient='vertical', command=tree.yview)
+        scrollbar.pack(side='right', fill='y')
+        tree.pack(fill='both', expand=True, padx=20, pady=20)
+
+        # Load expenses
+        table = PagedTable(tree, scrollbar, self.db, **EXPENSE_PAGE,
+                           queries=self.queries)
+        return table.reload
+
+    def add_expense_dialog(self):
+        dialog = tk.Toplevel(self.root)
+        dialog.title("Add Expense")
+        dialog.geometry("400x400")
+        dialog.configure(bg=self.colors['white'])
+        dialog.transient(self.root)
+        dialog.grab_set()
+
+        tk.Label(dialog, text="Category:", font=self.fonts['normal'],
+                bg=self.colors['white']).pack(pady=(20,5))
+
+        categories = ['Rent', 'Salary', 'Electricity', 'Transport', 'Marketing', 'Other']
+        cat_var = tk.StringVar()
+        ttk.Combobox(dialog, textvariable=cat_var, values=categories,
+                    font=self.fonts['normal'], state='readonly').pack(fill='x', padx=20)
+
+        tk.Label(dialog, text="Amount:", font=self.fonts['normal'],
+                bg=self.colors['white']).pack(pady=(15,5))
+        amount_var = tk.StringVar()
+        tk.Entry(dialog, textvariable=amount_var, font=self.fonts['normal']).pack(fill='x', padx=20)
+
+        tk.Label(dialog, text="Description:", font=self.fonts['normal'],
+                bg=self.colors['white']).pack(pady=(15,5))
+        desc_text = tk.Text(dialog, font=self.fonts['normal'], height=5)
+        desc_text.pack(fill='x', padx=20)
+
+        def save():
+            try:
+                self.db.execute("""
+                    INSERT INTO expenses (category, amount, description, created_by)
+                    VALUES (?, ?, ?, ?)
+                """, (cat_var.get(), float(amount_var.get()), 
+                     desc_text.get('1.0', 'end'), self.current_user))
+                messagebox.showinfo("Success", "Expense added!")
+                dialog.destroy()
+                self.show_expenses()
+            except Exception as e:
+                messagebox.showerror("Error", str(e))
+
+        tk.Button(dialog, text="Save", font=self.fonts['normal'],
+                 bg=self.colors['danger'], fg=self.colors['white'],
+                 relief='flat', cursor='hand2', padx=30, pady=10,
+                 command=save).pack(pady=30)
+
+def encode_cursor(key):
+    return base64.urlsafe_b64encode(json.dumps(list(key)).encode()).decode()
+
+
+def decode_cursor(cursor):
+    return json.loads(base64.urlsafe_b64decode(cursor.encode())) if cursor else None
+
+
+def create_api(db=None):
+    # JSON API over the same Database the desktop app uses, for counters
+    # and web front ends billing against one store database. Served with
+    # `gunicorn app:app`; every worker process gets its own connection pools.
+    import gzip
+    import hashlib
+    from flask import Flask, Response, abort, g, jsonify, request
+    from werkzeug.exceptions import HTTPException
+
+    api = Flask(__name__)
+    api.config['SECRET_KEY'] = os.environ.get('SECRET_KEY', os.urandom(16).hex())
+    db = db or Database(profile=os.environ.get('SEIZE_DB_PROFILE', 'server'))
+
+    def records(columns, rows):
+        return [dict(zip(columns, row)) for row in rows]
+
+    def page(columns, table, keys, where='1', params=(), descending=False):
+        # Keyset pagination: `next` is an opaque cursor for the following page
+        try:
+            limit = min(max(int(request.args.get('limit', PAGE_SIZE)), 1), PAGE_MAX_ROWS)
+            after = decode_cursor(request.args.get('after'))
+        except ValueError:
+            abort(400, "Invalid limit or cursor")
+        # A cursor holds one plain value per key column
+        if after is not None and (not isinstance(after, list) or len(after) != len(keys)
+                                  or not all(isinstance(value, (str, int, float)) for value in after)):
+            abort(400, "Invalid cursor")
+        rows = keyset_page(db, ', '.join(columns), table, keys, where, params,
+                           after, descending, limit)
+        width = len(keys)
+        return jsonify({
+            'items': records(columns, [row[:-width] for row in rows]),
+            'next': encode_cursor(rows[-1][-width:]) if len(rows) == limit else None,
+        })
+
+    def day(value):
+        # Request dates must be YYYY-MM-DD, as they key the daily rollups
+        if not value:
+            return date.today()
+        try:
+            if isinstance(value, str) and ISO_DATE.fullmatch(value):
+                return date.fromisoformat(value)
+        except ValueError:
+            pass
+        abort(400, "date must be YYYY-MM-DD")
+
+    def amount(value, field):
+        # Money, rates and stock from a request: finite and not negative
+        try:
+            value = float(value)
+        except (TypeError, ValueError):
+            abort(400, f"{field} must be a number")
+        if not math.isfinite(value) or value < 0:
+            abort(400, f"{field} must be a finite number, at least 0")
+        return value
+
+    def text(data, field, default=''):
+        value = data.get(field, default)
+        if not isinstance(value, str):
+            abort(400, f"{field} must be a string")
+        return value
+
+    @api.before_request
+    def authenticate():
+        auth = request.authorization
+        user = auth and db.fetchone("SELECT username, role FROM users WHERE username=? AND password=?",
+                                    (auth.username, auth.password))
+        if not user:
+            return Response("Login required", 401, {'WWW-Authenticate': 'Basic realm="SEIZE"'})
+        g.user = user[0]
+
+    @api.errorhandler(HTTPException)
+    def error(e):
+        return jsonify({'error': e.description}), e.code
+
+    @api.errorhandler(sqlite3.IntegrityError)
+    def conflict(e):
+        # e.g. a date in a closed accounting period
+        return jsonify({'error': str(e)}), 409
+
+    @api.after_request
+    def compress(response):
+        # Read endpoints get a weak ETag over the JSON body, so a client that
+        # already has it receives 304; the tag survives gzip as it is weak
+        if request.method == 'GET' and response.status_code == 200 and response.is_json:
+            response.set_etag(hashlib.sha1(response.get_data()).hexdigest(), weak=True)
+            response.make_conditional(request)
+        if (response.status_code == 200 and response.is_json
+                and 'gzip' in request.headers.get('Accept-Encoding', '')
+                and response.content_length and response.content_length >= API_GZIP_MIN_BYTES
+                and 'Content-Encoding' not in response.headers):
+            response.set_data(gzip.compress(response.get_data(), compresslevel=6))
+            response.headers['Content-Encoding'] = 'gzip'
+        response.vary.add('Accept-Encoding')
+        return response
+
+    @api.get('/api/dashboard')
+    def dashboard():
+        stats = dict(db.dashboard_stats())
+        stats['recent_invoices'] = records(
+            ('invoice_no', 'customer_name', 'date', 'total', 'status'), stats['recent_invoices'])
+        return jsonify(stats)
+
+    invoice_columns = ('invoice_no', 'customer_name', 'date', 'total', 'status')
+
+    @api.get('/api/invoices')
+    def list_invoices():
+        from_date = request.args.get('from', '0000-01-01')
+        to_date = request.args.get('to', '9999-12-31')
+        search = request.args.get('q', '').strip()
+        if search:
+            # Ranked and capped, so returned in one go like the desktop search
+            return jsonify({'items': records(invoice_columns,
+                                             db.search_invoices(search, from_date, to_date)),
+                            'next': None})
+        return page(invoice_columns, 'invoices', ('date', 'id'),
+                    INVOICE_RANGE, (from_date, to_date), descending=True)
+
+    @api.get('/api/invoices/<invoice_no>')
+    def get_invoice(invoice_no):
+        columns, rows = db.fetch_table("""
+            SELECT id, invoice_no, customer_name, customer_phone, customer_gstin, date,
+                   subtotal, gst_amount, total, status, created_by, created_at
+            FROM invoices WHERE invoice_no=?
+        """, (invoice_no,))
+        if not rows:
+            abort(404)
+        invoice = records(columns, rows)[0]
+        invoice['items'] = records(*db.fetch_table("""
+            SELECT product_id, product_name, hsn_code, quantity, price, gst_rate, total
+            FROM invoice_items WHERE invoice_id=? ORDER BY id
+        """, (invoice['id'],)))
+        return jsonify(invoice)
+
+    @api.post('/api/invoices')
+    def create_invoice():
+        data = request.get_json(silent=True)
+        if not isinstance(data, dict) or not str(data.get('customer_name', '')).strip():
+            abort(400, "customer_name and items are required")
+        items = data.get('items')
+        if not isinstance(items, list) or not items or not all(isinstance(line, dict) for line in items):
+            abort(400, "items must be a non-empty list of objects")
+        invoice_date = day(data.get('date'))
+
+        # Lines are priced from the product unless a price is given
+        draft = InvoiceDraft()
+        for index, line in enumerate(items):
+            product_id = line.get('product_id')
+            product = isinstance(product_id, (int, str)) and db.fetchone(
+                "SELECT id, name, hsn_code, price, gst_rate FROM products WHERE id=?", (product_id,))
+            if not product:
+                abort(400, f"Unknown product {product_id}")
+            try:
+                qty = int(line.get('quantity', 1))
+                price = float(line.get('price', product[3]))
+            except (TypeError, ValueError):
+                abort(400, "Invalid quantity or price")
+            if qty < 1 or not 0 <= price < float('inf'):
+                abort(400, f"Quantity must be at least 1 and price at least 0 (line {index + 1})")
+            draft.add(index, InvoiceLine(product[0], product[1], qty, price, product[4], product[2]))
+
+        totals = draft.totals()
+        invoice_id, invoice_no = db.save_invoice({
+            'customer_name': data['customer_name'],
+            'customer_phone': data.get('customer_phone', ''),
+            'customer_gstin': data.get('customer_gstin', ''),
+            'date': invoice_date,
+            **totals,
+            'status': data.get('status', 'pending'),
+            'created_by': g.user,
+        }, draft.items())
+        return jsonify({'id': invoice_id, 'invoice_no': invoice_no, 'total': totals['total']}), 201
+
+    product_columns = ('id', 'name', 'hsn_code', 'price', 'gst_rate', 'stock', 'min_stock')
+
+    @api.get('/api/products')
+    def list_products():
+        search = request.args.get('q', '').strip()
+        if search:
+            return jsonify({'items': records(product_columns[:6], db.catalog.search(search, limit=50)),
+                            'next': None})
+        return page(product_columns, 'products', ('name', 'id'))
+
+    @api.post('/api/products')
+    def create_product():
+        data = request.get_json(silent=True)
+        if not isinstance(data, dict) or not text(data, 'name').strip():
+            abort(400, "name is required")
+        stock, min_stock = (amount(data.get(field, default), field)
+                            for field, default in (('stock', 0), ('min_stock', 10)))
+        if not (stock.is_integer() and min_stock.is_integer()):
+            abort(400, "stock and min_stock must be whole numbers")
+        product_id = db.add_product(data['name'], text(data, 'hsn_code'),
+                                    amount(data.get('price', 0), 'price'),
+                                    amount(data.get('gst_rate', 18), 'gst_rate'),
+                                    int(stock), int(min_stock), g.user)
+        return jsonify({'id': product_id}), 201
+
+    expense_columns = ('id', 'date', 'category', 'amount', 'description', 'created_by')
+
+    @api.get('/api/expenses')
+    def list_expenses():
+        return page(expense_columns, 'expenses', ('date', 'id'), "date BETWEEN ? AND ?",
+                    (request.args.get('from', '0000-01-01'), request.args.get('to', '9999-12-31')),
+                    descending=True)
+
+    @api.post('/api/expenses')
+    def create_expense():
+        data = request.get_json(silent=True)
+        if not isinstance(data, dict) or 'amount' not in data:
+            abort(400, "amount is required")
+        cursor = db.execute("""
+            INSERT INTO expenses (category, amount, description, date, created_by)
+            VALUES (?, ?, ?, ?, ?)
+        """, (text(data, 'category', 'Other'), amount(data['amount'], 'amount'),
+              text(data, 'description'), day(data.get('date')), g.user))
+        return jsonify({'id': cursor.lastrowid}), 201
+
+    return api
+
+
+def __getattr__(name):
+    # `gunicorn app:app` looks up app.app; the Flask app is only built then,
+    # so the desktop app never imports Flask
+    if name == 'app':
+        global app
+        app = create_api()
+        return app
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def rebuild_rollups(args):
+    db = Database()
+    db.rebuild_rollups()
+    print("Rollups rebuilt")
+
+
+def check_rollups(args):
+    db = Database()
+    mismatches = db.check_rollups()
+    for table, key, column, rollup, raw in mismatches:
+        print(f"{table} {key}: {column} rollup={rollup} raw={raw}")
+    if mismatches:
+        raise SystemExit(f"{len(mismatches)} rollup values differ from the raw tables")
+    print("Rollups match the raw tables")
+
+
+def check_stock(args):
+    db = Database()
+    mismatches = db.check_stock()
+    for product_id, name, stock, balance in mismatches:
+        print(f"product {product_id} {name}: stock={stock} ledger={balance}")
+    if mismatches:
+        raise SystemExit(f"{len(mismatches)} products differ from the stock ledger")
+    print("Stock matches the ledger")
+
+
+def import_products_cmd(args):
+    db = Database()
+    result = import_products(db, args.file, user='import', sheet=args.sheet,
+                             progress=lambda rows: print(f"\r{rows:,} rows read", end='', flush=True))
+    print(f"\n{result['inserted']:,} added, {result['updated']:,} updated, "
+          f"{result['rejected']:,} rows rejected in {result['seconds']:.1f} s")
+    for line, message in result['errors'][:20]:
+        print(f"  line {line}: {message}")
+    if args.errors and result['errors']:
+        with open(args.errors, 'w', newline='', encoding='utf-8') as f:
+            writer = csv.writer(f)
+            writer.writerow(['line', 'error'])
+            writer.writerows(result['errors'])
+        print(f"All rejected rows written to {args.errors}")
+
+
+def import_invoices_cmd(args):
+    db = Database()
+    result = import_legacy_invoices(db, args.headers, args.lines, args.prefix,
+                                    progress=lambda stage, rows: print(f"\r{stage}: {rows:,}", end='  ', flush=True))
+    print(f"\n{result['headers']:,} invoice rows and {result['lines']:,} line rows read")
+    for kind, count in sorted(result['issues'].items()):
+        print(f"  {kind}: {count:,}")
+    if args.report:
+        source = f"{os.path.abspath(args.headers)}|{os.path.abspath(args.lines)}"
+        export_table(db, """
+            SELECT file_line, legacy_no, kind, message, legacy_value, computed_value
+            FROM legacy_import_issues WHERE source=? ORDER BY id
+        """, args.report, (source,))
+        print(f"Issues written to {args.report}")
+
+
+def gst_return_cmd(args):
+    tables = gst_return(Database(), args.from_date, args.to_date)
+    columns, rows = tables['rates']
+    print(' '.join(f"{column:>16}" for column in columns))
+    for row in rows:
+        print(' '.join(f"{value:>16}" for value in row))
+    if args.out:
+        export_tables(tables, args.out)
+        print(f"B2B, B2CS, HSN and rate-wise tables written to {args.out}")
+
+
+def close_period_cmd(args):
+    db = Database()
+    if args.reopen:
+        if not db.reopen_period(args.month):
+            raise SystemExit(f"{args.month} was not closed")
+        print(f"{args.month} reopened")
+        return
+    try:
+        db.close_period(args.month, 'cli')
+    except ValueError as e:
+        raise SystemExit(str(e))
+    label, start, end = pnl_period('month', f"{args.month}-01")
+    result = db.profit_loss(start, end)
+    print(f"{label} closed: sales {result['sales']:,.2f}, expenses {result['expenses']:,.2f}, "
+          f"profit {result['profit']:,.2f}")
+
+
+def reorder_cmd(args):
+    db = Database()
+    count = refresh_reorder(db, full=args.full)
+    print(f"{count:,} products recomputed")
+    rows = db.fetchall("""
+        SELECT name, stock, velocity, days_of_cover, reorder_point, order_qty
+        FROM stock_reorder WHERE stock <= reorder_point
+        ORDER BY urgency, id LIMIT ?
+    """, (args.top,))
+    for name, stock, velocity, cover, reorder_point, qty in rows:
+        cover = f"{cover:.1f} days" if cover is not None else "no sales"
+        print(f"{name:<40} stock {stock:>6}  {velocity:>7.2f}/day  {cover:>12}  "
+              f"reorder at {reorder_point:>7.1f}  order {qty}")
+
+
+def batch_pdf(args):
+    def progress(done, total):
+        print(f"\r{done}/{total} invoices", end='', flush=True)
+
+    result = batch_pdfs(DB_PATH, args.out, args.from_date, args.to_date, args.status,
+                        args.workers, args.merge, progress)
+    if result['rendered']:
+        print()
+    print(f"{result['rendered']} rendered, {result['skipped']} already done, "
+          f"{result['per_second']:.1f} invoices/s on {result['workers']} workers")
+    if args.merge:
+        print(f"Merged {result['invoices']} invoices into {args.merge}")
+
+
+def run_app(args):
+    root = tk.Tk()
+    SeizeBillingApp(root)
+    if UI_TIMING or args.quit_after_paint:
+        # Draw the login screen now rather than from the main loop
+        root.update()
+        print(f"first paint: {(time.perf_counter() - IMPORTED) * 1000:.1f} ms after import", flush=True)
+    if args.quit_after_paint:
+        root.destroy()
+        return
+    root.mainloop()
+
+
+def main(argv=None):
+    import argparse
+    parser = argparse.ArgumentParser(description="SEIZE - Billing & Inventory Management")
+    parser.set_defaults(func=run_app)
+    parser.add_argument('--quit-after-paint', action='store_true',
+                        help="close as soon as the login screen is drawn (for startup timing)")
+    sub = parser.add_subparsers(dest='command')
+
+    sub.add_parser('rebuild-rollups', help="recompute daily sales/expense rollups from the raw tables"
+                   ).set_defaults(func=rebuild_rollups)
+    sub.add_parser('check-rollups', help="compare daily rollups against the raw tables"
+                   ).set_defaults(func=check_rollups)
+    sub.add_parser('check-stock', help="compare product stock against the movement ledger"
+                   ).set_defaults(func=check_stock)
+
+    imp = sub.add_parser('import-products', help="add or update products from a CSV or Excel file")
+    imp.add_argument('file')
+    imp.add_argument('--sheet', help="Excel sheet name (default: the first)")
+    imp.add_argument('--errors', help="write every rejected row to this CSV")
+    imp.set_defaults(func=import_products_cmd)
+
+    inv = sub.add_parser('import-invoices', help="load invoice history exported from the old system; "
+                         "run again to resume")
+    inv.add_argument('headers', help="CSV of invoice headers")
+    inv.add_argument('lines', help="CSV of invoice lines")
+    inv.add_argument('--prefix', default='', help="prepended to every legacy invoice number")
+    inv.add_argument('--report', help="write the import issues to this CSV or Excel file")
+    inv.set_defaults(func=import_invoices_cmd)
+
+    gst = sub.add_parser('gst-return', help="GSTR-1 style GST tables for a period")
+    gst.add_argument('--from', dest='from_date', required=True, help="YYYY-MM-DD")
+    gst.add_argument('--to', dest='to_date', required=True, help="YYYY-MM-DD")
+    gst.add_argument('--out', help="write every table to this .xlsx (or <name>-<table>.csv files)")
+    gst.set_defaults(func=gst_return_cmd)
+
+    close = sub.add_parser('close-period', help="store a month's P&L and lock its invoices and expenses")
+    close.add_argument('month', help="YYYY-MM")
+    close.add_argument('--reopen', action='store_true', help="unlock a closed month instead")
+    close.set_defaults(func=close_period_cmd)
+
+    reorder = sub.add_parser('reorder', help="update sales rates and list products to reorder")
+    reorder.add_argument('--full', action='store_true', help="recompute every product")
+    reorder.add_argument('--top', type=int, default=20, help="products listed, most urgent first")
+    reorder.set_defaults(func=reorder_cmd)
+
+    pdf = sub.add_parser('batch-pdf', help="render invoice PDFs for a date range")
+    pdf.add_argument('--from', dest='from_date', required=True, help="YYYY-MM-DD")
+    pdf.add_argument('--to', dest='to_date', required=True, help="YYYY-MM-DD")
+    pdf.add_argument('--status', help="only invoices with this status, e.g. paid")
+    pdf.add_argument('--out', default=PDF_DIR, help="directory for the PDFs")
+    pdf.add_argument('--merge', help="also combine them into this PDF file")
+    pdf.add_argument('--workers', type=int, help="worker processes (default: CPU count)")
+    pdf.set_defaults(func=batch_pdf)
+
+    args = parser.parse_args(argv)
+    args.func(args)
+
+
+# Run Application
+if __name__ == "__main__":
+    main()
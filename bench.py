@@ -0,0 +1,708 @@
+# Benchmarks for the SEIZE database hot paths.
+#
+#   python bench.py generate --db bench.db --invoices 2000000 --items 6 --skew 1.0
+#   python bench.py profiles --db bench.db --profiles default,terminal
+#   python bench.py save --db bench.db --lines 1 50 500
+#   python bench.py plans --db bench.db
+#   python bench.py search --db bench.db
+#   python bench.py export --rows 1000000 --formats csv xlsx
+#   python bench.py pdf --db bench.db --count 200
+#   python bench.py batch-pdf --db bench.db --days 30 --workers 1 2 4 8
+#   python bench.py gst --db bench.db --days 91
+#   python bench.py reorder --db bench.db
+#   python bench.py startup --db bench.db --json startup.json
+#   python bench.py suite --db bench.db --json suite.json --baseline main.json
+#
+# A few million invoices with ~6 items each gives a multi-GB database, which
+# is what the store terminals end up with after a few years.
+
+import argparse
+import csv
+import io
+import json
+import os
+import random
+import sqlite3
+import subprocess
+import sys
+import tempfile
+import statistics
+import time
+from datetime import date, timedelta
+
+from app import (Database, DASHBOARD_SQL, DB_PROFILES, INVOICE_PAGE, INVOICE_RANGE, PAGE_SIZE,
+                 PRODUCT_PAGE, RECENT_INVOICES_SQL, SALES_REPORT_SQL, InvoicePDFRenderer, batch_pdfs,
+                 export_table, gst_return, hot_queries, keyset_page, refresh_reorder)
+
+CUSTOMERS = ['Walk-in', 'Sharma Traders', 'Gupta & Sons', 'Patel Stores',
+             'Reddy Enterprises', 'Khan Brothers', 'Iyer Agencies', 'Singh Mart']
+CATEGORIES = ['Rent', 'Salary', 'Electricity', 'Transport', 'Marketing', 'Other']
+GST_RATES = [0, 5, 12, 18, 28]
+# Most customers are unregistered; the rest are spread over a few states
+CUSTOMER_GSTINS = ['', '', '', '29AABCS1234F1Z5', '29AAFCG5678K1Z2', '27AAACP4321L1Z9',
+                   '33AADCR8765M1Z1', '07AAGCK2468N1Z7']
+
+
+def zipf_weights(count, skew):
+    # Cumulative rank**-skew weights for rng.choices: a few best sellers and
+    # regulars take most of the volume, as at a real counter. skew 0 is uniform.
+    total, weights = 0.0, []
+    for rank in range(1, count + 1):
+        total += rank ** -skew
+        weights.append(total)
+    return weights
+
+
+def generate(path, products=5000, invoices=100000, items=6, expenses=20000,
+             days=1095, seed=42, batch=10000, customers=500, skew=1.0):
+    rng = random.Random(seed)
+    Database(path, profile='default').close()
+
+    conn = sqlite3.connect(path)
+    conn.execute("PRAGMA journal_mode=OFF")
+    conn.execute("PRAGMA synchronous=OFF")
+
+    start = conn.execute("SELECT COUNT(*) FROM products").fetchone()[0]
+    last_product = conn.execute("SELECT COALESCE(MAX(id), 0) FROM products").fetchone()[0]
+    # Stock only ever moves through stock_movements, as in the app: products
+    # start at zero and get their opening balance once the sales are known
+    conn.executemany("""
+        INSERT INTO products (name, hsn_code, price, gst_rate, stock, min_stock)
+        VALUES (?, ?, ?, ?, 0, ?)
+    """, ((f"Product {start + i:06d}", f"{rng.randint(1000, 9999)}",
+           round(rng.uniform(10, 5000), 2), rng.choice(GST_RATES), 10) for i in range(products)))
+    catalog = conn.execute("SELECT id, name, price, gst_rate, hsn_code FROM products").fetchall()
+    # Popularity rank is independent of product id and name
+    rng.shuffle(catalog)
+    catalog_weights = zipf_weights(len(catalog), skew)
+
+    # Walk-in sales first, then the named regulars, then the long tail
+    buyers = [('Walk-in', '', '')]
+    for i in range(1, max(customers, 1)):
+        name = CUSTOMERS[i] if i < len(CUSTOMERS) else f"Customer {i:05d}"
+        buyers.append((name, f"98{rng.randint(10000000, 99999999)}", rng.choice(CUSTOMER_GSTINS)))
+    buyer_weights = zipf_weights(len(buyers), skew)
+
+    first_day = date.today() - timedelta(days=days)
+    next_id = (conn.execute("SELECT MAX(id) FROM invoices").fetchone()[0] or 0) + 1
+
+    for offset in range(0, invoices, batch):
+        headers, lines, movements = [], [], []
+        for inv_id in range(next_id + offset, next_id + min(offset + batch, invoices)):
+            day = first_day + timedelta(days=(inv_id * days) // (next_id + invoices))
+            created_at = f"{day} {rng.randint(9, 20):02d}:{rng.randint(0, 59):02d}:00"
+            subtotal = gst = 0.0
+            for prod in rng.choices(catalog, cum_weights=catalog_weights,
+                                    k=rng.randint(1, items * 2 - 1)):
+                qty = rng.randint(1, 10)
+                amount = qty * prod[2]
+                tax = amount * (prod[3] / 100)
+                subtotal += amount
+                gst += tax
+                lines.append((inv_id, prod[0], prod[1], qty, prod[2], prod[3], amount + tax, prod[4]))
+                # The sale movement Database.save_invoice writes; cancelling
+                # an invoice leaves it in place
+                movements.append((prod[0], -qty, inv_id, created_at))
+            buyer = rng.choices(buyers, cum_weights=buyer_weights)[0]
+            headers.append((inv_id, f"SEZ{inv_id:04d}", *buyer, day,
+                            subtotal, gst, subtotal + gst,
+                            rng.choice(['paid', 'paid', 'pending', 'cancelled']),
+                            'admin', created_at))
+        # Lines before headers: the search index then picks up each invoice's
+        # products once on header insert instead of once per line
+        conn.executemany("""
+            INSERT INTO invoice_items (invoice_id, product_id, product_name, quantity,
+                                       price, gst_rate, total, hsn_code)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+        """, lines)
+        conn.executemany("""
+            INSERT INTO invoices (id, invoice_no, customer_name, customer_phone,
+                                  customer_gstin, date, subtotal, gst_amount, total,
+                                  status, created_by, created_at)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        """, headers)
+        conn.executemany("""
+            INSERT INTO stock_movements (product_id, qty_delta, reason, invoice_id, created_by, created_at)
+            VALUES (?, ?, 'sale', ?, 'admin', ?)
+        """, movements)
+        conn.commit()
+
+    # Opening stock for the new products covers what they sold and leaves
+    # 0-500 on the shelf; older products that sold out are restocked
+    balances = conn.execute("SELECT id, stock FROM products WHERE id > ? OR stock < 0",
+                            (last_product,)).fetchall()
+    conn.executemany("""
+        INSERT INTO stock_movements (product_id, qty_delta, reason, created_by, created_at)
+        VALUES (?, ?, ?, 'admin', ?)
+    """, [(product_id, rng.randint(0, 500) - stock,
+           *(('opening', f"{first_day} 08:00:00") if product_id > last_product
+             else ('import', f"{date.today()} 08:00:00")))
+          for product_id, stock in balances])
+
+    conn.executemany("""
+        INSERT INTO expenses (category, amount, description, date, created_by)
+        VALUES (?, ?, ?, ?, 'admin')
+    """, ((rng.choice(CATEGORIES), round(rng.uniform(100, 50000), 2), 'Synthetic',
+           first_day + timedelta(days=rng.randrange(days + 1))) for _ in range(expenses)))
+    conn.commit()
+    conn.close()
+
+    # Move the invoice number sequence past the numbers written above
+    db = Database(path, profile='default')
+    with db.transaction() as conn:
+        db.numbers.skip_issued(conn, [f"SEZ{next_id + invoices - 1:04d}"])
+    db.close()
+
+
+def timed(fn, repeat):
+    samples = []
+    for i in range(repeat):
+        start = time.perf_counter()
+        fn(i)
+        samples.append(time.perf_counter() - start)
+    return samples
+
+
+def summarize(samples):
+    samples = sorted(samples)
+
+    def percentile(q):
+        return samples[min(len(samples) - 1, int(len(samples) * q))] * 1000
+
+    return {
+        'n': len(samples),
+        'mean_ms': statistics.fmean(samples) * 1000,
+        'p50_ms': percentile(0.50),
+        'p90_ms': percentile(0.90),
+        'p95_ms': percentile(0.95),
+        'p99_ms': percentile(0.99),
+        'max_ms': samples[-1] * 1000,
+    }
+
+
+def invoice_lines(db, lines):
+    products = db.fetchall("SELECT id, name, price, gst_rate FROM products LIMIT ?", (lines,))
+    return [(product_id, name, 1, price, gst_rate, price * (1 + gst_rate / 100))
+            for product_id, name, price, gst_rate in products]
+
+
+def save_per_statement(db, invoice, items):
+    # The pre-transaction save path: one commit per statement
+    cursor = db.execute("""
+        INSERT INTO invoices (invoice_no, customer_name, customer_phone,
+                            customer_gstin, date, subtotal, gst_amount, total,
+                            status, created_by)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, 'pending', ?)
+    """, (invoice['invoice_no'], invoice['customer_name'], '', '', invoice['date'],
+          invoice['subtotal'], invoice['gst_amount'], invoice['total'], invoice['created_by']))
+    invoice_id = cursor.lastrowid
+    for item in items:
+        db.execute("""
+            INSERT INTO invoice_items (invoice_id, product_id, product_name, quantity,
+                                     price, gst_rate, total)
+            VALUES (?, ?, ?, ?, ?, ?, ?)
+        """, (invoice_id, *item))
+        db.execute("""
+            INSERT INTO stock_movements (product_id, qty_delta, reason, invoice_id)
+            VALUES (?, ?, 'sale', ?)
+        """, (item[0], -item[2], invoice_id))
+
+
+def bench_save_invoice(db, tag, repeat=50, lines=5, save=None):
+    save = save or db.save_invoice
+    items = invoice_lines(db, lines)
+    subtotal = sum(item[3] * item[2] for item in items)
+    total = sum(item[5] for item in items)
+
+    def run(i):
+        save({
+            'invoice_no': f"BENCH-{tag}-{i}",
+            'customer_name': 'Bench Customer',
+            'date': date.today(),
+            'subtotal': subtotal,
+            'gst_amount': total - subtotal,
+            'total': total,
+            'created_by': 'bench',
+        }, items)
+
+    try:
+        return summarize(timed(run, repeat))
+    finally:
+        for (invoice_id,) in db.fetchall("SELECT id FROM invoices WHERE invoice_no LIKE 'BENCH-%'"):
+            db.delete_invoice(invoice_id)
+
+
+def bench_dashboard(db, repeat=5):
+    results = {}
+    # Same statements the Dashboard screen runs
+    for name, query in [*DASHBOARD_SQL.items(), ('recent_invoices', RECENT_INVOICES_SQL)]:
+        params = (date.today(),) if '?' in query else ()
+        results[name] = summarize(timed(lambda i: db.fetchall(query, params), repeat))
+    db.cache.invalidate()
+    results['dashboard_cached'] = summarize(timed(lambda i: db.dashboard_stats(), repeat))
+    return results
+
+
+def print_results(profile, results):
+    print(f"\n[{profile}]")
+    for name, stats in results.items():
+        print(f"  {name:<18} p50 {stats['p50_ms']:9.2f} ms   p95 {stats['p95_ms']:9.2f} ms"
+              f"   max {stats['max_ms']:9.2f} ms   (n={stats['n']})")
+
+
+def cmd_generate(args):
+    start = time.perf_counter()
+    generate(args.db, products=args.products, invoices=args.invoices, items=args.items,
+             expenses=args.expenses, days=args.days, seed=args.seed,
+             customers=args.customers, skew=args.skew)
+    size = os.path.getsize(args.db) / 1024 ** 3
+    print(f"Generated {args.db} ({size:.2f} GB) in {time.perf_counter() - start:.1f}s")
+
+
+def cmd_profiles(args):
+    for profile in args.profiles.split(','):
+        db = Database(args.db, profile=profile)
+        results = {'save_invoice': bench_save_invoice(db, profile, repeat=args.repeat)}
+        results.update(bench_dashboard(db, repeat=args.repeat // 10 or 1))
+        print_results(profile, results)
+        for name, stats in db.pool_stats().items():
+            print(f"  pool {name:<13} checkouts {stats['checkouts']:6d}   "
+                  f"avg wait {stats['avg_wait_ms']:7.3f} ms   max wait {stats['max_wait_ms']:7.3f} ms")
+        db.close()
+
+
+def cmd_save(args):
+    db = Database(args.db, profile=args.profile)
+    for lines in args.lines:
+        results = {
+            'per_statement': bench_save_invoice(db, f'old{lines}', args.repeat, lines,
+                                                save=lambda inv, items: save_per_statement(db, inv, items)),
+            'transaction': bench_save_invoice(db, f'tx{lines}', args.repeat, lines),
+        }
+        print_results(f"{lines}-line invoice, {args.profile}", results)
+    db.close()
+
+
+def cmd_plans(args):
+    db = Database(args.db)
+    failed = 0
+    with db.reader() as conn:
+        for name, query, params, index in hot_queries():
+            plan = [row[3] for row in conn.execute("EXPLAIN QUERY PLAN " + query, params)]
+            ok = any(index in detail for detail in plan)
+            failed += not ok
+            print(f"{'ok  ' if ok else 'FAIL'} {name:<30} {' | '.join(plan)}")
+    db.close()
+    if failed:
+        raise SystemExit(f"{failed} hot queries are not using their index")
+
+
+def cmd_search(args):
+    db = Database(args.db)
+    start, end = date.today() - timedelta(days=args.days), date.today()
+    for term in args.terms:
+        results = {
+            'like': summarize(timed(lambda i: db.fetchall("""
+                SELECT invoice_no, customer_name, date, total, status
+                FROM invoices
+                WHERE date BETWEEN ? AND ? AND (invoice_no LIKE ? OR customer_name LIKE ?)
+                ORDER BY date DESC
+            """, (start, end, f'%{term}%', f'%{term}%')), args.repeat)),
+            'fts': summarize(timed(lambda i: db.search_invoices(term, start, end), args.repeat)),
+        }
+        print_results(f"search {term!r}", results)
+    db.close()
+
+
+def cmd_catalog(args):
+    db = Database(args.db)
+    start = time.perf_counter()
+    db.catalog.refresh(force=True)
+    print(f"Loaded {len(db.catalog.products)} products in {(time.perf_counter() - start) * 1000:.0f} ms")
+
+    rng = random.Random(args.seed)
+    names = [row[1] for row in db.catalog.products.values() if row[1]]
+    # Type each sampled name/fragment one key at a time, like the dialog does
+    keystrokes = []
+    for _ in range(args.samples):
+        name = rng.choice(names)
+        offset = rng.randrange(max(1, len(name) - 6)) if rng.random() < 0.5 else 0
+        fragment = name[offset:offset + 8]
+        keystrokes.extend(fragment[:i] for i in range(1, len(fragment) + 1))
+    results = {'keystroke': summarize(timed(lambda i: db.catalog.search(keystrokes[i]), len(keystrokes)))}
+    print_results(f"type-ahead over {len(names)} products", results)
+    db.close()
+
+
+# Report-shaped rows generated by SQLite itself, so the export benchmark needs
+# no particular database contents
+EXPORT_QUERY = """
+    WITH RECURSIVE n(i) AS (SELECT 1 UNION ALL SELECT i + 1 FROM n WHERE i < ?)
+    SELECT date('now', '-' || (i % 1095) || ' days') AS date,
+           'SEZ' || printf('%07d', i) AS invoice_no,
+           'Customer ' || (i % 5000) AS customer,
+           i % 50 + 1 AS quantity,
+           round((i % 100000) / 7.0, 2) AS total
+    FROM n
+"""
+
+
+def peak_rss_mb():
+    # Peak resident memory on Unix. Windows has no resource module, so there
+    # it is the Python heap peak from tracemalloc, traced from the first call
+    # on; that leaves out SQLite's own memory.
+    try:
+        import resource
+    except ImportError:
+        import tracemalloc
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+        return tracemalloc.get_traced_memory()[1] / (1024 * 1024)
+    # ru_maxrss is in KB on Linux and bytes on macOS
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024 if sys.platform == 'darwin' else 1024)
+
+
+def cmd_export(args):
+    db = Database(args.db)
+    out = tempfile.mkdtemp(prefix='seize-export-')
+    # Peak RSS only ever grows, so the streaming exports run first and the
+    # load-everything baseline last
+    cases = [(fmt, 'stream') for fmt in args.formats]
+    if args.baseline:
+        cases.append(('csv', 'fetchall'))
+    for fmt, mode in cases:
+        path = os.path.join(out, f"report-{mode}.{fmt}")
+        before = peak_rss_mb()
+        start = time.perf_counter()
+        if mode == 'stream':
+            rows = export_table(db, EXPORT_QUERY, path, (args.rows,))
+        else:
+            columns, data = db.fetch_table(EXPORT_QUERY, (args.rows,))
+            with open(path, 'w', newline='', encoding='utf-8-sig') as f:
+                writer = csv.writer(f)
+                writer.writerow(columns)
+                writer.writerows(data)
+            rows = len(data)
+            del data
+        elapsed = time.perf_counter() - start
+        print(f"  {fmt:5} {mode:9} {rows:>10,} rows  {rows / elapsed:>10,.0f} rows/s  "
+              f"peak memory {peak_rss_mb():7.1f} MB (+{peak_rss_mb() - before:.1f})  "
+              f"{os.path.getsize(path) / 1e6:7.1f} MB file")
+        os.remove(path)
+    os.rmdir(out)
+    db.close()
+
+
+def cmd_pdf(args):
+    db = Database(args.db)
+    renderer = InvoicePDFRenderer(db)
+    ids = [row[0] for row in db.fetchall("""
+        SELECT invoice_id FROM invoice_items
+        GROUP BY invoice_id HAVING COUNT(*) BETWEEN ? AND ?
+        ORDER BY invoice_id DESC LIMIT ?
+    """, (args.min_lines, args.max_lines, args.count + 1))]
+    if not ids:
+        raise SystemExit("No invoices with that many lines; run generate first")
+
+    def render(i):
+        out = io.BytesIO()
+        renderer.render(ids[i], out)
+        return out
+
+    # The first invoice registers fonts and builds the template
+    start = time.perf_counter()
+    size = len(render(0).getvalue())
+    cold = (time.perf_counter() - start) * 1000
+    ids = ids[1:] or ids
+    results = {'warm': summarize(timed(lambda i: render(i % len(ids)), len(ids)))}
+    print(f"first invoice {cold:.1f} ms ({size / 1024:.0f} KB), font {renderer.load_fonts()[0]}")
+    print_results(f"invoice PDF, {args.min_lines}-{args.max_lines} lines", results)
+    db.close()
+
+
+def cmd_batch_pdf(args):
+    start, end = date.today() - timedelta(days=args.days), date.today()
+    base = None
+    for workers in args.workers:
+        out = tempfile.mkdtemp(prefix='seize-pdf-')
+        result = batch_pdfs(args.db, out, start, end, workers=workers)
+        base = base or result['per_second'] / workers
+        print(f"  {workers:3} workers  {result['rendered']:7,} invoices  "
+              f"{result['seconds']:7.1f} s  {result['per_second']:8.1f}/s  "
+              f"scaling {result['per_second'] / base:4.1f}x")
+        for name in os.listdir(out):
+            os.remove(os.path.join(out, name))
+        os.rmdir(out)
+
+
+def cmd_gst(args):
+    db = Database(args.db)
+    start, end = date.today() - timedelta(days=args.days), date.today()
+    lines = db.fetchone("""
+        SELECT COUNT(*) FROM invoices i JOIN invoice_items ii ON ii.invoice_id = i.id
+        WHERE i.date BETWEEN ? AND ? AND i.status != 'cancelled'
+    """, (start, end))[0]
+    tables = {}
+
+    def run(i):
+        tables.update(gst_return(db, start, end))
+
+    results = {'gst_return': summarize(timed(run, args.repeat))}
+    print(f"{lines:,} invoice lines over {args.days} days: "
+          + ", ".join(f"{name} {len(rows):,} rows" for name, (columns, rows) in tables.items()))
+    print_results("GST return", results)
+    db.close()
+
+
+def cmd_reorder(args):
+    # Full (first run of the day) and incremental refreshes, then the Stock
+    # screen's pages. Build a large catalog with `generate --products 100000`.
+    db = Database(args.db)
+    skus = db.fetchone("SELECT COUNT(*) FROM products")[0]
+    product_id = db.fetchone("SELECT MIN(id) FROM products")[0]
+    columns = "name, stock, velocity, days_of_cover, reorder_point, order_qty"
+
+    def touch_one(i):
+        db.execute("""
+            INSERT INTO stock_movements (product_id, qty_delta, reason, created_by)
+            VALUES (?, 1, 'import', 'bench')
+        """, (product_id,))
+        refresh_reorder(db)
+
+    def page_through(i):
+        after = None
+        for page in range(args.pages):
+            rows = keyset_page(db, columns, 'stock_reorder', ('urgency', 'id'), '1', (),
+                               after, False, 200)
+            after = rows[-1][-2:] if rows else None
+
+    results = {
+        'full refresh': summarize(timed(lambda i: refresh_reorder(db, full=True), args.repeat)),
+        'incremental': summarize(timed(touch_one, args.repeat)),
+        'first page': summarize(timed(
+            lambda i: keyset_page(db, columns, 'stock_reorder', ('urgency', 'id'), '1', (),
+                                  None, False, 200), args.repeat * 5)),
+        f'{args.pages} pages': summarize(timed(page_through, args.repeat)),
+    }
+    print(f"{skus:,} products")
+    print_results("Reorder", results)
+    db.close()
+
+
+def cmd_startup(args):
+    # Cold start as a counter PC sees it, each run in a fresh interpreter:
+    # `import app`, opening an up-to-date database, and the time until the
+    # login screen is drawn (needs a display). --json keeps the numbers for CI.
+    here = os.path.dirname(os.path.abspath(__file__))
+    env = dict(os.environ, SEIZE_DB_PATH=os.path.abspath(args.db))
+    Database(args.db).close()   # migrate once up front
+
+    def run(*code):
+        def go(i):
+            subprocess.run([sys.executable, *code], cwd=here, env=env, check=True,
+                           stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        return summarize(timed(go, args.repeat))
+
+    results = {
+        'interpreter': run('-c', 'pass'),
+        'import app': run('-c', 'import app'),
+        'open database': run('-c', 'import app; app.Database().close()'),
+    }
+    if os.environ.get('DISPLAY') or sys.platform in ('win32', 'darwin'):
+        results['first paint'] = run('app.py', '--quit-after-paint')
+
+    # Slowest modules pulled in by `import app`, by cumulative import time
+    trace = subprocess.run([sys.executable, '-X', 'importtime', '-c', 'import app'], cwd=here,
+                           env=env, capture_output=True, text=True, check=True).stderr
+    # (children are listed before their parent, one indent level deeper)
+    modules = []
+    for line in trace.splitlines()[1:]:
+        self_us, total_us, name = line.split(':', 1)[1].split('|')
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        if depth == 0:
+            if name.strip() == 'app':
+                break
+            modules = []
+        elif depth == 1:
+            modules.append((int(total_us), name.strip()))
+    slowest = sorted(modules, reverse=True)[:args.top]
+
+    print_results("Startup", results)
+    print("  slowest imports: " + ", ".join(f"{name} {us / 1000:.1f} ms" for us, name in slowest))
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump({'results': results,
+                       'slowest_imports_ms': {name: us / 1000 for us, name in slowest}}, f, indent=2)
+    if 'first paint' not in results:
+        print("  first paint skipped: no display")
+
+
+def cmd_suite(args):
+    # Every billing hot path, through the same calls the screens make, with
+    # no Tk. --json keeps the numbers together with what they were measured
+    # on, and --baseline compares against an earlier --json run.
+    db = Database(args.db, profile=args.profile)
+    today = date.today()
+    month, year = today.replace(day=1), today - timedelta(days=365)
+    counts = {table: db.fetchone(f"SELECT COUNT(*) FROM {table}")[0]
+              for table in ('products', 'invoices', 'invoice_items', 'expenses')}
+    if not counts['invoices']:
+        raise SystemExit("No invoices; run generate first")
+
+    # Search terms and type-ahead keystrokes drawn from the data itself
+    rng = random.Random(args.seed)
+    recent = db.fetchall("SELECT invoice_no, customer_name FROM invoices ORDER BY id DESC LIMIT 1000")
+    names = [row[0] for row in db.fetchall("SELECT name FROM products LIMIT 1000")]
+    terms = []
+    for _ in range(args.repeat):
+        invoice_no, customer = rng.choice(recent)
+        terms.extend([customer, invoice_no, rng.choice(names)])
+    keystrokes = []
+    for name in rng.sample(names, min(len(names), args.repeat)):
+        keystrokes.extend(name[:i] for i in range(1, min(len(name), 8) + 1))
+
+    cases = {
+        'next_invoice_no': lambda i: db.numbers.peek(),
+        'invoices_page': lambda i: keyset_page(db, **INVOICE_PAGE, where=INVOICE_RANGE,
+                                               params=(month, today), after=None, limit=PAGE_SIZE),
+        'invoices_search': lambda i: db.search_invoices(terms[i % len(terms)], year, today),
+        'dashboard': lambda i: db._dashboard_stats(today),
+        'dashboard_cached': lambda i: db.dashboard_stats(),
+        'sales_report': lambda i: db.fetch_table(SALES_REPORT_SQL),
+        'products_page': lambda i: keyset_page(db, **PRODUCT_PAGE, where='1', params=(),
+                                               after=None, limit=PAGE_SIZE),
+        'product_search': lambda i: db.catalog.search(keystrokes[i % len(keystrokes)]),
+    }
+    results = {'save_invoice': bench_save_invoice(db, 'suite', args.repeat, args.lines)}
+    for name, fn in cases.items():
+        fn(0)   # warm the page cache, catalog and query cache first
+        results[name] = summarize(timed(fn, args.repeat))
+    db.close()
+
+    print(", ".join(f"{count:,} {table}" for table, count in counts.items()))
+    print_results(f"Suite, {args.profile}", results)
+    if args.baseline:
+        with open(args.baseline) as f:
+            before = json.load(f)['results']
+        print(f"\n[p50 vs {args.baseline}]")
+        for name, stats in results.items():
+            if name in before:
+                change = stats['p50_ms'] / before[name]['p50_ms'] - 1 if before[name]['p50_ms'] else 0
+                print(f"  {name:<18} {before[name]['p50_ms']:9.2f} -> {stats['p50_ms']:9.2f} ms"
+                      f"   {change:+7.1%}")
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump({'meta': {'db': os.path.abspath(args.db),
+                                'size_mb': os.path.getsize(args.db) / 1e6,
+                                'counts': counts, 'profile': args.profile,
+                                'repeat': args.repeat, 'lines': args.lines, 'seed': args.seed,
+                                'python': sys.version.split()[0],
+                                'sqlite': sqlite3.sqlite_version,
+                                'platform': sys.platform, 'run_at': time.strftime('%Y-%m-%dT%H:%M:%S')},
+                       'results': results}, f, indent=2)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="SEIZE database benchmarks")
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    gen = sub.add_parser('generate', help="create or extend a synthetic database")
+    gen.add_argument('--db', default='bench.db')
+    gen.add_argument('--products', type=int, default=5000)
+    gen.add_argument('--invoices', type=int, default=100000)
+    gen.add_argument('--items', type=int, default=6, help="average lines per invoice")
+    gen.add_argument('--expenses', type=int, default=20000)
+    gen.add_argument('--customers', type=int, default=500)
+    gen.add_argument('--skew', type=float, default=1.0,
+                     help="Zipf exponent for product and customer popularity (0 = uniform)")
+    gen.add_argument('--days', type=int, default=1095, help="history spread over this many days")
+    gen.add_argument('--seed', type=int, default=42)
+    gen.set_defaults(func=cmd_generate)
+
+    prof = sub.add_parser('profiles', help="compare connection tuning profiles")
+    prof.add_argument('--db', default='bench.db')
+    prof.add_argument('--profiles', default=','.join(DB_PROFILES))
+    prof.add_argument('--repeat', type=int, default=50)
+    prof.set_defaults(func=cmd_profiles)
+
+    save = sub.add_parser('save', help="invoice save latency by invoice size")
+    save.add_argument('--db', default='bench.db')
+    save.add_argument('--profile', default='terminal', choices=list(DB_PROFILES))
+    save.add_argument('--lines', type=int, nargs='+', default=[1, 50, 500])
+    save.add_argument('--repeat', type=int, default=20)
+    save.set_defaults(func=cmd_save)
+
+    plans = sub.add_parser('plans', help="check the hot queries use their indexes")
+    plans.add_argument('--db', default='bench.db')
+    plans.set_defaults(func=cmd_plans)
+
+    search = sub.add_parser('search', help="invoice search: LIKE scan vs full-text index")
+    search.add_argument('--db', default='bench.db')
+    search.add_argument('--terms', nargs='+', default=['Sharma', 'SEZ1234', '98765', 'Product 00042'])
+    search.add_argument('--days', type=int, default=1095, help="date range searched")
+    search.add_argument('--repeat', type=int, default=10)
+    search.set_defaults(func=cmd_search)
+
+    catalog = sub.add_parser('catalog', help="product type-ahead latency per keystroke")
+    catalog.add_argument('--db', default='bench.db')
+    catalog.add_argument('--samples', type=int, default=200)
+    catalog.add_argument('--seed', type=int, default=42)
+    catalog.set_defaults(func=cmd_catalog)
+
+    export = sub.add_parser('export', help="report export throughput and peak memory")
+    export.add_argument('--db', default='bench.db')
+    export.add_argument('--rows', type=int, default=1000000)
+    export.add_argument('--formats', nargs='+', default=['csv', 'xlsx'], choices=['csv', 'xlsx'])
+    export.add_argument('--baseline', action='store_true',
+                        help="also time loading every row before writing, as the old export would")
+    export.set_defaults(func=cmd_export)
+
+    pdf = sub.add_parser('pdf', help="invoice PDF render time")
+    pdf.add_argument('--db', default='bench.db')
+    pdf.add_argument('--count', type=int, default=200)
+    pdf.add_argument('--min-lines', type=int, default=5)
+    pdf.add_argument('--max-lines', type=int, default=15)
+    pdf.set_defaults(func=cmd_pdf)
+
+    batch = sub.add_parser('batch-pdf', help="batch invoice PDF throughput by worker count")
+    batch.add_argument('--db', default='bench.db')
+    batch.add_argument('--days', type=int, default=30, help="invoices from this many days back")
+    batch.add_argument('--workers', type=int, nargs='+', default=[1, 2, 4])
+    batch.set_defaults(func=cmd_batch_pdf)
+
+    gst = sub.add_parser('gst', help="GST return computation time")
+    gst.add_argument('--db', default='bench.db')
+    gst.add_argument('--days', type=int, default=91, help="return period, counted back from today")
+    gst.add_argument('--repeat', type=int, default=3)
+    gst.set_defaults(func=cmd_gst)
+
+    reorder = sub.add_parser('reorder', help="reorder refresh and Stock screen page times")
+    reorder.add_argument('--db', default='bench.db')
+    reorder.add_argument('--pages', type=int, default=5, help="pages scrolled through")
+    reorder.add_argument('--repeat', type=int, default=3)
+    reorder.set_defaults(func=cmd_reorder)
+
+    startup = sub.add_parser('startup', help="cold start: import, database open and first paint times")
+    startup.add_argument('--db', default='bench.db')
+    startup.add_argument('--repeat', type=int, default=10)
+    startup.add_argument('--top', type=int, default=8, help="slowest imports listed")
+    startup.add_argument('--json', help="also write the results to this JSON file")
+    startup.set_defaults(func=cmd_startup)
+
+    suite = sub.add_parser('suite', help="all billing hot paths, headless, with JSON output")
+    suite.add_argument('--db', default='bench.db')
+    suite.add_argument('--profile', default='terminal', choices=list(DB_PROFILES))
+    suite.add_argument('--repeat', type=int, default=50)
+    suite.add_argument('--lines', type=int, default=5, help="lines per saved invoice")
+    suite.add_argument('--seed', type=int, default=42)
+    suite.add_argument('--json', help="also write the results to this JSON file")
+    suite.add_argument('--baseline', help="JSON file from an earlier run to compare against")
+    suite.set_defaults(func=cmd_suite)
+
+    args = parser.parse_args(argv)
+    args.func(args)
+
+
+if __name__ == '__main__':
+    main()
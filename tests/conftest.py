@@ -0,0 +1,23 @@
+import pytest
+
+from app import Database
+
+
+@pytest.fixture
+def db(tmp_path):
+    db = Database(str(tmp_path / 'seize.db'))
+    yield db
+    db.close()
+
+
+def sell(db, product_id, quantity, price=100.0, gst_rate=18, day=None):
+    # A one-line invoice saved the way the billing screen saves it
+    total = quantity * price * (1 + gst_rate / 100)
+    return db.save_invoice({
+        'customer_name': 'Test Customer',
+        'date': day,
+        'subtotal': quantity * price,
+        'gst_amount': total - quantity * price,
+        'total': total,
+        'created_by': 'test',
+    }, [(product_id, 'Item', quantity, price, gst_rate, total)])
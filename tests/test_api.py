@@ -0,0 +1,115 @@
+import base64
+
+import pytest
+
+from app import create_api
+
+
+@pytest.fixture
+def client(db):
+    client = create_api(db).test_client()
+    client.environ_base['HTTP_AUTHORIZATION'] = 'Basic ' + base64.b64encode(b'admin:admin123').decode()
+    return client
+
+
+@pytest.fixture
+def product(db):
+    return db.add_product("Rice 5kg", price=250, gst_rate=5, stock=40)
+
+
+def post_invoice(client, **body):
+    return client.post('/api/invoices', json={'customer_name': 'Counter', **body})
+
+
+def test_create_invoice(client, db, product):
+    response = post_invoice(client, date='2024-04-02', items=[{'product_id': product, 'quantity': 2}])
+    assert response.status_code == 201
+    assert response.get_json()['total'] == 525.0
+    assert db.fetchone("SELECT stock FROM products WHERE id=?", (product,))[0] == 38
+
+
+@pytest.mark.parametrize('body', [
+    {'items': [{'product_id': 1, 'quantity': -5}]},
+    {'items': [{'product_id': 1, 'quantity': 0}]},
+    {'items': [{'product_id': 1, 'price': -1}]},
+    {'items': [{'product_id': 1}], 'date': 'garbage'},
+    {'items': [{'product_id': 1}], 'date': '2024-4-2'},
+    {'items': [{'product_id': 1}], 'date': '2024-02-30'},
+    {'items': {'product_id': 1}},
+    {'items': []},
+    {'items': [5]},
+    {'items': [{'product_id': [1]}]},
+])
+def test_create_invoice_rejects_bad_input(client, db, product, body):
+    response = post_invoice(client, **body)
+    assert response.status_code == 400
+    assert response.get_json()['error']
+    assert db.fetchone("SELECT COUNT(*) FROM invoices")[0] == 0
+    assert db.fetchone("SELECT stock FROM products WHERE id=?", (product,))[0] == 40
+
+
+@pytest.mark.parametrize('cursor', [b'{}', b'5', b'[1]', b'[{}, 1]', b'not json'])
+def test_page_rejects_bad_cursor(client, cursor):
+    response = client.get('/api/products', query_string={'after': base64.urlsafe_b64encode(cursor)})
+    assert response.status_code == 400
+
+
+def test_page_cursor_round_trip(client, db):
+    for name in ('A', 'B', 'C'):
+        db.add_product(name)
+    first = client.get('/api/products?limit=2').get_json()
+    second = client.get('/api/products', query_string={'limit': 2, 'after': first['next']}).get_json()
+    assert [p['name'] for p in first['items'] + second['items']] == ['A', 'B', 'C']
+
+
+def test_create_product(client, db):
+    response = client.post('/api/products', json={'name': 'Tea 250g', 'hsn_code': '0902',
+                                                  'price': 120, 'gst_rate': 5, 'stock': 12})
+    assert response.status_code == 201
+    assert db.fetchone("SELECT name, price, stock FROM products WHERE id=?",
+                       (response.get_json()['id'],)) == ('Tea 250g', 120, 12)
+
+
+@pytest.mark.parametrize('body', [
+    ['Tea'],
+    {'name': ['x']},
+    {'name': ''},
+    {'name': 'Tea', 'hsn_code': 902},
+    {'name': 'Tea', 'price': 'inf'},
+    {'name': 'Tea', 'price': 'nan'},
+    {'name': 'Tea', 'price': -1},
+    {'name': 'Tea', 'gst_rate': 'inf'},
+    {'name': 'Tea', 'gst_rate': -5},
+    {'name': 'Tea', 'stock': -3},
+    {'name': 'Tea', 'stock': 'nan'},
+    {'name': 'Tea', 'stock': 1.5},
+])
+def test_create_product_rejects_bad_input(client, db, body):
+    response = client.post('/api/products', json=body)
+    assert response.status_code == 400
+    assert response.get_json()['error']
+    assert db.fetchone("SELECT COUNT(*) FROM products")[0] == 0
+
+
+def test_create_expense(client, db):
+    response = client.post('/api/expenses', json={'amount': '1500.50', 'category': 'Rent',
+                                                  'date': '2024-04-02'})
+    assert response.status_code == 201
+    assert db.fetchone("SELECT category, amount, date FROM expenses") == ('Rent', 1500.5, '2024-04-02')
+
+
+@pytest.mark.parametrize('body', [
+    [1500],
+    {},
+    {'amount': 'nan'},
+    {'amount': 'inf'},
+    {'amount': -10},
+    {'amount': 'ten'},
+    {'amount': 10, 'category': [1]},
+    {'amount': 10, 'description': {'a': 1}},
+])
+def test_create_expense_rejects_bad_input(client, db, body):
+    response = client.post('/api/expenses', json=body)
+    assert response.status_code == 400
+    assert response.get_json()['error']
+    assert db.fetchone("SELECT COUNT(*) FROM expenses")[0] == 0
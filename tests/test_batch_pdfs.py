@@ -0,0 +1,28 @@
+import os
+import sqlite3
+
+import pytest
+
+from app import Database, batch_pdfs, pdf_filename
+from conftest import sell
+
+
+def test_readonly_database_cannot_write(db):
+    reader = Database(db.path, pool_size=1, readonly=True)
+    try:
+        assert reader.fetchone("SELECT COUNT(*) FROM products")[0] == 0
+        with pytest.raises(sqlite3.OperationalError, match='readonly'):
+            reader.execute("INSERT INTO products (name) VALUES ('x')")
+    finally:
+        reader.close()
+
+
+def test_batch_pdfs_render_and_resume(db, tmp_path):
+    pen = db.add_product("Pen", price=10, stock=100)
+    numbers = [sell(db, pen, 1, day='2024-04-02')[1] for _ in range(3)]
+    out = str(tmp_path / 'pdfs')
+
+    result = batch_pdfs(db.path, out, '2024-04-01', '2024-04-30', workers=2)
+    assert (result['rendered'], result['skipped']) == (3, 0)
+    assert sorted(os.listdir(out)) == sorted(pdf_filename(n) for n in numbers)
+    assert batch_pdfs(db.path, out, '2024-04-01', '2024-04-30', workers=2)['skipped'] == 3
@@ -0,0 +1,43 @@
+import sqlite3
+
+import pytest
+
+from conftest import sell
+
+
+@pytest.fixture
+def closed_invoice(db):
+    # A March invoice, with March then closed
+    pen = db.add_product("Pen", price=10, stock=100)
+    invoice_id, _ = sell(db, pen, 2, price=10, day='2024-03-10')
+    db.close_period('2024-03')
+    return invoice_id, pen
+
+
+def test_lines_of_a_closed_month_cannot_change(db, closed_invoice):
+    invoice_id, pen = closed_invoice
+    ink = db.add_product("Ink", price=10, stock=100)
+    header = dict(zip(('customer_name', 'date', 'subtotal', 'gst_amount', 'total'), db.fetchone(
+        "SELECT customer_name, date, subtotal, gst_amount, total FROM invoices WHERE id=?", (invoice_id,))))
+    # Same totals, different product
+    items = db.fetchall("SELECT ?, 'Ink', quantity, price, gst_rate, total FROM invoice_items "
+                        "WHERE invoice_id=?", (ink, invoice_id))
+    gst_before = db.fetchall("SELECT * FROM daily_gst ORDER BY 1, 2, 3, 4")
+
+    with pytest.raises(sqlite3.IntegrityError):
+        db.update_invoice(invoice_id, header, items)
+    with pytest.raises(sqlite3.IntegrityError):
+        db.execute("UPDATE invoice_items SET quantity = 3 WHERE invoice_id=?", (invoice_id,))
+    with pytest.raises(sqlite3.IntegrityError):
+        db.execute("DELETE FROM invoice_items WHERE invoice_id=?", (invoice_id,))
+
+    assert db.fetchone("SELECT product_id FROM invoice_items WHERE invoice_id=?", (invoice_id,))[0] == pen
+    assert db.fetchall("SELECT * FROM daily_gst ORDER BY 1, 2, 3, 4") == gst_before
+    assert db.check_stock() == []
+
+
+def test_lines_change_again_once_reopened(db, closed_invoice):
+    invoice_id, _ = closed_invoice
+    db.reopen_period('2024-03')
+    db.execute("UPDATE invoice_items SET quantity = 3 WHERE invoice_id=?", (invoice_id,))
+    assert db.fetchone("SELECT quantity FROM invoice_items WHERE invoice_id=?", (invoice_id,))[0] == 3
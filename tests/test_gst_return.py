@@ -0,0 +1,20 @@
+from app import gst_return
+from conftest import sell
+
+
+def test_money_columns_are_rounded_to_the_paisa(db):
+    # 3 x 33.45 at 5% leaves float noise in the summed columns
+    product = db.add_product("Soap", hsn_code='3401', price=33.45, gst_rate=5, stock=100)
+    for _ in range(3):
+        sell(db, product, 1, price=33.45, gst_rate=5, day='2024-04-02')
+
+    tables = gst_return(db, '2024-04-01', '2024-04-30')
+    for name in ('b2cs', 'hsn', 'rates'):
+        columns, rows = tables[name]
+        assert rows
+        for row in rows:
+            for column, value in zip(columns, row):
+                if column in ('taxable_value', 'igst', 'cgst', 'sgst', 'total_value'):
+                    assert value == round(value, 2), (name, column, value)
+    columns, rows = tables['hsn']
+    assert dict(zip(columns, rows[0]))['total_value'] == 105.37
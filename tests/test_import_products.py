@@ -0,0 +1,70 @@
+from app import import_products
+
+
+CATALOG = """Product Name,HSN,Rate,GST %,Opening Stock,Reorder Level
+Pen,9608,10,18,100,20
+Notebook,4820,"₹1,250.00",12,40,
+,9608,5,18,1,
+Stapler,8472,abc,18,5,
+Ink,3215,30,,2.5,
+Pencil,9609,4,5,,
+Glue,3506,-3,18,10,
+"""
+
+
+def write(tmp_path, text, name='catalog.csv'):
+    path = tmp_path / name
+    path.write_text(text, encoding='utf-8')
+    return str(path)
+
+
+def products(db):
+    return db.fetchall("SELECT name, hsn_code, price, gst_rate, stock, min_stock FROM products ORDER BY name")
+
+
+def test_import_reports_bad_rows_by_file_line(db, tmp_path):
+    # A small chunk size keeps the line numbers honest across chunks
+    result = import_products(db, write(tmp_path, CATALOG), user='test', chunk=2)
+    assert (result['rows'], result['inserted'], result['updated'], result['rejected']) == (7, 3, 0, 4)
+    assert result['errors'] == [(4, "name is empty"), (5, "price is not a number"),
+                                (6, "stock is not a whole number"), (8, "price is negative")]
+    assert products(db) == [('Notebook', '4820', 1250.0, 12.0, 40, 10),
+                            ('Pen', '9608', 10.0, 18.0, 100, 20),
+                            ('Pencil', '9609', 4.0, 5.0, 0, 10)]
+    assert db.fetchall("SELECT reason, COUNT(*) FROM stock_movements GROUP BY reason") == [('opening', 2)]
+    assert db.check_stock() == []
+
+
+def test_import_updates_products_matched_on_name_and_hsn(db, tmp_path):
+    pen = db.add_product("Pen", hsn_code='9608', price=8, gst_rate=12, stock=30, min_stock=5)
+    other = db.add_product("Pen", hsn_code='9999', price=50, stock=3)
+    result = import_products(db, write(tmp_path, "name,hsn_code,price,stock\n"
+                                                 "Pen,9608,10,45\n"
+                                                 "Eraser,4016,3,\n"
+                                                 "Pen,9608,11,\n"), user='test')
+    assert (result['inserted'], result['updated'], result['errors']) == (1, 1, [])
+    # The last row for a product wins; blank cells leave the old values alone
+    assert db.fetchone("SELECT price, gst_rate, stock, min_stock FROM products WHERE id=?",
+                       (pen,)) == (11.0, 12.0, 30, 5)
+    assert db.fetchone("SELECT price, stock FROM products WHERE id=?", (other,)) == (50.0, 3)
+
+    import_products(db, write(tmp_path, "name,hsn_code,price,stock\nPen,9608,11,45\n"), user='test')
+    assert db.fetchone("SELECT stock FROM products WHERE id=?", (pen,))[0] == 45
+    assert db.fetchone("SELECT qty_delta, reason FROM stock_movements WHERE product_id=? ORDER BY id DESC",
+                       (pen,)) == (15, 'import')
+    assert db.fetchone("SELECT COUNT(*) FROM products")[0] == 3
+    assert db.check_stock() == []
+
+
+def test_import_reads_excel(db, tmp_path):
+    from openpyxl import Workbook
+    book = Workbook()
+    book.active.append(['Item', 'HSN Code', 'MRP', 'Qty'])
+    book.active.append(['Pen', 9608, 10, 12])
+    book.active.append(['Ruler', 9017, None, 4])
+    path = str(tmp_path / 'catalog.xlsx')
+    book.save(path)
+
+    result = import_products(db, path, user='test')
+    assert (result['inserted'], result['errors']) == (1, [(3, "price is empty")])
+    assert products(db) == [('Pen', '9608', 10.0, 18.0, 12, 10)]
@@ -0,0 +1,62 @@
+from decimal import Decimal
+
+from app import InvoiceDraft, InvoiceLine, line_amounts, to_paise
+
+
+def rupees(paise):
+    return Decimal(paise) / 100
+
+
+def test_line_amounts_are_whole_paise():
+    assert to_paise(0.1) == 10
+    assert to_paise('33.455') == 3346
+    assert line_amounts(3, 33.45, 5) == (10035, 502)
+    assert line_amounts(3, 0.1, 18) == (30, 5)
+    assert line_amounts(2.5, 60, 0) == (15000, 0)
+
+
+def test_totals_are_exact_sums_of_the_lines():
+    draft = InvoiceDraft()
+    draft.add('a', InvoiceLine(1, 'Soap', 3, 33.45, 5))
+    assert draft.totals() == {'subtotal': 100.35, 'gst_amount': 5.02, 'total': 105.37}
+
+    # Prices that float addition gets wrong: 0.1 + 0.2 != 0.3
+    draft.add('b', InvoiceLine(2, 'Toffee', 1, 0.1, 0))
+    draft.add('c', InvoiceLine(3, 'Toffee', 1, 0.2, 0))
+    assert draft.totals()['subtotal'] == 100.65
+    assert (draft.subtotal, draft.gst_amount, draft.total) == (10065, 502, 10567)
+
+    draft.set_quantity('a', 7)
+    draft.set_quantity('b', 11)
+    draft.remove('c')
+    lines = [line_amounts(7, 33.45, 5), line_amounts(11, 0.1, 0)]
+    assert draft.subtotal == sum(amount for amount, gst in lines)
+    assert draft.gst_amount == sum(gst for amount, gst in lines)
+    assert rupees(draft.total) == Decimal('246.96')
+    assert len(draft) == 2 and draft.find(2) == 'b' and draft.find(3) is None
+
+
+def test_totals_do_not_drift_over_many_edits():
+    draft = InvoiceDraft()
+    for n in range(500):
+        draft.add(n, InvoiceLine(n, f'Item {n}', 1 + n % 7, Decimal('19.99') + n % 3, 18))
+    for n in range(0, 500, 2):
+        draft.set_quantity(n, 3)
+    for n in range(0, 500, 5):
+        draft.remove(n)
+
+    expected = [line_amounts(line.quantity, line.price / 100, line.gst_rate) for line in draft.lines.values()]
+    assert draft.subtotal == sum(amount for amount, gst in expected)
+    assert draft.gst_amount == sum(gst for amount, gst in expected)
+    assert sum(rupees(line.total) for line in draft.lines.values()) == rupees(draft.total)
+
+
+def test_saved_invoice_matches_the_draft(db):
+    soap = db.add_product("Soap", price=33.45, gst_rate=5, stock=10)
+    draft = InvoiceDraft()
+    draft.add('a', InvoiceLine(soap, 'Soap', 3, 33.45, 5))
+    invoice_id, _ = db.save_invoice({'customer_name': 'Test Customer', **draft.totals()}, draft.items())
+    assert db.fetchone("SELECT subtotal, gst_amount, total FROM invoices WHERE id=?",
+                       (invoice_id,)) == (100.35, 5.02, 105.37)
+    assert db.fetchone("SELECT quantity, price, total FROM invoice_items WHERE invoice_id=?",
+                       (invoice_id,)) == (3, 33.45, 105.37)
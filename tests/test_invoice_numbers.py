@@ -0,0 +1,65 @@
+import threading
+from datetime import date
+
+from app import Database, InvoiceNumbers
+from conftest import sell
+
+
+def allocate(db, numbers, day=None):
+    with db.transaction() as conn:
+        return numbers.allocate(conn, day)
+
+
+def test_concurrent_saves_get_unique_numbers(db, tmp_path):
+    product = db.add_product("Pen", price=10, stock=1000)
+    saved = []
+
+    def till():
+        # Each till has its own connections, as separate processes would
+        conn = Database(db.path)
+        try:
+            for _ in range(20):
+                saved.append(sell(conn, product, 1)[1])
+        finally:
+            conn.close()
+
+    threads = [threading.Thread(target=till) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(saved) == len(set(saved)) == 80
+    assert sorted(saved) == [f"SEZ{n:04d}" for n in range(1, 81)]
+
+
+def test_terminals_lease_separate_blocks(db):
+    till_a = InvoiceNumbers(db, prefix='SEZ', block=5, terminal='a')
+    till_b = InvoiceNumbers(db, prefix='SEZ', block=5, terminal='b')
+    first_a = [allocate(db, till_a) for _ in range(3)]
+    first_b = [allocate(db, till_b) for _ in range(2)]
+    assert first_a == ['SEZ0001', 'SEZ0002', 'SEZ0003']
+    assert first_b == ['SEZ0006', 'SEZ0007']
+    # Once its block is used up a terminal takes the next free one
+    rest_a = [allocate(db, till_a) for _ in range(3)]
+    assert rest_a == ['SEZ0004', 'SEZ0005', 'SEZ0011']
+    assert till_b.peek() == 'SEZ0008'
+
+
+def test_financial_year_reset(db):
+    numbers = InvoiceNumbers(db, prefix='SEZ', fy_reset=True, block=1)
+    assert allocate(db, numbers, date(2024, 3, 31)) == 'SEZ2324-0001'
+    assert allocate(db, numbers, date(2024, 3, 31)) == 'SEZ2324-0002'
+    # April starts the next financial year from 1
+    assert allocate(db, numbers, date(2024, 4, 1)) == 'SEZ2425-0001'
+    assert allocate(db, numbers, date(2024, 3, 15)) == 'SEZ2324-0003'
+
+
+def test_peek_does_not_write(db):
+    numbers = InvoiceNumbers(db, prefix='INV', block=1)
+    assert numbers.peek() == 'INV0001'
+    assert db.fetchone("SELECT COUNT(*) FROM invoice_sequences WHERE series='INV'")[0] == 0
+    # A new series carries on from numbers already on invoices
+    sell(db, db.add_product("Pen", price=10, stock=5), 1)
+    db.execute("UPDATE invoices SET invoice_no = 'INV0041'")
+    assert numbers.peek() == 'INV0042'
+    assert allocate(db, numbers) == 'INV0042'
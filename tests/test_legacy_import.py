@@ -0,0 +1,24 @@
+from app import import_legacy_invoices
+from conftest import sell
+
+
+def write_csv(path, header, rows):
+    path.write_text('\n'.join([header, *rows]) + '\n')
+    return str(path)
+
+
+def test_imported_numbers_are_not_allocated_again(db, tmp_path):
+    product = db.add_product("Pen", price=10, stock=100)
+    assert sell(db, product, 1)[1] == 'SEZ0001'
+
+    headers = write_csv(tmp_path / 'headers.csv', 'invoice_no,date,customer_name',
+                        ['SEZ0002,2024-04-01,A', ',2024-04-01,B', 'SEZ0003,2024-04-02,C'])
+    lines = write_csv(tmp_path / 'lines.csv', 'invoice_no,product_name,quantity,price,gst_rate',
+                      ['SEZ0002,Pen,1,10,18', 'SEZ0003,Pen,2,10,18'])
+    import_legacy_invoices(db, headers, lines)
+
+    numbers = dict(db.fetchall("SELECT customer_name, invoice_no FROM invoices"))
+    assert numbers == {'Test Customer': 'SEZ0001', 'A': 'SEZ0002', 'B': 'SEZ0004', 'C': 'SEZ0003'}
+    # The next invoice billed carries on after the imported numbers
+    assert db.numbers.peek() == 'SEZ0005'
+    assert sell(db, product, 1)[1] == 'SEZ0005'
@@ -0,0 +1,18 @@
+import re
+
+import pytest
+
+from app import hot_queries
+
+# Tables that grow with every sale; a plain SCAN of one is a full table read
+HOT_TABLES = ('invoices', 'invoice_items', 'products', 'expenses', 'stock_movements')
+FULL_SCAN = re.compile(rf"SCAN ({'|'.join(HOT_TABLES)})\b(?! USING (COVERING )?INDEX)")
+
+
+@pytest.mark.parametrize('sql, params, index',
+                         [pytest.param(*query, id=name) for name, *query in hot_queries()])
+def test_hot_query_uses_its_index(db, sql, params, index):
+    plan = [row[3] for row in db.fetchall("EXPLAIN QUERY PLAN " + sql, params)]
+    assert any(re.search(rf"USING (COVERING )?INDEX {index}\b", detail)
+               for detail in plan), plan
+    assert not any(FULL_SCAN.search(detail) for detail in plan), plan
@@ -0,0 +1,30 @@
+from app import refresh_reorder
+from conftest import sell
+
+
+def reorder_rows(db):
+    return db.fetchall("SELECT id, reorder_point, order_qty FROM stock_reorder ORDER BY id")
+
+
+def test_incremental_refresh_matches_full(db):
+    selling = db.add_product("Selling", price=100, stock=500)
+    sell(db, selling, 20)
+    refresh_reorder(db, full=True)
+
+    # New stock for a product that has never sold, then another sale
+    unsold = db.add_product("Unsold", price=50, stock=3, min_stock=10)
+    sell(db, selling, 5)
+    assert refresh_reorder(db) == 2
+    incremental = reorder_rows(db)
+
+    refresh_reorder(db, full=True)
+    assert incremental == reorder_rows(db)
+    # No sales history: the reorder point stays at min_stock
+    assert dict((row[0], row[1:]) for row in incremental)[unsold] == (10, 17)
+    assert db.dashboard_stats()['low_stock'] == 1
+
+
+def test_incremental_refresh_without_movements_does_nothing(db):
+    db.add_product("Selling", price=100, stock=500)
+    refresh_reorder(db, full=True)
+    assert refresh_reorder(db) == 0
@@ -0,0 +1,78 @@
+from conftest import sell
+
+
+def daily_sales(db):
+    return db.fetchall("""
+        SELECT day, invoice_count, ROUND(subtotal, 2), ROUND(gst_amount, 2), ROUND(total, 2)
+        FROM daily_sales WHERE invoice_count != 0 ORDER BY day
+    """)
+
+
+def raw_sales(db):
+    return db.fetchall("""
+        SELECT date, COUNT(*), ROUND(SUM(subtotal), 2), ROUND(SUM(gst_amount), 2), ROUND(SUM(total), 2)
+        FROM invoices WHERE status != 'cancelled' GROUP BY date ORDER BY date
+    """)
+
+
+def daily_expenses(db):
+    return db.fetchall("""
+        SELECT day, category, expense_count, ROUND(amount, 2)
+        FROM daily_expenses WHERE expense_count != 0 ORDER BY day, category
+    """)
+
+
+def add_expense(db, category, amount, day):
+    return db.execute("INSERT INTO expenses (category, amount, description, date) VALUES (?, ?, '', ?)",
+                      (category, amount, day)).lastrowid
+
+
+def test_sales_rollup_follows_inserts_updates_and_deletes(db):
+    pen = db.add_product("Pen", price=10, stock=500)
+    first, _ = sell(db, pen, 3, price=10, day='2024-05-01')
+    second, _ = sell(db, pen, 5, price=10, day='2024-05-01')
+    third, _ = sell(db, pen, 7, price=10, day='2024-05-02')
+    assert daily_sales(db) == raw_sales(db)
+    assert daily_sales(db)[0] == ('2024-05-01', 2, 80.0, 14.4, 94.4)
+
+    # Moving an invoice to another day, changing its total and cancelling it
+    db.execute("UPDATE invoices SET date='2024-05-03' WHERE id=?", (first,))
+    db.execute("UPDATE invoices SET subtotal=100, gst_amount=18, total=118 WHERE id=?", (second,))
+    db.execute("UPDATE invoices SET status='cancelled' WHERE id=?", (third,))
+    assert daily_sales(db) == raw_sales(db) == [('2024-05-01', 1, 100.0, 18.0, 118.0),
+                                                ('2024-05-03', 1, 30.0, 5.4, 35.4)]
+
+    db.execute("UPDATE invoices SET status='paid' WHERE id=?", (third,))
+    db.delete_invoice(first)
+    assert daily_sales(db) == raw_sales(db)
+    assert db.check_rollups() == []
+
+
+def test_expense_rollup_follows_inserts_updates_and_deletes(db):
+    rent = add_expense(db, 'Rent', 15000, '2024-05-01')
+    tea = add_expense(db, 'Tea', 40.5, '2024-05-01')
+    add_expense(db, 'Tea', 35.25, '2024-05-01')
+    assert daily_expenses(db) == [('2024-05-01', 'Rent', 1, 15000.0), ('2024-05-01', 'Tea', 2, 75.75)]
+
+    db.execute("UPDATE expenses SET category='Snacks', date='2024-05-02' WHERE id=?", (tea,))
+    db.execute("UPDATE expenses SET amount=16000 WHERE id=?", (rent,))
+    assert daily_expenses(db) == [('2024-05-01', 'Rent', 1, 16000.0), ('2024-05-01', 'Tea', 1, 35.25),
+                                  ('2024-05-02', 'Snacks', 1, 40.5)]
+
+    db.execute("DELETE FROM expenses WHERE id=?", (rent,))
+    assert daily_expenses(db) == [('2024-05-01', 'Tea', 1, 35.25), ('2024-05-02', 'Snacks', 1, 40.5)]
+    assert db.check_rollups() == []
+
+
+def test_check_rollups_reports_drift_and_rebuild_repairs_it(db):
+    pen = db.add_product("Pen", price=10, stock=500)
+    sell(db, pen, 3, price=10, day='2024-05-01')
+    add_expense(db, 'Tea', 40, '2024-05-01')
+    db.execute("UPDATE daily_sales SET total = total + 1")
+    db.execute("DELETE FROM daily_expenses")
+
+    tables = {mismatch[0] for mismatch in db.check_rollups()}
+    assert tables == {'daily_sales', 'daily_expenses'}
+    db.rebuild_rollups()
+    assert db.check_rollups() == []
+    assert daily_sales(db) == raw_sales(db)
@@ -0,0 +1,39 @@
+import sqlite3
+
+import pytest
+
+from conftest import sell
+
+
+def counts(db):
+    return db.fetchone("""
+        SELECT (SELECT COUNT(*) FROM invoices), (SELECT COUNT(*) FROM invoice_items),
+               (SELECT COUNT(*) FROM stock_movements)
+    """)
+
+
+def test_lines_stock_and_number_commit_together(db):
+    pen = db.add_product("Pen", price=10, stock=50)
+    invoice_id, invoice_no = sell(db, pen, 4, price=10, gst_rate=0)
+    assert db.fetchone("SELECT invoice_no FROM invoices WHERE id=?", (invoice_id,))[0] == invoice_no
+    assert db.fetchone("SELECT quantity FROM invoice_items WHERE invoice_id=?", (invoice_id,))[0] == 4
+    assert db.fetchone("SELECT stock FROM products WHERE id=?", (pen,))[0] == 46
+
+
+def test_a_failed_line_rolls_back_the_whole_invoice(db):
+    pen = db.add_product("Pen", price=10, stock=50)
+    ink = db.add_product("Ink", price=30, stock=20)
+    sell(db, pen, 1, price=10, gst_rate=0)
+    before = counts(db)
+    next_no = db.numbers.peek()
+
+    # The second line cannot be bound, after the header and first line went in
+    with pytest.raises(sqlite3.Error):
+        db.save_invoice({'customer_name': 'Test Customer', 'subtotal': 40, 'gst_amount': 0, 'total': 40},
+                        [(pen, 'Pen', 1, 10, 0, 10), (ink, 'Ink', 1, object(), 0, 30)])
+
+    assert counts(db) == before
+    assert db.fetchall("SELECT id, stock FROM products ORDER BY id") == [(pen, 49), (ink, 20)]
+    assert db.numbers.peek() == next_no
+    assert db.check_stock() == []
+    assert db.check_rollups() == []
@@ -0,0 +1,42 @@
+from conftest import sell
+
+
+def stock(db, product_id):
+    return db.fetchone("SELECT stock FROM products WHERE id=?", (product_id,))[0]
+
+
+def header(total):
+    return {'customer_name': 'Test Customer', 'subtotal': total, 'gst_amount': 0, 'total': total}
+
+
+def test_products_with_the_same_name_move_by_id(db):
+    first = db.add_product("Notebook", price=40, stock=10)
+    second = db.add_product("Notebook", price=55, stock=10)
+    sell(db, second, 3, price=55)
+    assert (stock(db, first), stock(db, second)) == (10, 7)
+    assert db.check_stock() == []
+
+
+def test_update_and_delete_reverse_the_old_lines(db):
+    pen = db.add_product("Pen", price=10, stock=50)
+    ink = db.add_product("Ink", price=30, stock=20)
+    invoice_id, _ = sell(db, pen, 5, price=10, gst_rate=0)
+    assert stock(db, pen) == 45
+
+    db.update_invoice(invoice_id, header(60), [(ink, 'Ink', 2, 30, 0, 60)])
+    assert (stock(db, pen), stock(db, ink)) == (50, 18)
+    db.update_invoice(invoice_id, header(90), [(ink, 'Ink', 3, 30, 0, 90)])
+    assert stock(db, ink) == 17
+
+    db.delete_invoice(invoice_id)
+    assert (stock(db, pen), stock(db, ink)) == (50, 20)
+    assert db.fetchone("SELECT SUM(qty_delta) FROM stock_movements WHERE invoice_id=?", (invoice_id,))[0] == 0
+    assert db.check_stock() == []
+
+
+def test_loose_quantities_are_not_truncated(db):
+    rice = db.add_product("Rice (loose, kg)", price=60, stock=25)
+    invoice_id, _ = sell(db, rice, 2.5, price=60, gst_rate=0)
+    assert db.fetchone("SELECT qty_delta FROM stock_movements WHERE invoice_id=?", (invoice_id,))[0] == -2.5
+    assert stock(db, rice) == 22.5
+    assert db.check_stock() == []